@@ -0,0 +1,90 @@
+"""
+SoilWise/services/comparison_cache.py
+In-memory LRU cache of per-crop comparison results
+
+Entries are keyed by (soil hash, crop, season) rather than by whole
+comparison, so a new comparison reuses every crop already evaluated for
+the same soil and season and only the missing crops are computed.
+Switching back and forth between two seasons or two crop selections no
+longer throws results away.
+"""
+
+import copy
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+class ComparisonCache:
+    """Bounded least-recently-used cache of evaluation results, one per crop"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, soil_hash: Hashable, crop_name: str, season: Optional[str]) -> Optional[Dict]:
+        """
+        Get a copy of a cached result.
+
+        Args:
+            soil_hash: Hash of the soil data the result was computed for
+            crop_name: Crop name
+            season: Season the crop was evaluated in (None for perennial crops)
+
+        Returns:
+            The result dict, or None if not cached
+        """
+        key = (soil_hash, crop_name, season)
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(result)
+
+    def put(self, soil_hash: Hashable, crop_name: str, season: Optional[str], result: Dict):
+        """Store a copy of one crop's result, evicting the least recently used"""
+        key = (soil_hash, crop_name, season)
+        self._entries[key] = copy.deepcopy(result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def lookup(
+        self,
+        soil_hash: Hashable,
+        jobs: Sequence[Tuple[str, Optional[str]]]
+    ) -> Tuple[List[Dict], List[Tuple[str, Optional[str]]]]:
+        """
+        Split a comparison into cached results and crops still to evaluate.
+
+        Args:
+            soil_hash: Hash of the soil data
+            jobs: (crop_name, season) pairs of the comparison
+
+        Returns:
+            (cached results, missing jobs), both in job order
+        """
+        cached, missing = [], []
+        for crop_name, season in jobs:
+            result = self.get(soil_hash, crop_name, season)
+            if result is None:
+                missing.append((crop_name, season))
+            else:
+                cached.append(result)
+        return cached, missing
+
+    def count_cached(self, soil_hash: Hashable, jobs: Sequence[Tuple[str, Optional[str]]]) -> int:
+        """Number of jobs already cached (does not touch LRU order or counters)"""
+        return sum(1 for crop_name, season in jobs if (soil_hash, crop_name, season) in self._entries)
+
+    def clear(self):
+        self._entries.clear()
@@ -5,6 +5,7 @@ Connects the UI to the Knowledge Base System
 
 from typing import Dict, List, Optional
 from knowledge_base.evaluation import SuitabilityEvaluator
+from knowledge_base.registry import get_knowledge_base
 from models.soil_data import SoilData
 
 
@@ -12,7 +13,7 @@ class EvaluationService:
     """Service for running crop suitability evaluations"""
     
     def __init__(self):
-        self.evaluator = SuitabilityEvaluator()
+        self.evaluator = SuitabilityEvaluator(get_knowledge_base())
     
     def evaluate_single_crop(
         self,
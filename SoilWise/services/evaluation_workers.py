@@ -0,0 +1,186 @@
+"""
+SoilWise/services/evaluation_workers.py
+Background evaluation and database work on a QThreadPool
+
+Evaluations and database writes run on worker threads so the window stays
+responsive during large comparisons. Each task reports back through Qt
+signals, which are delivered on the UI thread:
+
+    task = get_worker_pool().evaluate(evaluate_fn, soil_data, jobs)
+    task.signals.result.connect(on_crop_done)       # one crop finished
+    task.signals.progress.connect(on_progress)      # (completed, total)
+    task.signals.finished.connect(on_all_done)      # every result
+    task.cancel()                                   # stop after current crop
+"""
+
+import threading
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+# Evaluation is CPU-bound Python, so more threads only add contention;
+# the second thread keeps database writes from queueing behind a comparison
+DEFAULT_MAX_THREADS = 2
+
+
+class EvaluationSignals(QObject):
+    """Signals emitted by an EvaluationTask"""
+    progress = Signal(int, int)     # completed, total
+    result = Signal(object)         # one crop's result dict, as soon as it is ready
+    finished = Signal(object)       # list of all results, in job order
+    cancelled = Signal(object)      # list of results completed before cancellation
+    error = Signal(str)
+
+
+class TaskSignals(QObject):
+    """Signals emitted by a FunctionTask"""
+    finished = Signal(object)       # return value of the function
+    error = Signal(str)
+
+
+class EvaluationTask(QRunnable):
+    """Evaluates a list of (crop_name, season) jobs for one soil sample"""
+
+    def __init__(
+        self,
+        evaluate: Callable[[Dict, str, Optional[str]], Dict],
+        soil_data: Dict,
+        jobs: Sequence[Tuple[str, Optional[str]]],
+        save: Optional[Callable[[List[Dict]], Any]] = None,
+    ):
+        """
+        Args:
+            evaluate: Called as evaluate(soil_data, crop_name, season) on the worker thread
+            soil_data: Soil and climate parameters (not modified)
+            jobs: (crop_name, season) pairs, evaluated in order
+            save: Optional callable run on the worker thread with all results
+                before 'finished' is emitted (database writes)
+        """
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = EvaluationSignals()
+        self.evaluate = evaluate
+        self.soil_data = dict(soil_data)
+        self.jobs = list(jobs)
+        self.save = save
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Stop before the next crop (the crop in progress still completes)"""
+        self._cancel_event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def run(self):
+        results = []
+        total = len(self.jobs)
+        try:
+            for crop_name, season in self.jobs:
+                if self.is_cancelled:
+                    self.signals.cancelled.emit(results)
+                    return
+                result = self.evaluate(self.soil_data, crop_name, season)
+                results.append(result)
+                self.signals.result.emit(result)
+                self.signals.progress.emit(len(results), total)
+
+            if self.save and not self.is_cancelled:
+                try:
+                    self.save(results)
+                except Exception as e:
+                    print(f"⚠️ Warning: Could not save results: {e}")
+
+            self.signals.finished.emit(results)
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.error.emit(str(e))
+
+
+class FunctionTask(QRunnable):
+    """Runs one callable (typically a database write) on the pool"""
+
+    def __init__(self, fn: Callable, *args, **kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = TaskSignals()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            value = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(value)
+
+
+class EvaluationWorkerPool:
+    """QThreadPool wrapper that keeps submitted tasks alive until they report back"""
+
+    def __init__(self, max_threads: int = DEFAULT_MAX_THREADS):
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_threads)
+        self._active = set()
+
+    def _track(self, task, *signals):
+        # Python owns the runnables (autoDelete off); drop them once they are done
+        self._active.add(task)
+        for signal in signals:
+            signal.connect(lambda *_: self._active.discard(task))
+        self.pool.start(task)
+        return task
+
+    def evaluate(
+        self,
+        evaluate: Callable[[Dict, str, Optional[str]], Dict],
+        soil_data: Dict,
+        jobs: Sequence[Tuple[str, Optional[str]]],
+        save: Optional[Callable[[List[Dict]], Any]] = None,
+    ) -> EvaluationTask:
+        """
+        Start evaluating jobs in the background.
+
+        Connect to task.signals right after this returns; signals are queued
+        to the UI thread, so none are missed.
+
+        Returns:
+            The running EvaluationTask (use task.cancel() to stop it)
+        """
+        task = EvaluationTask(evaluate, soil_data, jobs, save)
+        signals = task.signals
+        return self._track(task, signals.finished, signals.cancelled, signals.error)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> FunctionTask:
+        """Run fn(*args, **kwargs) in the background (e.g. a database write)"""
+        task = FunctionTask(fn, *args, **kwargs)
+        return self._track(task, task.signals.finished, task.signals.error)
+
+    def cancel_all(self):
+        """Ask every running evaluation to stop"""
+        for task in list(self._active):
+            if isinstance(task, EvaluationTask):
+                task.cancel()
+
+    def shutdown(self, timeout_ms: int = 3000) -> bool:
+        """Cancel evaluations and wait for running tasks (call on app exit)"""
+        self.cancel_all()
+        return self.pool.waitForDone(timeout_ms)
+
+
+# Global worker pool (same pattern as get_database)
+_worker_pool = None
+
+
+def get_worker_pool() -> EvaluationWorkerPool:
+    """Get the shared worker pool"""
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = EvaluationWorkerPool()
+    return _worker_pool
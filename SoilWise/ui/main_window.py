@@ -17,6 +17,8 @@ from SoilWise.ui.pages.crop_evaluation_page import CropEvaluationPage
 from SoilWise.ui.pages.reports_page import ReportsPage
 from SoilWise.ui.pages.evaluation_history_page import EvaluationHistoryPage
 from SoilWise.config.constants import APP_NAME, APP_VERSION, LOCATION
+from SoilWise.services.evaluation_workers import get_worker_pool
+from database.db_manager import get_database
 from SoilWise.utils.logger import setup_logger
 
 logger = setup_logger(__name__, "main_window.log")
@@ -439,4 +441,15 @@ class MainWindow(QMainWindow):
     def on_view_report_from_history(self, eval_data: dict):
         """Handle viewing a report from history"""
         logger.info(f"View report requested for: {eval_data.get('crop_name')}")
-        self.change_page(3)
\ No newline at end of file
+        self.change_page(3)
+
+    def closeEvent(self, event):
+        """Stop background evaluations before the window closes"""
+        if not get_worker_pool().shutdown():
+            logger.warning("Background tasks still running at exit")
+        for page in self.pages.values():
+            result_cache = getattr(page, "result_cache", None)
+            if result_cache:
+                result_cache.flush()
+        get_database().close()
+        super().closeEvent(event)
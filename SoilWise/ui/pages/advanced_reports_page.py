@@ -17,6 +17,8 @@ from openpyxl.styles import Font as ExcelFont, PatternFill, Alignment, Border, S
 from openpyxl.utils import get_column_letter
 import os
 
+from SoilWise.ui.widgets.analysis_tabs import SweepAnalysisTab, UncertaintyAnalysisTab
+
 # For PDF export
 try:
     from reportlab.lib.pagesizes import letter, A4
@@ -249,6 +251,8 @@ class AdvancedReportsPage(QWidget):
         # Add result sections
         self.results_layout.addWidget(self.create_summary_card(results))
         self.results_layout.addWidget(self.create_collapsible_recommendations(results))
+        self.results_layout.addWidget(self.create_collapsible_sweep(results))
+        self.results_layout.addWidget(self.create_collapsible_uncertainty(results))
         self.results_layout.addWidget(self.create_action_buttons())
     
     def create_summary_card(self, results: dict):
@@ -456,6 +460,18 @@ class AdvancedReportsPage(QWidget):
         collapsible.set_content(recommendations_content)
         return collapsible
     
+    def create_collapsible_sweep(self, results: dict):
+        """Create collapsible what-if sweep section (LSI vs one parameter)"""
+        collapsible = CollapsibleSection("What-If Analysis")
+        collapsible.set_content(SweepAnalysisTab(results))
+        return collapsible
+    
+    def create_collapsible_uncertainty(self, results: dict):
+        """Create collapsible measurement-uncertainty section (Monte Carlo)"""
+        collapsible = CollapsibleSection("Measurement Uncertainty")
+        collapsible.set_content(UncertaintyAnalysisTab(results))
+        return collapsible
+    
     def create_recommendations_content(self, results: dict):
         """Create the recommendations content widget"""
         card = QFrame()
@@ -3,7 +3,7 @@ from PySide6.QtWidgets import (
     QFrame, QGridLayout, QGroupBox, QCheckBox, QRadioButton,
     QComboBox, QPushButton, QMessageBox, QDialog, QTableWidget,
     QTableWidgetItem, QButtonGroup, QApplication, QHeaderView,
-    QFileDialog
+    QFileDialog, QProgressBar
 )
 from PySide6.QtCore import Qt, Signal, QDateTime
 from PySide6.QtGui import QFont, QColor, QPixmap, QPainter
@@ -12,15 +12,18 @@ from PySide6.QtCharts import QChart, QChartView, QBarSeries, QBarSet, QBarCatego
 
 import json
 import os
-import copy  
 from datetime import datetime
 from pathlib import Path
 from database.db_manager import get_database
+from database.evaluation_cache import EvaluationCache
+from SoilWise.services.comparison_cache import ComparisonCache
+from SoilWise.services.evaluation_workers import get_worker_pool
 
 
 # Import evaluation engine
 try:
     from knowledge_base.evaluation import SuitabilityEvaluator
+    from knowledge_base.registry import get_knowledge_base
     EVALUATOR_AVAILABLE = True
 except ImportError as e:
     print(f"⚠️ Warning: Could not import SuitabilityEvaluator: {e}")
@@ -109,14 +112,13 @@ class CropEvaluationPage(QWidget):
         self.compare_status_label = None
         self.compare_btn = None
 
-        # ✅ ENHANCED CACHING: Track all comparison conditions
-        self.last_comparison_results = None
-        self.last_evaluated_season = None
-        self.last_evaluated_crops = None
+        # ✅ ENHANCED CACHING: Per-crop results keyed by (soil hash, crop, season)
+        self.comparison_cache = ComparisonCache()
         self.last_soil_data_hash = None  # ✅ NEW: Hash to detect soil data changes
 
         self.soil_data_timestamp = None
         self.season_card = None
+        self.season_overview_labels = {}
 
         # Define seasonal crops
         self.seasonal_crops = {
@@ -132,7 +134,7 @@ class CropEvaluationPage(QWidget):
         self.evaluator = None
         if EVALUATOR_AVAILABLE:
             try:
-                self.evaluator = SuitabilityEvaluator()
+                self.evaluator = SuitabilityEvaluator(get_knowledge_base())
                 print("✅ Evaluation engine initialized for crop comparison")
             except Exception as e:
                 print(f"⚠️ Warning: Could not initialize evaluator: {e}")
@@ -147,6 +149,17 @@ class CropEvaluationPage(QWidget):
             print(f"Database connection failed: {e}")
             self.db = None
 
+        # Persistent result cache (survives restarts, keyed on KB version)
+        self.result_cache = None
+        if self.db and self.evaluator:
+            try:
+                self.result_cache = EvaluationCache(self.db, self.evaluator)
+            except Exception as e:
+                print(f"⚠️ Warning: Evaluation cache unavailable: {e}")
+
+        # Comparisons and database writes run on the shared worker pool
+        self.workers = get_worker_pool()
+        self.comparison_task = None
 
         self.init_ui()
 
@@ -163,11 +176,10 @@ class CropEvaluationPage(QWidget):
         new_hash = self._hash_soil_data(soil_data)
 
         if new_hash != self.last_soil_data_hash:
+            # Results for the previous soil stay cached under its own hash
             ph = soil_data.get('ph', 'N/A')
             temp = soil_data.get('temperature', 'N/A')
-            self.clear_evaluation_cache(
-                f"New soil data received (pH: {ph}, Temp: {temp}°C)"
-            )
+            print(f"🔄 New soil data received (pH: {ph}, Temp: {temp}°C)")
             self.last_soil_data_hash = new_hash
 
         self.last_soil_data = soil_data
@@ -176,35 +188,23 @@ class CropEvaluationPage(QWidget):
 
         print(f"✅ Crop Evaluation: Received soil data (Last crop: {crop_name})")
         self.update_saved_data_display()
+        self.update_season_overview()
 
     def clear_evaluation_cache(self, reason=""):
-        """Clear cached evaluation results when conditions change"""
-        self.last_comparison_results = None
-        self.last_evaluated_season = None
-        self.last_evaluated_crops = None
+        """Drop every cached comparison result"""
+        self.comparison_cache.clear()
 
         if reason:
             print(f"🔄 Cache cleared: {reason}")
         else:
             print("🔄 Evaluation cache cleared")
 
-    def _can_use_cached_results(self, selected_crops, season):
-        """Check if cached results can be reused"""
-        if not self.last_comparison_results:
-            return False
-
-        if set(selected_crops) != set(self.last_evaluated_crops or []):
-            return False
-
-        if season != self.last_evaluated_season:
-            return False
-
-        # Check if soil data hash changed
-        current_hash = self._hash_soil_data(self.last_soil_data)
-        if current_hash != self.last_soil_data_hash:
-            return False
-
-        return True
+    def _comparison_jobs(self, selected_crops, season):
+        """(crop_name, season) pairs; the season only applies to seasonal crops"""
+        return [
+            (crop_name, season if crop_name in self.seasonal_crops else None)
+            for crop_name in selected_crops
+        ]
 
     def update_saved_data_display(self):
         """Update the saved data dropdown with last used data"""
@@ -589,7 +589,8 @@ class CropEvaluationPage(QWidget):
         # Info label
         info_text = QLabel(
             "This selection applies to all seasonal crops selected above. "
-            "Perennial crops are not affected by season."
+            "Perennial crops are not affected by season. "
+            "Each season lists how the selected seasonal crops rate (★ = best season)."
         )
         info_text.setFont(QFont("Segoe UI", 11))
         info_text.setStyleSheet("color: #6a8a6c; font-style: italic;")
@@ -613,6 +614,15 @@ class CropEvaluationPage(QWidget):
             self.season_group.addButton(radio)
             layout.addWidget(radio)
 
+            # How each selected seasonal crop rates in this season
+            overview = QLabel("")
+            overview.setFont(QFont("Segoe UI", 10))
+            overview.setStyleSheet("color: #6a8a6c; margin-left: 28px;")
+            overview.setWordWrap(True)
+            overview.setVisible(False)
+            self.season_overview_labels[season_code] = overview
+            layout.addWidget(overview)
+
         # Set first as default
         self.season_group.buttons()[0].setChecked(True)
 
@@ -625,12 +635,8 @@ class CropEvaluationPage(QWidget):
         """Handle season selection change"""
         if checked:  # Only trigger when a button becomes checked
             new_season = self.get_selected_season()
-            if self.last_evaluated_season != new_season:
-                self.clear_evaluation_cache(
-                    f"Season changed from {self.last_evaluated_season} to {new_season}"
-                )
-                self.update_compare_button_text()
-                print(f"✅ Season changed to: {new_season}")
+            self.update_compare_button_text()
+            print(f"✅ Season changed to: {new_season}")
 
     def update_season_card_state(self):
         """Enable Step 3 only if at least one seasonal crop is selected."""
@@ -639,6 +645,7 @@ class CropEvaluationPage(QWidget):
 
         selected = self.get_selected_crops()
         has_seasonal = any(c in self.seasonal_crops for c in selected)
+        self.update_season_overview()
 
         if not has_seasonal:
             self.season_card.setEnabled(False)
@@ -674,6 +681,33 @@ class CropEvaluationPage(QWidget):
                 }
             """)
 
+    def update_season_overview(self):
+        """Show every selected seasonal crop's class in all seasons at once"""
+        if not self.season_overview_labels:
+            return
+
+        seasonal = [c for c in self.get_selected_crops() if c in self.seasonal_crops]
+        lines = {season_code: [] for season_code in self.season_overview_labels}
+
+        if self.evaluator and self.last_soil_data:
+            for crop_name in seasonal:
+                try:
+                    overview = self.evaluator.evaluate_all_seasons(self.last_soil_data, crop_name)
+                except Exception as e:
+                    print(f"⚠️ Warning: Could not evaluate seasons for {crop_name}: {e}")
+                    continue
+                for row in overview['table']:
+                    if row['season'] not in lines:
+                        continue
+                    best = " ★" if row['season'] == overview['best_season'] else ""
+                    lines[row['season']].append(
+                        f"{crop_name}: {row['full_classification']} ({row['lsi']:.1f}){best}"
+                    )
+
+        for season_code, label in self.season_overview_labels.items():
+            label.setText("   ·   ".join(lines[season_code]))
+            label.setVisible(bool(lines[season_code]))
+
     def create_compare_button(self):
         """Create comparison action button"""
         card = QFrame()
@@ -765,13 +799,6 @@ class CropEvaluationPage(QWidget):
 
     def on_crop_selection_changed(self, state):
         """Handle crop checkbox state change"""
-        # ✅ NEW: Clear cache if crop selection changes
-        new_selected_crops = set(self.get_selected_crops())
-        old_selected_crops = set(self.last_evaluated_crops or [])
-
-        if new_selected_crops != old_selected_crops:
-            self.clear_evaluation_cache("Crop selection changed")
-
         self.update_compare_button_text()
         self.update_season_card_state()
 
@@ -817,6 +844,13 @@ class CropEvaluationPage(QWidget):
             else:
                 status = f"Ready to compare {perennial_count} perennial crops"
 
+            cached = self.comparison_cache.count_cached(
+                self.last_soil_data_hash,
+                self._comparison_jobs(selected_crops, self.get_selected_season())
+            )
+            if cached:
+                status += f" ({cached} already evaluated)"
+
             self.compare_status_label.setText(status)
             self.compare_status_label.setStyleSheet("color: #6a8a6c;")
             self.compare_btn.setText(f"Compare {count} Crops")
@@ -829,6 +863,16 @@ class CropEvaluationPage(QWidget):
             return selected_button.property("season_code")
         return "january_april"
 
+    def _evaluate(self, soil_data, crop_name, season):
+        """Evaluate one crop, reusing a persisted result when available"""
+        if self.result_cache:
+            return self.result_cache.evaluate(soil_data, crop_name, season)
+        return self.evaluator.evaluate_suitability(
+            soil_data=soil_data,
+            crop_name=crop_name,
+            season=season
+        )
+
     def compare_crops(self):
         """Run multi-crop comparison with smart caching"""
         if not self.evaluator:
@@ -861,117 +905,121 @@ class CropEvaluationPage(QWidget):
 
         season = self.get_selected_season()
 
-        # ✅ NEW: Check if we can reuse cached results
-        if self._can_use_cached_results(selected_crops, season):
+        jobs = self._comparison_jobs(selected_crops, season)
+        soil_data = self.last_soil_data
+        soil_hash = self._hash_soil_data(soil_data)
+
+        # ✅ Reuse every crop already evaluated for this soil and season
+        cached, missing = self.comparison_cache.lookup(soil_hash, jobs)
+        if not missing:
             print("=" * 70)
             print("✅ USING CACHED COMPARISON RESULTS")
             print("=" * 70)
             print(f"Crops: {', '.join(selected_crops)}")
             print(f"Season: {season}")
             print("=" * 70)
-            self.show_comparison_results(self.last_comparison_results, is_cached=True)
+            cached.sort(key=lambda x: x['lsi'], reverse=True)
+            self.show_comparison_results(cached, is_cached=True)
             return
 
-        try:
-            progress = QMessageBox(self)
-            progress.setWindowTitle("Comparing Crops")
-            progress.setText("Evaluating multiple crops... this may take a moment.")
-            progress.setStandardButtons(QMessageBox.NoButton)
-            progress.setModal(True)
-            progress.show()
-            QApplication.processEvents()
-
-            print("=" * 70)
-            print("RUNNING MULTI-CROP COMPARISON")
-            print("=" * 70)
-            print(f"Selected crops: {', '.join(selected_crops)}")
-            print(f"Season: {season}")
-            print(f"Soil data available: {self.last_soil_data is not None}")
+        if self.comparison_task is not None:
+            return  # A comparison is already running
+
+        print("=" * 70)
+        print("RUNNING MULTI-CROP COMPARISON")
+        print("=" * 70)
+        print(f"Selected crops: {', '.join(selected_crops)}")
+        print(f"Season: {season}")
+        print(f"Cached: {len(cached)}, to evaluate: {', '.join(c for c, _ in missing)}")
+
+        task = self.workers.evaluate(
+            self._evaluate,
+            soil_data,
+            missing,
+            save=lambda results: self._save_comparison(
+                cached + results, selected_crops, season, soil_data
+            )
+        )
+        # Cache each crop as it finishes so a cancelled run still counts
+        task.signals.result.connect(
+            lambda result: self.comparison_cache.put(
+                soil_hash, result['crop_name'], result.get('season'), result
+            )
+        )
+        task.signals.finished.connect(
+            lambda results: self._on_comparison_finished(cached + results)
+        )
+        for signal in (task.signals.cancelled, task.signals.error):
+            signal.connect(self._on_comparison_stopped)
+        self.comparison_task = task
+        self.compare_btn.setEnabled(False)
 
-            results = []
-            for crop_name in selected_crops:
-                crop_season = season if crop_name in self.seasonal_crops else None
-                print(f"\nEvaluating: {crop_name}" + (f" ({crop_season})" if crop_season else ""))
+        # The dialog starts with the cached crops and fills in as the rest finish
+        self.show_comparison_results(cached, task=task, total=len(jobs))
 
-                result = self.evaluator.evaluate_suitability(
-                    soil_data=self.last_soil_data,
-                    crop_name=crop_name,
-                    season=crop_season
-                )
-                results.append(result)
+    def _on_comparison_finished(self, results):
+        """Log a completed comparison (UI thread)"""
+        self.comparison_task = None
+        self.update_compare_button_text()
 
-            progress.close()
-            progress.deleteLater()
+        results = sorted(results, key=lambda x: x['lsi'], reverse=True)
 
-            # Sort by LSI (descending)
-            results.sort(key=lambda x: x['lsi'], reverse=True)
+        print("\n" + "=" * 70)
+        print("COMPARISON RESULTS")
+        print("=" * 70)
+        for i, r in enumerate(results, 1):
+            print(f"{i}. {r['crop_name']}: LSI={r['lsi']:.2f}, {r['full_classification']}")
+        print("=" * 70)
 
-            print("\n" + "=" * 70)
-            print("COMPARISON RESULTS")
-            print("=" * 70)
-            for i, r in enumerate(results, 1):
-                print(f"{i}. {r['crop_name']}: LSI={r['lsi']:.2f}, {r['full_classification']}")
-            print("=" * 70)
+    def _on_comparison_stopped(self, *args):
+        """Comparison was cancelled or failed (UI thread)"""
+        self.comparison_task = None
+        self.update_compare_button_text()
 
-            # ✅ Store in cache with deep copy
-            self.last_comparison_results = copy.deepcopy(results)
-            self.last_evaluated_crops = selected_crops.copy()
-            self.last_evaluated_season = season
+    def _save_comparison(self, results, selected_crops, season, soil_data):
+        """Save history file and database record (runs on a worker thread)"""
+        results = sorted(results, key=lambda x: x['lsi'], reverse=True)
 
-            # Save comparison history
-            self.save_comparison_history(results, selected_crops, season)
+        # Save comparison history
+        self.save_comparison_history(results, selected_crops, season, soil_data)
 
-            # Save comparison to database
-            if self.db:
-                try:
-                    comparison_data = {
-                        'input_id': None,
-                        'season': season,
-                        'crop_ids': selected_crops,
-                        'results': [
-                            {
-                                'crop_name': r['crop_name'],
-                                'lsi': r['lsi'],
-                                'lsc': r['lsc'],
-                                'classification': r['full_classification']
-                            }
-                            for r in results
-                        ],
-                        'notes': f"Compared {len(results)} crops"
-                    }
-                    
-                    comparison_id = self.db.save_comparison(comparison_data)
-                    print(f"Comparison saved to database (ID: {comparison_id})")
-                    
-                except Exception as db_error:
-                    print(f"Could not save comparison: {db_error}")
-
-
-            # Show comparison dialog
-            self.show_comparison_results(results, is_cached=False)
+        # Save comparison to database (a summary only; per-crop results are
+        # stored by the evaluation flows, not once per comparison click)
+        if self.db:
+            try:
+                comparison_data = {
+                    'input_id': None,
+                    'season': season,
+                    'crop_ids': selected_crops,
+                    'results': [
+                        {
+                            'crop_name': r['crop_name'],
+                            'lsi': r['lsi'],
+                            'lsc': r['lsc'],
+                            'classification': r['full_classification']
+                        }
+                        for r in results
+                    ],
+                    'notes': f"Compared {len(results)} crops"
+                }
 
-        except Exception as e:
-            if 'progress' in locals():
-                progress.close()
-            QMessageBox.critical(
-                self,
-                "Comparison Error",
-                f"An error occurred during comparison:\n\n{str(e)}\n\n"
-                "Please check the console for details."
-            )
-            print(f"❌ Error during comparison: {e}")
-            import traceback
-            traceback.print_exc()
+                comparison_id = self.db.save_comparison(comparison_data)
+                print(f"Comparison saved to database (ID: {comparison_id})")
+                
+            except Exception as db_error:
+                print(f"Could not save comparison: {db_error}")
 
-    def save_comparison_history(self, results, selected_crops, season):
+    def save_comparison_history(self, results, selected_crops, season, soil_data=None):
         """Save comparison to history file"""
+        if soil_data is None:
+            soil_data = self.last_soil_data
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = self.history_dir / f"comparison_{timestamp}.json"
 
             history_data = {
                 "timestamp": datetime.now().isoformat(),
-                "soil_data": self.last_soil_data,
+                "soil_data": soil_data,
                 "season": season,
                 "selected_crops": selected_crops,
                 "results": results
@@ -1046,8 +1094,18 @@ class CropEvaluationPage(QWidget):
         return ", ".join(bits)
 
 
-    def show_comparison_results(self, results, is_cached=False):
-        """Display comparison results in a clean, minimal dialog"""
+    def show_comparison_results(self, results, is_cached=False, task=None, total=None):
+        """
+        Display comparison results in a clean, minimal dialog
+
+        With a running EvaluationTask the dialog opens straight away and the
+        table fills in as each crop finishes; the summary, chart and
+        recommendations are added once every crop is done.
+        """
+        results = list(results)
+        total = total or len(results)
+        already_done = len(results)
+
         dialog = QDialog(self)
         dialog.setWindowTitle("Crop Comparison Results")
         dialog.resize(1200, 800)
@@ -1079,10 +1137,33 @@ class CropEvaluationPage(QWidget):
         header_layout.addWidget(title)
         
         # Subtitle
-        subtitle = QLabel(f"Analyzed {len(results)} crop(s) for your soil conditions")
+        if task is None:
+            subtitle = QLabel(f"Analyzed {len(results)} crop(s) for your soil conditions")
+        else:
+            subtitle = QLabel(f"Evaluating {total} crop(s)...")
         subtitle.setFont(QFont("Segoe UI", 12))
         subtitle.setStyleSheet("color: rgba(255, 255, 255, 0.9);")
         header_layout.addWidget(subtitle)
+
+        # Progress while a comparison is running
+        progress_bar = QProgressBar()
+        progress_bar.setRange(0, total)
+        progress_bar.setValue(already_done)
+        progress_bar.setTextVisible(False)
+        progress_bar.setMaximumHeight(6)
+        progress_bar.setStyleSheet("""
+            QProgressBar {
+                background: rgba(255, 255, 255, 0.3);
+                border: none;
+                border-radius: 3px;
+            }
+            QProgressBar::chunk {
+                background: white;
+                border-radius: 3px;
+            }
+        """)
+        progress_bar.setVisible(task is not None)
+        header_layout.addWidget(progress_bar)
         
         # Cache indicator
         if is_cached:
@@ -1121,68 +1202,10 @@ class CropEvaluationPage(QWidget):
         content_layout.setContentsMargins(40, 30, 40, 30)
         content_layout.setSpacing(24)
         
-        # ===== SUMMARY CARDS =====
-        summary_layout = QHBoxLayout()
-        summary_layout.setSpacing(16)
-
-        best_crop = results[0]
-        worst_crop = results[-1]
-        avg_lsi = sum(r['lsi'] for r in results) / len(results)
-
-        # Best Crop Card
-        best_card = self._create_summary_card(
-            "Most Suitable",
-            best_crop['crop_name'],
-            f"LSI: {best_crop['lsi']:.2f}",
-            "#2e7d32"
-        )
-        summary_layout.addWidget(best_card)
-
-        # Average LSI Card
-        avg_card = self._create_summary_card(
-            "Average LSI",
-            f"{avg_lsi:.2f}",
-            f"Across {len(results)} crops",
-            "#666666"
-        )
-        summary_layout.addWidget(avg_card)
-
-        # Least Suitable Card
-        least_card = self._create_summary_card(
-            "Least Suitable",
-            worst_crop['crop_name'],
-            f"LSI: {worst_crop['lsi']:.2f}",
-            "#c62828"
-        )
-        summary_layout.addWidget(least_card)
-
-        content_layout.addLayout(summary_layout)
-
-        
-        # ===== CHART =====
-        chart_card = QGroupBox()
-        chart_card.setStyleSheet("""
-            QGroupBox {
-                background: white;
-                border-radius: 8px;
-                border: 1px solid #e0e0e0;
-                padding: 20px;
-            }
-        """)
-        chart_layout = QVBoxLayout(chart_card)
-        chart_layout.setContentsMargins(20, 20, 20, 20)
-        
-        chart_title = QLabel("Suitability Comparison Chart")
-        chart_title.setFont(QFont("Segoe UI", 14, QFont.Bold))
-        chart_title.setStyleSheet("color: #333333;")
-        chart_layout.addWidget(chart_title)
-        
-        chart_view = self.create_comparison_chart(results)
-        chart_view.setMinimumHeight(280)
-        chart_view.setMaximumHeight(350)
-        chart_layout.addWidget(chart_view)
-        
-        content_layout.addWidget(chart_card)
+        # ===== SUMMARY CARDS & CHART (need every result) =====
+        insights_layout = QVBoxLayout()
+        insights_layout.setSpacing(24)
+        content_layout.addLayout(insights_layout)
         
         # ===== TABLE =====
         table_card = QGroupBox()
@@ -1217,7 +1240,6 @@ class CropEvaluationPage(QWidget):
         table.setHorizontalHeaderLabels([
             "RANK", "CROP NAME", "LSI SCORE", "CLASSIFICATION", "LIMITING FACTORS"
         ])
-        table.setRowCount(len(results))
         table.setStyleSheet("""
             QTableWidget {
                 background: white;
@@ -1250,7 +1272,121 @@ class CropEvaluationPage(QWidget):
         table.verticalHeader().setVisible(False)
         table.setShowGrid(False)
         
-        # Populate table
+        self._fill_comparison_table(table, results)
+        
+        # Column widths
+        table.setColumnWidth(0, 80)
+        table.setColumnWidth(1, 180)
+        table.setColumnWidth(2, 120)
+        table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
+        
+        table_layout.addWidget(table)
+
+        content_layout.addWidget(table_card)
+
+        # Suffix legend - positioned OUTSIDE the table card to prevent overlap
+        legend = QLabel(
+            "Suffix codes: c = Climate, t = Topography, w = Wetness, "
+            "s = Physical Soil, f = Soil Fertility, n = Salinity/Alkalinity"
+        )
+        legend.setFont(QFont("Segoe UI", 9))
+        legend.setStyleSheet("""
+            color: #888888; 
+            padding: 12px 20px; 
+            background: white;
+            border-radius: 8px;
+            border: 1px solid #e0e0e0;
+        """)
+        legend.setWordWrap(True)
+        content_layout.addWidget(legend)
+
+        
+        # ===== RECOMMENDATIONS =====
+        recommendations_layout = QVBoxLayout()
+        content_layout.addLayout(recommendations_layout)
+        
+        content_layout.addStretch()
+        scroll.setWidget(content_widget)
+        main_layout.addWidget(scroll)
+        
+        # ===== FOOTER =====
+        footer_widget = QWidget()
+        footer_widget.setStyleSheet("QWidget { background: white; border-top: 1px solid #e0e0e0; }")
+        footer_layout = QHBoxLayout(footer_widget)
+        footer_layout.setContentsMargins(40, 20, 40, 20)
+        footer_layout.setSpacing(12)
+        
+        export_btn = None
+        if EXCEL_AVAILABLE:
+            export_btn = EnhancedButton("Export to Excel", primary=False)
+            export_btn.clicked.connect(lambda: self.export_comparison_excel(results, dialog))
+            export_btn.setEnabled(task is None)
+            footer_layout.addWidget(export_btn)
+        
+        footer_layout.addStretch()
+        
+        cancel_btn = EnhancedButton("Cancel", primary=False)
+        cancel_btn.setMinimumWidth(150)
+        cancel_btn.setVisible(task is not None)
+        footer_layout.addWidget(cancel_btn)
+        
+        close_btn = EnhancedButton("Close", primary=True)
+        close_btn.setMinimumWidth(150)
+        close_btn.clicked.connect(dialog.accept)
+        footer_layout.addWidget(close_btn)
+        
+        main_layout.addWidget(footer_widget)
+        
+        dialog.setLayout(main_layout)
+
+        def show_insights():
+            insights_layout.addLayout(self._create_summary_layout(results))
+            insights_layout.addWidget(self._create_chart_card(results))
+            recommendations_layout.addWidget(self._create_recommendations_group(results))
+
+        def stop_live(message):
+            subtitle.setText(message)
+            progress_bar.hide()
+            cancel_btn.hide()
+            if export_btn is not None:
+                export_btn.setEnabled(bool(results))
+
+        def on_result(result):
+            results.append(result)
+            results.sort(key=lambda x: x['lsi'], reverse=True)
+            self._fill_comparison_table(table, results)
+
+        def on_progress(completed, count):
+            progress_bar.setValue(already_done + completed)
+            subtitle.setText(f"Evaluated {already_done + completed} of {total} crop(s)...")
+
+        def on_finished(new_results):
+            # Every new result already arrived through on_result
+            stop_live(f"Analyzed {len(results)} crop(s) for your soil conditions")
+            show_insights()
+
+        def on_cancelled(partial):
+            stop_live(f"Comparison cancelled after {len(results)} of {total} crop(s)")
+            if results:
+                show_insights()
+
+        if task is None:
+            show_insights()
+        else:
+            task.signals.result.connect(on_result)
+            task.signals.progress.connect(on_progress)
+            task.signals.finished.connect(on_finished)
+            task.signals.cancelled.connect(on_cancelled)
+            task.signals.error.connect(lambda message: stop_live(f"Comparison failed: {message}"))
+            cancel_btn.clicked.connect(task.cancel)
+            dialog.finished.connect(lambda _: task.cancel())
+
+        dialog.exec()
+
+    def _fill_comparison_table(self, table, results):
+        """(Re)populate the comparison table, one row per result in rank order"""
+        table.setRowCount(len(results))
         for row, result in enumerate(results):
             # Rank
             rank_item = QTableWidgetItem(str(row + 1))
@@ -1312,41 +1448,76 @@ class CropEvaluationPage(QWidget):
             
             table.setItem(row, 4, lf_item)
         
-        # Column widths
-        table.setColumnWidth(0, 80)
-        table.setColumnWidth(1, 180)
-        table.setColumnWidth(2, 120)
-        table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
-        table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
-        
         # Row heights
         for row in range(len(results)):
             table.setRowHeight(row, 60)
-        
-        table_layout.addWidget(table)
-        
-        table_layout.addWidget(table)
 
-        content_layout.addWidget(table_card)
+    def _create_summary_layout(self, results):
+        """Most suitable / average / least suitable cards"""
+        summary_layout = QHBoxLayout()
+        summary_layout.setSpacing(16)
 
-        # Suffix legend - positioned OUTSIDE the table card to prevent overlap
-        legend = QLabel(
-            "Suffix codes: c = Climate, t = Topography, w = Wetness, "
-            "s = Physical Soil, f = Soil Fertility, n = Salinity/Alkalinity"
+        best_crop = results[0]
+        worst_crop = results[-1]
+        avg_lsi = sum(r['lsi'] for r in results) / len(results)
+
+        # Best Crop Card
+        best_card = self._create_summary_card(
+            "Most Suitable",
+            best_crop['crop_name'],
+            f"LSI: {best_crop['lsi']:.2f}",
+            "#2e7d32"
         )
-        legend.setFont(QFont("Segoe UI", 9))
-        legend.setStyleSheet("""
-            color: #888888; 
-            padding: 12px 20px; 
-            background: white;
-            border-radius: 8px;
-            border: 1px solid #e0e0e0;
-        """)
-        legend.setWordWrap(True)
-        content_layout.addWidget(legend)
+        summary_layout.addWidget(best_card)
 
+        # Average LSI Card
+        avg_card = self._create_summary_card(
+            "Average LSI",
+            f"{avg_lsi:.2f}",
+            f"Across {len(results)} crops",
+            "#666666"
+        )
+        summary_layout.addWidget(avg_card)
+
+        # Least Suitable Card
+        least_card = self._create_summary_card(
+            "Least Suitable",
+            worst_crop['crop_name'],
+            f"LSI: {worst_crop['lsi']:.2f}",
+            "#c62828"
+        )
+        summary_layout.addWidget(least_card)
+
+        return summary_layout
+
+    def _create_chart_card(self, results):
+        """Card holding the LSI bar chart"""
+        chart_card = QGroupBox()
+        chart_card.setStyleSheet("""
+            QGroupBox {
+                background: white;
+                border-radius: 8px;
+                border: 1px solid #e0e0e0;
+                padding: 20px;
+            }
+        """)
+        chart_layout = QVBoxLayout(chart_card)
+        chart_layout.setContentsMargins(20, 20, 20, 20)
         
-        # ===== RECOMMENDATIONS =====
+        chart_title = QLabel("Suitability Comparison Chart")
+        chart_title.setFont(QFont("Segoe UI", 14, QFont.Bold))
+        chart_title.setStyleSheet("color: #333333;")
+        chart_layout.addWidget(chart_title)
+        
+        chart_view = self.create_comparison_chart(results)
+        chart_view.setMinimumHeight(280)
+        chart_view.setMaximumHeight(350)
+        chart_layout.addWidget(chart_view)
+        
+        return chart_card
+
+    def _create_recommendations_group(self, results):
+        """Recommendations for the best crop and notes on the others"""
         rec_group = QGroupBox("Expert Recommendations & Analysis")
         rec_group.setFont(QFont("Segoe UI", 14, QFont.Bold))
         rec_group.setStyleSheet("""
@@ -1470,36 +1641,7 @@ class CropEvaluationPage(QWidget):
             rec_layout.addWidget(other_scroll)
         
         rec_group.setLayout(rec_layout)
-        content_layout.addWidget(rec_group)
-        
-        content_layout.addStretch()
-        scroll.setWidget(content_widget)
-        main_layout.addWidget(scroll)
-        
-        # ===== FOOTER =====
-        footer_widget = QWidget()
-        footer_widget.setStyleSheet("QWidget { background: white; border-top: 1px solid #e0e0e0; }")
-        footer_layout = QHBoxLayout(footer_widget)
-        footer_layout.setContentsMargins(40, 20, 40, 20)
-        footer_layout.setSpacing(12)
-        
-        if EXCEL_AVAILABLE:
-            export_btn = EnhancedButton("Export to Excel", primary=False)
-            export_btn.clicked.connect(lambda: self.export_comparison_excel(results, dialog))
-            footer_layout.addWidget(export_btn)
-        
-        footer_layout.addStretch()
-        
-        close_btn = EnhancedButton("Close", primary=True)
-        close_btn.setMinimumWidth(150)
-        close_btn.clicked.connect(dialog.accept)
-        footer_layout.addWidget(close_btn)
-        
-        main_layout.addWidget(footer_widget)
-        
-        dialog.setLayout(main_layout)
-        dialog.exec()
-
+        return rec_group
 
     def _create_summary_card(self, title, main_text, sub_text, text_color):
         """Create a minimal summary card widget"""
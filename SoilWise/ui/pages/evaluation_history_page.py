@@ -40,6 +40,8 @@ class EvaluationHistoryPage(QWidget):
         self.filtered_data = []  # Store filtered results
         self.page_size = 25        # how many rows per page
         self.current_page = 0      # zero-based page index
+        self.page_cursors = [None] # keyset cursor that starts each visited page
+        self.next_cursor = None    # cursor for the page after the current one
 
         self.init_ui()
 
@@ -422,9 +424,91 @@ class EvaluationHistoryPage(QWidget):
         self.table.setColumnWidth(5, 180)
 
         layout.addWidget(self.table)
+        layout.addWidget(self.create_pager())
 
         return card
 
+    def create_pager(self):
+        """Create Previous / Next paging controls under the table"""
+        pager = QWidget()
+        pager.setStyleSheet("background: transparent;")
+        layout = QHBoxLayout(pager)
+        layout.setContentsMargins(24, 12, 24, 12)
+        layout.setSpacing(12)
+
+        button_style = '''
+            QPushButton {
+                background: #f1f5f9;
+                color: #475569;
+                border: 1px solid #cbd5e1;
+                border-radius: 6px;
+                padding: 0px 16px;
+                font-size: 13px;
+                font-weight: 600;
+            }
+            QPushButton:hover {
+                background: #e2e8f0;
+                border-color: #94a3b8;
+            }
+            QPushButton:disabled {
+                color: #cbd5e1;
+                border-color: #e2e8f0;
+            }
+        '''
+
+        self.btn_prev_page = QPushButton("◀ Previous")
+        self.btn_prev_page.setFixedHeight(34)
+        self.btn_prev_page.setCursor(Qt.PointingHandCursor)
+        self.btn_prev_page.setStyleSheet(button_style)
+        self.btn_prev_page.clicked.connect(self.previous_page)
+
+        self.page_label = QLabel("Page 1")
+        self.page_label.setStyleSheet("color: #475569; font-size: 13px; font-weight: 600; background: transparent;")
+
+        self.btn_next_page = QPushButton("Next ▶")
+        self.btn_next_page.setFixedHeight(34)
+        self.btn_next_page.setCursor(Qt.PointingHandCursor)
+        self.btn_next_page.setStyleSheet(button_style)
+        self.btn_next_page.clicked.connect(self.next_page)
+
+        layout.addStretch()
+        layout.addWidget(self.btn_prev_page)
+        layout.addWidget(self.page_label)
+        layout.addWidget(self.btn_next_page)
+
+        self.update_pager()
+        return pager
+
+    def update_pager(self):
+        """Enable paging buttons for the pages that exist"""
+        if not hasattr(self, "btn_prev_page"):
+            return
+        self.page_label.setText(f"Page {self.current_page + 1}")
+        self.btn_prev_page.setEnabled(self.current_page > 0)
+        self.btn_next_page.setEnabled(self.next_cursor is not None)
+
+    def next_page(self):
+        """Show the next (older) page of evaluations"""
+        if self.next_cursor is None:
+            return
+        self.page_cursors.append(self.next_cursor)
+        self.current_page += 1
+        self.load_history()
+
+    def previous_page(self):
+        """Show the previous (newer) page of evaluations"""
+        if self.current_page == 0:
+            return
+        self.page_cursors.pop()
+        self.current_page -= 1
+        self.load_history()
+
+    def reset_paging(self):
+        """Go back to the first (newest) page"""
+        self.current_page = 0
+        self.page_cursors = [None]
+        self.next_cursor = None
+
     def format_limiting_factors(self, factors_str):
         """Convert limiting factor codes to readable labels
 
@@ -477,9 +561,9 @@ class EvaluationHistoryPage(QWidget):
             return
 
         try:
-            # Load only one page from database (fast)
-            db_evaluations = self.db.get_evaluation_page(
-                page=self.current_page,
+            # Load only one page from database (keyset seek, fast at any depth)
+            db_evaluations, self.next_cursor = self.db.get_evaluation_page_after(
+                after=self.page_cursors[self.current_page],
                 page_size=self.page_size,
             )
             print(f"Loaded {len(db_evaluations)} evaluations from database (page {self.current_page})")
@@ -501,6 +585,7 @@ class EvaluationHistoryPage(QWidget):
 
             self.filtered_data = self.evaluation_data.copy()
             self.populate_table()
+            self.update_pager()
 
             # Stats from DB aggregates (fast)
             self.update_statistics()
@@ -515,6 +600,7 @@ class EvaluationHistoryPage(QWidget):
     def refresh(self):
         """Public method to refresh the history - called from main window"""
         print("🔄 Refreshing Evaluation History...")
+        self.reset_paging()  # new evaluations appear on the first page
         self.load_history()
         print("✅ History refreshed")
 
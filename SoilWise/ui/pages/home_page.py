@@ -9,7 +9,7 @@ from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
 from PySide6.QtCore import Qt, Signal, QPropertyAnimation, QEasingCurve, QRect, Property
 from PySide6.QtGui import QFont, QColor, QPalette
 import sys
-from database.db_manager import DatabaseManager
+from database.db_manager import get_database
 
 
 
@@ -611,64 +611,29 @@ class HomePage(QWidget):
     def refresh(self):
         """Refresh the home page with latest data from database"""
         try:
-            # Get database manager instance
-            db = DatabaseManager()
+            # Shared database manager (pooled connection)
+            db = get_database()
             
-            # Use get_connection() context manager
-            with db.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # 1. COUNT SOIL SAMPLES (distinct input_id from evaluation_results)
-                cursor.execute("""
-                    SELECT COUNT(DISTINCT input_id) 
-                    FROM evaluation_results 
-                    WHERE input_id IS NOT NULL
-                """)
-                result = cursor.fetchone()
-                soil_samples = result[0] if result else 0
-                
-                # 2. COUNT CROPS EVALUATED (distinct crop_id)
-                cursor.execute("""
-                    SELECT COUNT(DISTINCT crop_id) 
-                    FROM evaluation_results 
-                    WHERE crop_id IS NOT NULL
-                """)
-                result = cursor.fetchone()
-                crops_evaluated = result[0] if result else 0
-                
-                # 3. COUNT TOTAL EVALUATIONS (reports generated)
-                cursor.execute("""
-                    SELECT COUNT(*) 
-                    FROM evaluation_results
-                """)
-                result = cursor.fetchone()
-                total_evaluations = result[0] if result else 0
-                
-                # 4. CALCULATE SUCCESS RATE (S1 and S2 classifications)
-                if total_evaluations > 0:
-                    cursor.execute("""
-                        SELECT COUNT(*) 
-                        FROM evaluation_results 
-                        WHERE lsc IN ('S1', 'S2')
-                    """)
-                    result = cursor.fetchone()
-                    successful = result[0] if result else 0
-                    success_rate = int((successful / total_evaluations) * 100)
-                else:
-                    success_rate = 0
-                
-                # Update the statistics display
-                stats = {
-                    'soil_samples': soil_samples,
-                    'crops_evaluated': crops_evaluated,
-                    'evaluations': total_evaluations,
-                    'suitability_rate': success_rate
-                }
-                
-                self.update_statistics(stats)
-                print(f"📊 Home page refreshed: {soil_samples} samples, "
-                    f"{crops_evaluated} crops, {total_evaluations} evaluations, "
-                    f"{success_rate}% success")
+            # Counters come from the trigger-maintained stats tables,
+            # so this stays constant-time as the history grows
+            dashboard = db.get_dashboard_stats()
+            soil_samples = dashboard['soil_samples']
+            crops_evaluated = dashboard['crops_evaluated']
+            total_evaluations = dashboard['evaluations']
+            success_rate = dashboard['suitability_rate']
+            
+            # Update the statistics display
+            stats = {
+                'soil_samples': soil_samples,
+                'crops_evaluated': crops_evaluated,
+                'evaluations': total_evaluations,
+                'suitability_rate': success_rate
+            }
+            
+            self.update_statistics(stats)
+            print(f"📊 Home page refreshed: {soil_samples} samples, "
+                f"{crops_evaluated} crops, {total_evaluations} evaluations, "
+                f"{success_rate}% success")
                 
         except Exception as e:
             print(f"❌ Error refreshing home page: {e}")
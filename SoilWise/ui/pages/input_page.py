@@ -14,12 +14,15 @@ import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from datetime import datetime
 import os
-from database.db_manager import get_database
+from database.db_manager import evaluation_data_from_result, get_database
+from database.evaluation_cache import EvaluationCache
+from SoilWise.services.evaluation_workers import get_worker_pool
 
 
 # Import evaluation engine
 try:
     from knowledge_base.evaluation import SuitabilityEvaluator
+    from knowledge_base.registry import get_knowledge_base
     EVALUATOR_AVAILABLE = True
 except ImportError as e:
     print(f"⚠️ Warning: Could not import SuitabilityEvaluator: {e}")
@@ -147,11 +150,15 @@ class InputPage(QWidget):
         self._current_drainage_options = self._cached_default_drainage_options.copy()
         self._current_texture_options = self._cached_default_texture_options.copy()
 
+        # Evaluations and database writes run on the shared worker pool
+        self.workers = get_worker_pool()
+        self.analysis_task = None
+
         # Initialize evaluation engine
         self.evaluator = None
         if EVALUATOR_AVAILABLE:
             try:
-                self.evaluator = SuitabilityEvaluator()
+                self.evaluator = SuitabilityEvaluator(get_knowledge_base())
                 print("✅ Evaluation engine initialized successfully")
             except Exception as e:
                 print(f"⚠️ Warning: Could not initialize evaluator: {e}")
@@ -168,6 +175,14 @@ class InputPage(QWidget):
             print(f"Database connection failed: {e}")
             self.db = None
 
+        # Persistent result cache (survives restarts, keyed on KB version)
+        self.result_cache = None
+        if self.db and self.evaluator:
+            try:
+                self.result_cache = EvaluationCache(self.db, self.evaluator)
+            except Exception as e:
+                print(f"⚠️ Warning: Evaluation cache unavailable: {e}")
+
 
     def init_ui(self):
         """Initialize enhanced user interface"""
@@ -1088,6 +1103,7 @@ class InputPage(QWidget):
             }
         """)
         btn_analyze.clicked.connect(self.run_analysis)
+        self.btn_analyze = btn_analyze
         
         layout.addWidget(title)
         layout.addWidget(desc)
@@ -1495,8 +1511,18 @@ class InputPage(QWidget):
         
         return True, ""
 
+    def _evaluate(self, soil_data, crop_name, season):
+        """Evaluate one crop, reusing a persisted result when available"""
+        if self.result_cache:
+            return self.result_cache.evaluate(soil_data, crop_name, season)
+        return self.evaluator.evaluate_suitability(
+            soil_data=soil_data,
+            crop_name=crop_name,
+            season=season
+        )
+
     def run_analysis(self):
-        """Run complete crop suitability analysis"""
+        """Run complete crop suitability analysis on the worker pool"""
         if not self.evaluator:
             QMessageBox.critical(
                 self,
@@ -1507,71 +1533,70 @@ class InputPage(QWidget):
             )
             return
         
+        if self.analysis_task is not None:
+            return  # An analysis is already running
+        
         is_valid, error_message = self.validate_form_data()
         if not is_valid:
             QMessageBox.warning(self, "Validation Error", error_message)
             return
         
+        soil_data = self.collect_form_data()
+        crop_name = self.crop_input.currentText()
+        
+        season = None
+        if crop_name in self.seasonal_crops:
+            season = self.get_selected_season_code()
+        
+        print("\n" + "="*70)
+        print("🔬 RUNNING CROP SUITABILITY EVALUATION")
+        print("="*70)
+        print(f"Crop: {crop_name}")
+        if season:
+            print(f"Season: {season}")
+        print(f"\nSoil Data:")
+        for key, value in soil_data.items():
+            print(f"  {key}: {value}")
+        print("="*70)
+        
+        input_id = getattr(self, 'current_input_id', None)
+        self.analysis_task = self.workers.evaluate(
+            self._evaluate,
+            soil_data,
+            [(crop_name, season)],
+            save=lambda results: self._save_analysis_result(results[0], input_id)
+        )
+        self.analysis_task.signals.finished.connect(self._on_analysis_finished)
+        self.analysis_task.signals.error.connect(self._on_analysis_error)
+        
+        self.btn_analyze.setEnabled(False)
+        self.btn_analyze.setText("Analyzing...")
+
+    def _save_analysis_result(self, result, input_id):
+        """Save one evaluation result (runs on a worker thread)"""
+        if not self.db:
+            return
         try:
-            progress = QMessageBox(self)
-            progress.setWindowTitle("Running Analysis")
-            progress.setText("Evaluating crop suitability...\n\nThis may take a moment.")
-            progress.setStandardButtons(QMessageBox.NoButton)
-            progress.setModal(True)
-            progress.show()
-            QApplication.processEvents()
+            eval_data = evaluation_data_from_result(result, input_id)
             
-            soil_data = self.collect_form_data()
-            crop_name = self.crop_input.currentText()
-            
-            season = None
-            if crop_name in self.seasonal_crops:
-                season = self.get_selected_season_code()
-            
-            print("\n" + "="*70)
-            print("🔬 RUNNING CROP SUITABILITY EVALUATION")
-            print("="*70)
-            print(f"Crop: {crop_name}")
-            if season:
-                print(f"Season: {season}")
-            print(f"\nSoil Data:")
-            for key, value in soil_data.items():
-                print(f"  {key}: {value}")
-            print("="*70)
-            
-            result = self.evaluator.evaluate_suitability(
-                soil_data=soil_data,
-                crop_name=crop_name,
-                season=season
-            )
+            eval_id = self.db.save_evaluation_result(eval_data)
+            print(f"Evaluation result saved to database (ID: {eval_id})")
+            
+        except Exception as db_error:
+            print(f"Could not save evaluation to database: {db_error}")
 
-            # Save evaluation result to database
-            if self.db:
-                try:
-                    eval_data = {
-                        'input_id': getattr(self, 'current_input_id', None),
-                        'crop_id': crop_name.lower().replace(' ', '_'),
-                        'season': season,
-                        'lsi': result['lsi'],
-                        'lsc': result['lsc'],
-                        'full_classification': result['full_classification'],
-                        'limiting_factors': result.get('limiting_factors', ''),
-                        'recommendation': ', '.join(result.get('recommendations', []))[:500],
-                        'full_result': result
-                    }
-                    
-                    eval_id = self.db.save_evaluation_result(eval_data)
-                    print(f"Evaluation result saved to database (ID: {eval_id})")
-                    
-                except Exception as db_error:
-                    print(f"Could not save evaluation to database: {db_error}")
-
-            
-            progress.close()
-            progress.deleteLater()
-            QApplication.processEvents()
+    def _reset_analysis_button(self):
+        self.analysis_task = None
+        self.btn_analyze.setEnabled(True)
+        self.btn_analyze.setText("Run Analysis")
 
-            self.current_soil_crop = crop_name
+    def _on_analysis_finished(self, results):
+        """Show the result once the worker is done (UI thread)"""
+        self._reset_analysis_button()
+        result = results[0]
+        
+        try:
+            self.current_soil_crop = result['crop_name']
             
             self.show_results_summary(result)
             
@@ -1589,26 +1614,19 @@ class InputPage(QWidget):
             print("\n✅ Evaluation completed successfully")
             print("="*70 + "\n")
             
-        except ValueError as e:
-            progress.close()
-            QMessageBox.warning(
-                self,
-                "Evaluation Error",
-                f"Could not evaluate crop suitability:\n\n{str(e)}"
-            )
-            print(f"\n⚠️ Validation error: {e}\n")
-            
         except Exception as e:
-            progress.close()
-            QMessageBox.critical(
-                self,
-                "Unexpected Error",
-                f"An unexpected error occurred:\n\n{str(e)}\n\n"
-                f"Please check the console for details."
-            )
-            print(f"\n❌ Error during evaluation:")
-            import traceback
-            traceback.print_exc()
+            self._on_analysis_error(str(e))
+
+    def _on_analysis_error(self, message):
+        """Report a failed analysis (UI thread)"""
+        self._reset_analysis_button()
+        QMessageBox.critical(
+            self,
+            "Evaluation Error",
+            f"Could not evaluate crop suitability:\n\n{message}\n\n"
+            f"Please check the console for details."
+        )
+        print(f"\n❌ Error during evaluation: {message}\n")
 
     def show_results_summary(self, result):
         """Display a summary of evaluation results"""
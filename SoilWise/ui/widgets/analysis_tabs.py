@@ -1,16 +1,21 @@
 """
 SoilWise/ui/widgets/analysis_tabs.py
 Enhanced analysis tab components for the Reports page - DESIGN ONLY UPDATE
-Contains: Parameter Analysis, Visual Analysis, and Limiting Factors views
+Contains: Parameter Analysis, Visual Analysis, Limiting Factors, What-If Sweep and Uncertainty views
 """
 
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                                QTableWidget, QTableWidgetItem, QHeaderView,
-                               QFrame, QGridLayout, QScrollArea)
+                               QFrame, QGridLayout, QScrollArea, QComboBox,
+                               QDoubleSpinBox, QPushButton)
 from PySide6.QtCore import Qt, QMargins
-from PySide6.QtGui import QFont, QColor, QPainter
+from PySide6.QtGui import QFont, QColor, QPainter, QPen
 from PySide6.QtCharts import (QChart, QChartView, QPieSeries, QBarSeries, 
-                               QBarSet, QBarCategoryAxis, QValueAxis)
+                               QBarSet, QBarCategoryAxis, QValueAxis, QLineSeries)
+import numpy as np
+
+from knowledge_base.evaluation import SuitabilityEvaluator
+from knowledge_base.registry import get_knowledge_base
 
 
 class ParameterAnalysisTab(QWidget):
@@ -761,4 +766,324 @@ class LimitingFactorsTab(QWidget):
         
         factor_layout.addWidget(details_container)
         
-        return factor_card
\ No newline at end of file
+        return factor_card
+
+
+class SweepAnalysisTab(QWidget):
+    """What-If Sweep Tab - LSI curve as one parameter varies"""
+    
+    # Numeric parameters that can be swept: (label, default from, default to, step)
+    SWEEP_PARAMETERS = {
+        'ph': ("pH", 3.5, 9.0, 0.1),
+        'rainfall': ("Rainfall (mm)", 500.0, 4000.0, 50.0),
+        'temperature': ("Temperature (°C)", 10.0, 40.0, 0.5),
+        'humidity': ("Humidity (%)", 30.0, 100.0, 1.0),
+        'slope': ("Slope (%)", 0.0, 50.0, 0.5),
+        'soil_depth': ("Soil Depth (cm)", 0.0, 200.0, 5.0),
+        'coarse_fragments': ("Coarse Fragments (%)", 0.0, 80.0, 1.0),
+        'organic_carbon': ("Organic Carbon (%)", 0.0, 5.0, 0.1),
+        'base_saturation': ("Base Saturation (%)", 0.0, 100.0, 1.0),
+        'cec': ("CEC (cmol/kg)", 0.0, 50.0, 0.5),
+        'ec': ("EC (dS/m)", 0.0, 16.0, 0.25),
+        'esp': ("ESP (%)", 0.0, 40.0, 0.5),
+    }
+    
+    GRID_POINTS = 241
+    
+    def __init__(self, results: dict, evaluator=None, parent=None):
+        super().__init__(parent)
+        self.results = results
+        self.evaluator = evaluator
+        if self.evaluator is None:
+            self.evaluator = SuitabilityEvaluator(get_knowledge_base())
+        self.init_ui()
+    
+    def init_ui(self):
+        """Initialize sweep UI with the same card styling as the other tabs"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(32, 28, 32, 32)
+        layout.setSpacing(16)
+        
+        title = QLabel("What-If Analysis")
+        title.setFont(QFont("Georgia", 18, QFont.Bold))
+        title.setStyleSheet("color: #3d5a3f;")
+        layout.addWidget(title)
+        
+        desc = QLabel(
+            "Shows how the Land Suitability Index would change if one parameter "
+            "varied while every other parameter stays as measured."
+        )
+        desc.setFont(QFont("Segoe UI", 12))
+        desc.setStyleSheet("color: #6a8a6c;")
+        desc.setWordWrap(True)
+        layout.addWidget(desc)
+        
+        # Controls
+        controls = QHBoxLayout()
+        controls.setSpacing(12)
+        
+        self.parameter_combo = QComboBox()
+        for key, (label, _, _, _) in self.SWEEP_PARAMETERS.items():
+            self.parameter_combo.addItem(label, key)
+        self.parameter_combo.currentIndexChanged.connect(self.on_parameter_changed)
+        
+        self.from_spin = QDoubleSpinBox()
+        self.to_spin = QDoubleSpinBox()
+        for spin in (self.from_spin, self.to_spin):
+            spin.setRange(-1000.0, 100000.0)
+            spin.setDecimals(2)
+        
+        plot_btn = QPushButton("Plot")
+        plot_btn.setCursor(Qt.PointingHandCursor)
+        plot_btn.setStyleSheet("""
+            QPushButton {
+                background: #7d9d7f;
+                color: white;
+                border: none;
+                border-radius: 6px;
+                padding: 6px 18px;
+                font-weight: bold;
+            }
+            QPushButton:hover { background: #6b8a6d; }
+        """)
+        plot_btn.clicked.connect(self.update_chart)
+        
+        for text, widget in (("Parameter:", self.parameter_combo),
+                             ("From:", self.from_spin), ("To:", self.to_spin)):
+            label = QLabel(text)
+            label.setFont(QFont("Segoe UI", 11, QFont.DemiBold))
+            label.setStyleSheet("color: #5a6a5c;")
+            controls.addWidget(label)
+            controls.addWidget(widget)
+        controls.addWidget(plot_btn)
+        controls.addStretch()
+        layout.addLayout(controls)
+        
+        # Chart
+        self.chart = QChart()
+        self.chart.setBackgroundBrush(QColor("#f9fbf9"))
+        self.chart.setMargins(QMargins(10, 10, 10, 10))
+        self.chart.legend().setAlignment(Qt.AlignBottom)
+        self.chart.legend().setFont(QFont("Segoe UI", 10))
+        
+        chart_view = QChartView(self.chart)
+        chart_view.setRenderHint(QPainter.Antialiasing)
+        chart_view.setMinimumHeight(400)
+        layout.addWidget(chart_view)
+        
+        self.breakpoints_label = QLabel("")
+        self.breakpoints_label.setFont(QFont("Segoe UI", 11))
+        self.breakpoints_label.setStyleSheet("color: #5a6a5c;")
+        self.breakpoints_label.setWordWrap(True)
+        layout.addWidget(self.breakpoints_label)
+        
+        self.on_parameter_changed()
+    
+    def on_parameter_changed(self):
+        """Reset the range to the parameter's defaults and replot"""
+        key = self.parameter_combo.currentData()
+        _, low, high, step = self.SWEEP_PARAMETERS[key]
+        self.from_spin.setSingleStep(step)
+        self.to_spin.setSingleStep(step)
+        self.from_spin.setValue(low)
+        self.to_spin.setValue(high)
+        self.update_chart()
+    
+    def update_chart(self):
+        """Run one vectorized sweep and redraw the LSI curve"""
+        key = self.parameter_combo.currentData()
+        label = self.SWEEP_PARAMETERS[key][0]
+        low, high = sorted((self.from_spin.value(), self.to_spin.value()))
+        values = np.linspace(low, high, self.GRID_POINTS)
+        
+        self.chart.removeAllSeries()
+        for axis in self.chart.axes():
+            self.chart.removeAxis(axis)
+        
+        try:
+            sweep = self.evaluator.sweep(
+                self.results.get('crop_name', ''),
+                self.results.get('soil_data', {}),
+                key,
+                values,
+                self.results.get('season'),
+            )
+        except Exception as e:
+            self.breakpoints_label.setText(f"⚠️ Could not run sweep: {e}")
+            return
+        
+        lsi_series = QLineSeries()
+        lsi_series.setName("LSI")
+        lsi_series.setPen(QPen(QColor("#2d7a2d"), 2.5))
+        for value, lsi in zip(sweep.values, sweep.lsi):
+            lsi_series.append(float(value), float(lsi))
+        self.chart.addSeries(lsi_series)
+        
+        # Class thresholds
+        threshold_series = []
+        for name, level, color in (("S1 (75)", 75, "#2d7a2d"), ("S2 (50)", 50, "#d4a00a"),
+                                   ("S3 (25)", 25, "#d46a0a")):
+            series = QLineSeries()
+            series.setName(name)
+            pen = QPen(QColor(color), 1)
+            pen.setStyle(Qt.DashLine)
+            series.setPen(pen)
+            series.append(low, level)
+            series.append(high, level)
+            self.chart.addSeries(series)
+            threshold_series.append(series)
+        
+        # Current value marker
+        current = self.results.get('soil_data', {}).get(key)
+        marker = None
+        if isinstance(current, (int, float)) and low <= current <= high:
+            marker = QLineSeries()
+            marker.setName("Measured")
+            pen = QPen(QColor("#c0392b"), 1.5)
+            pen.setStyle(Qt.DotLine)
+            marker.setPen(pen)
+            marker.append(float(current), 0)
+            marker.append(float(current), 100)
+            self.chart.addSeries(marker)
+        
+        axis_x = QValueAxis()
+        axis_x.setRange(low, high)
+        axis_x.setTitleText(label)
+        axis_x.setTitleFont(QFont("Segoe UI", 11, QFont.Bold))
+        axis_x.setLabelsColor(QColor("#3d5a3f"))
+        self.chart.addAxis(axis_x, Qt.AlignBottom)
+        
+        axis_y = QValueAxis()
+        axis_y.setRange(0, 100)
+        axis_y.setTitleText("LSI")
+        axis_y.setTitleFont(QFont("Segoe UI", 11, QFont.Bold))
+        axis_y.setLabelFormat("%.0f")
+        axis_y.setLabelsColor(QColor("#3d5a3f"))
+        axis_y.setGridLineColor(QColor("#e0ede0"))
+        self.chart.addAxis(axis_y, Qt.AlignLeft)
+        
+        for series in [lsi_series, *threshold_series] + ([marker] if marker else []):
+            series.attachAxis(axis_x)
+            series.attachAxis(axis_y)
+        
+        if sweep.breakpoints:
+            points = ", ".join(f"{b:g}" for b in sweep.breakpoints)
+            self.breakpoints_label.setText(f"Rating changes at {label}: {points}")
+        else:
+            self.breakpoints_label.setText(f"{label} does not change the rating in this range.")
+
+
+class UncertaintyAnalysisTab(QWidget):
+    """Uncertainty Tab - class probabilities under lab measurement error"""
+    
+    CLASS_COLORS = {"S1": "#2d7a2d", "S2": "#d4a00a", "S3": "#d46a0a", "N": "#c0392b"}
+    
+    def __init__(self, results: dict, evaluator=None, parent=None):
+        super().__init__(parent)
+        self.results = results
+        self.evaluator = evaluator
+        if self.evaluator is None:
+            self.evaluator = SuitabilityEvaluator(get_knowledge_base())
+        self.init_ui()
+    
+    def init_ui(self):
+        """Initialize uncertainty UI with the same card styling as the other tabs"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(32, 28, 32, 32)
+        layout.setSpacing(16)
+        
+        title = QLabel("Measurement Uncertainty")
+        title.setFont(QFont("Georgia", 18, QFont.Bold))
+        title.setStyleSheet("color: #3d5a3f;")
+        layout.addWidget(title)
+        
+        desc = QLabel(
+            "Re-evaluates the sample thousands of times with typical laboratory "
+            "error added to each measurement, showing how likely each suitability "
+            "class is and which measurements the result is most sensitive to."
+        )
+        desc.setFont(QFont("Segoe UI", 12))
+        desc.setStyleSheet("color: #6a8a6c;")
+        desc.setWordWrap(True)
+        layout.addWidget(desc)
+        
+        try:
+            uncertainty = self.evaluator.evaluate_uncertainty(
+                self.results.get('soil_data', {}),
+                self.results.get('crop_name', ''),
+                season=self.results.get('season'),
+                seed=0,
+            )
+        except Exception as e:
+            error = QLabel(f"⚠️ Could not run uncertainty analysis: {e}")
+            error.setStyleSheet("color: #c0392b;")
+            layout.addWidget(error)
+            return
+        
+        # Class probability chart
+        bar_set = QBarSet("Probability (%)")
+        bar_set.setColor(QColor("#7d9d7f"))
+        classes = list(uncertainty.class_probabilities)
+        for lsc in classes:
+            bar_set.append(uncertainty.class_probabilities[lsc] * 100)
+        series = QBarSeries()
+        series.append(bar_set)
+        series.setLabelsVisible(True)
+        series.setLabelsFormat("@value%")
+        
+        chart = QChart()
+        chart.addSeries(series)
+        chart.setBackgroundBrush(QColor("#f9fbf9"))
+        chart.legend().setVisible(False)
+        
+        axis_x = QBarCategoryAxis()
+        axis_x.append(classes)
+        axis_x.setLabelsColor(QColor("#3d5a3f"))
+        chart.addAxis(axis_x, Qt.AlignBottom)
+        series.attachAxis(axis_x)
+        
+        axis_y = QValueAxis()
+        axis_y.setRange(0, 100)
+        axis_y.setLabelFormat("%.0f%%")
+        axis_y.setLabelsColor(QColor("#3d5a3f"))
+        axis_y.setGridLineColor(QColor("#e0ede0"))
+        chart.addAxis(axis_y, Qt.AlignLeft)
+        series.attachAxis(axis_y)
+        
+        chart_view = QChartView(chart)
+        chart_view.setRenderHint(QPainter.Antialiasing)
+        chart_view.setMinimumHeight(260)
+        layout.addWidget(chart_view)
+        
+        # Interval and stability
+        low, high = uncertainty.lsi_interval
+        color = self.CLASS_COLORS.get(uncertainty.nominal_class, "#3d5a3f")
+        summary = QLabel(
+            f"Measured LSI <b>{uncertainty.nominal_lsi:.2f}</b> "
+            f"(<span style='color:{color};'><b>{uncertainty.nominal_class}</b></span>); "
+            f"{uncertainty.confidence:.0%} interval <b>{low:.2f} – {high:.2f}</b>. "
+            f"The class stays {uncertainty.nominal_class} in "
+            f"<b>{uncertainty.class_stability:.0%}</b> of {uncertainty.n_draws} draws."
+        )
+        summary.setTextFormat(Qt.RichText)
+        summary.setFont(QFont("Segoe UI", 12))
+        summary.setStyleSheet("color: #3d5a3f;")
+        summary.setWordWrap(True)
+        layout.addWidget(summary)
+        
+        # Variance drivers
+        drivers = [(key, share) for key, share in uncertainty.variance_drivers if share >= 0.01]
+        if drivers:
+            lines = [
+                f"• {key.replace('_', ' ').title()}: explains {share:.0%} of the LSI spread "
+                f"(rating changes in {uncertainty.rating_flip_rates.get(key, 0):.0%} of draws)"
+                for key, share in drivers[:5]
+            ]
+            text = "Measurements that matter most:\n" + "\n".join(lines)
+        else:
+            text = "Measurement error does not change the result for this sample."
+        drivers_label = QLabel(text)
+        drivers_label.setFont(QFont("Segoe UI", 11))
+        drivers_label.setStyleSheet("color: #5a6a5c;")
+        drivers_label.setWordWrap(True)
+        layout.addWidget(drivers_label)
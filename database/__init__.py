@@ -4,5 +4,6 @@ Uses custom SQLite manager with raw sqlite3
 """
 
 from database.db_manager import DatabaseManager, get_database
+from database.evaluation_cache import EvaluationCache, make_cache_key
 
-__all__ = ['DatabaseManager', 'get_database']
+__all__ = ['DatabaseManager', 'get_database', 'EvaluationCache', 'make_cache_key']
@@ -5,22 +5,191 @@ Handles all SQLite database operations
 
 import sqlite3
 import json
+import threading
+import time
+import weakref
+import zlib
 from pathlib import Path
 from datetime import datetime
 from contextlib import contextmanager
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+
+
+# Applied to every pooled connection. WAL lets readers run alongside the
+# writer; NORMAL sync is durable across application crashes in WAL mode.
+CONNECTION_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("mmap_size", 64 * 1024 * 1024),     # 64 MB memory-mapped reads
+    ("cache_size", -16000),              # ~16 MB page cache (negative = KiB)
+    ("temp_store", "MEMORY"),
+)
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+BUSY_TIMEOUT_SECONDS = 10.0
+
+
+SOIL_INPUT_COLUMNS = (
+    'location', 'ph', 'temperature', 'precipitation', 'texture', 'drainage',
+    'flooding', 'soil_depth', 'gravel_content', 'erosion', 'slope_percent',
+    'electrical_conductivity', 'organic_carbon', 'cec', 'base_saturation', 'notes',
+)
+
+# soil_data key -> soil_data_inputs column
+SOIL_DATA_COLUMNS = {
+    'ph': 'ph',
+    'temperature': 'temperature',
+    'rainfall': 'precipitation',
+    'slope': 'slope_percent',
+    'soil_depth': 'soil_depth',
+    'coarse_fragments': 'gravel_content',
+    'ec': 'electrical_conductivity',
+    'organic_carbon': 'organic_carbon',
+    'cec': 'cec',
+    'base_saturation': 'base_saturation',
+    'texture': 'texture',
+    'drainage': 'drainage',
+    'flooding': 'flooding',
+}
+
+EVALUATION_COLUMNS = (
+    'input_id', 'crop_id', 'season', 'lsi', 'lsc', 'full_classification',
+    'limiting_factors', 'recommendation', 'evaluation_data',
+)
+
+
+def _insert_sql(table: str, columns: tuple) -> str:
+    placeholders = ", ".join("?" for _ in columns)
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+def _row(data: Dict, columns: tuple) -> tuple:
+    return tuple(data.get(column) for column in columns)
+
+
+# How evaluation_results.evaluation_data stores the full result: zlib-compressed
+# JSON (BLOB), plain JSON text (legacy), or not at all. Parameter ratings are
+# always written to evaluation_parameter_ratings.
+EVALUATION_DATA_MODES = ('compressed', 'json', 'none')
+
+RATING_COLUMNS = (
+    'evaluation_id', 'parameter', 'value', 'rating', 'class', 'subclass', 'limiting',
+)
+
+# Same tolerance RulesEngine uses to mark limiting parameters
+LIMITING_THRESHOLD = 0.001
+
+
+def _encode_evaluation_data(full_result: Optional[Dict], mode: str):
+    if not full_result or mode == 'none':
+        return None
+    text = json.dumps(full_result, default=str)
+    if mode == 'json':
+        return text
+    return zlib.compress(text.encode('utf-8'))
+
+
+def decode_evaluation_data(value) -> Optional[Dict]:
+    """Decode an evaluation_data column value (compressed, JSON text or NULL)"""
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        value = zlib.decompress(value).decode('utf-8')
+    return json.loads(value)
+
+
+def _evaluation_row(evaluation_data: Dict, mode: str = 'json') -> tuple:
+    row = dict(evaluation_data)
+    row['evaluation_data'] = _encode_evaluation_data(evaluation_data.get('full_result'), mode)
+    return _row(row, EVALUATION_COLUMNS)
+
+
+def _rating_rows(evaluation_id: int, full_result: Optional[Dict]) -> List[tuple]:
+    """One evaluation_parameter_ratings row per rated parameter"""
+    ratings = (full_result or {}).get('parameter_ratings') or {}
+    soil_data = (full_result or {}).get('soil_data') or {}
+    entries = []
+    for parameter, entry in ratings.items():
+        try:
+            rating, lsc, subclass = entry[0], entry[1], entry[2]
+        except (TypeError, IndexError, KeyError):
+            continue
+        if rating is None:
+            continue
+        entries.append((parameter, float(rating), lsc, subclass))
+    if not entries:
+        return []
+
+    rmin = min(rating for _, rating, _, _ in entries)
+    rows = []
+    for parameter, rating, lsc, subclass in entries:
+        value = soil_data.get(parameter)
+        if value is not None and not isinstance(value, (int, float, str)):
+            value = str(value)
+        rows.append((
+            evaluation_id, parameter, value, rating, lsc, subclass,
+            int(abs(rating - rmin) < LIMITING_THRESHOLD),
+        ))
+    return rows
+
+
+def evaluation_data_from_result(result: Dict, input_id: Optional[int] = None) -> Dict:
+    """Build save_evaluation_result() input from an evaluator result dict"""
+    return {
+        'input_id': input_id,
+        'crop_id': result['crop_name'].lower().replace(' ', '_'),
+        'season': result.get('season'),
+        'lsi': result['lsi'],
+        'lsc': result['lsc'],
+        'full_classification': result['full_classification'],
+        'limiting_factors': result.get('limiting_factors', ''),
+        'recommendation': ', '.join(result.get('recommendations', []))[:500],
+        'full_result': result,
+    }
+
+
+class _ThreadConnection:
+    """Connection owned by one thread, plus its nesting depth."""
+
+    __slots__ = ("conn", "depth", "generation", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection, generation: int):
+        self.conn = conn
+        self.depth = 0
+        self.generation = generation
+
+
+def _release_connection(pool: Dict[int, sqlite3.Connection], lock: threading.Lock, key: int):
+    """Close a pooled connection once its owning thread is gone."""
+    with lock:
+        conn = pool.pop(key, None)
+    if conn is not None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
 
 
 class DatabaseManager:
     """Centralized database management for SoilWise"""
 
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, evaluation_data_mode: str = 'compressed'):
         """
         Initialize database manager
 
         Args:
             db_path: Path to database file. If None, uses default location.
+            evaluation_data_mode: How the full result blob is stored
+                ('compressed', 'json' or 'none'; see EVALUATION_DATA_MODES)
         """
+        if evaluation_data_mode not in EVALUATION_DATA_MODES:
+            raise ValueError(
+                f"Unknown evaluation_data_mode '{evaluation_data_mode}'. "
+                f"Use one of: {', '.join(EVALUATION_DATA_MODES)}"
+            )
+        self.evaluation_data_mode = evaluation_data_mode
         if db_path is None:
             # Default: user's Documents/SoilWise/soilwise.db
             user_docs = Path.home() / "Documents" / "SoilWise"
@@ -30,23 +199,79 @@ class DatabaseManager:
             self.db_path = Path(db_path)
             self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Per-thread connection pool
+        self._local = threading.local()
+        self._pool: Dict[int, sqlite3.Connection] = {}
+        self._pool_lock = threading.Lock()
+        self._generation = 0
+
         self.init_database()
         print(f"✅ Database initialized: {self.db_path}")
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection with the pool's PRAGMAs applied"""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=BUSY_TIMEOUT_SECONDS,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            check_same_thread=False,  # owned by one thread; close() may run elsewhere
+        )
+        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        for name, value in CONNECTION_PRAGMAS:
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _thread_connection(self) -> _ThreadConnection:
+        """This thread's pooled connection, opened on first use"""
+        holder = getattr(self._local, "holder", None)
+        if holder is not None and holder.generation == self._generation:
+            return holder
+
+        holder = _ThreadConnection(self._connect(), self._generation)
+        key = id(holder)
+        with self._pool_lock:
+            self._pool[key] = holder.conn
+        # Thread-local storage is freed when the thread exits, closing the connection
+        weakref.finalize(holder, _release_connection, self._pool, self._pool_lock, key)
+        self._local.holder = holder
+        return holder
+
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        """
+        Context manager for database connections.
+
+        Each thread reuses one long-lived connection. The outermost block
+        commits on success and rolls back on error; nested blocks join the
+        enclosing transaction.
+        """
+        holder = self._thread_connection()
+        conn = holder.conn
+        holder.depth += 1
 
         try:
             yield conn
-            conn.commit()
+            if holder.depth == 1:
+                conn.commit()
         except Exception as e:
-            conn.rollback()
+            if holder.depth == 1:
+                conn.rollback()
             raise e
         finally:
-            conn.close()
+            holder.depth -= 1
+
+    def close(self):
+        """Close every pooled connection (threads reconnect on next use)"""
+        with self._pool_lock:
+            connections = list(self._pool.values())
+            self._pool.clear()
+            self._generation += 1
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
 
     def init_database(self):
         """Create all database tables if they don't exist"""
@@ -157,7 +382,28 @@ class DatabaseManager:
                 )
             """)
 
+            # ===== EVALUATION CACHE TABLE =====
+            # Memoized evaluator results keyed by a hash of
+            # (soil_data, crop, season, knowledge-base version)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS evaluation_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    crop_name TEXT NOT NULL,
+                    season TEXT,
+                    kb_version TEXT NOT NULL,
+                    result_json TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    hits INTEGER DEFAULT 0,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    last_used_at REAL NOT NULL
+                )
+            """)
+
             # Create indexes for performance
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_evaluation_cache_last_used
+                ON evaluation_cache(last_used_at)
+            """)
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_crop_requirements_crop
                 ON crop_requirements(crop_id)
@@ -170,10 +416,384 @@ class DatabaseManager:
                 CREATE INDEX IF NOT EXISTS idx_evaluation_results_input
                 ON evaluation_results(input_id)
             """)
+            # Keyset paging: newest first, evaluation_id breaks created_at ties
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_evaluation_results_created
+                ON evaluation_results(created_at DESC, evaluation_id DESC)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_evaluation_results_crop_created
+                ON evaluation_results(crop_id, created_at DESC, evaluation_id DESC)
+            """)
+
+            self._init_evaluation_stats(cursor)
+            self._init_parameter_ratings(cursor)
+            self._init_evaluation_cache_totals(cursor)
 
             conn.commit()
             print("✅ Database schema created/verified")
 
+    # ========== INCREMENTAL STATISTICS ==========
+
+    def _init_evaluation_stats(self, cursor):
+        """
+        Create the trigger-maintained statistics tables.
+
+        evaluation_stats holds one row per crop (count, LSI sum, per-class
+        counts); evaluation_stats_inputs reference-counts input_ids so the
+        number of distinct soil samples is kept in evaluation_stats_totals.
+        Dashboard counters then read a handful of rows instead of scanning
+        evaluation_results.
+        """
+        cursor.executescript("""
+            CREATE TABLE IF NOT EXISTS evaluation_stats (
+                crop_id TEXT PRIMARY KEY,
+                evaluations INTEGER NOT NULL DEFAULT 0,
+                lsi_sum REAL NOT NULL DEFAULT 0,
+                s1_count INTEGER NOT NULL DEFAULT 0,
+                s2_count INTEGER NOT NULL DEFAULT 0,
+                s3_count INTEGER NOT NULL DEFAULT 0,
+                n_count INTEGER NOT NULL DEFAULT 0
+            );
+
+            CREATE TABLE IF NOT EXISTS evaluation_stats_inputs (
+                input_id INTEGER PRIMARY KEY,
+                evaluations INTEGER NOT NULL DEFAULT 0
+            );
+
+            CREATE TABLE IF NOT EXISTS evaluation_stats_totals (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL DEFAULT 0
+            );
+
+            CREATE TRIGGER IF NOT EXISTS trg_evaluation_stats_insert
+            AFTER INSERT ON evaluation_results
+            BEGIN
+                INSERT INTO evaluation_stats
+                    (crop_id, evaluations, lsi_sum, s1_count, s2_count, s3_count, n_count)
+                VALUES (
+                    NEW.crop_id, 1, COALESCE(NEW.lsi, 0),
+                    NEW.lsc = 'S1', NEW.lsc = 'S2', NEW.lsc = 'S3', NEW.lsc LIKE 'N%'
+                )
+                ON CONFLICT(crop_id) DO UPDATE SET
+                    evaluations = evaluations + 1,
+                    lsi_sum = lsi_sum + excluded.lsi_sum,
+                    s1_count = s1_count + excluded.s1_count,
+                    s2_count = s2_count + excluded.s2_count,
+                    s3_count = s3_count + excluded.s3_count,
+                    n_count = n_count + excluded.n_count;
+
+                INSERT INTO evaluation_stats_inputs (input_id, evaluations)
+                SELECT NEW.input_id, 1 WHERE NEW.input_id IS NOT NULL
+                ON CONFLICT(input_id) DO UPDATE SET evaluations = evaluations + 1;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_evaluation_stats_delete
+            AFTER DELETE ON evaluation_results
+            BEGIN
+                UPDATE evaluation_stats SET
+                    evaluations = evaluations - 1,
+                    lsi_sum = lsi_sum - COALESCE(OLD.lsi, 0),
+                    s1_count = s1_count - (OLD.lsc = 'S1'),
+                    s2_count = s2_count - (OLD.lsc = 'S2'),
+                    s3_count = s3_count - (OLD.lsc = 'S3'),
+                    n_count = n_count - (OLD.lsc LIKE 'N%')
+                WHERE crop_id = OLD.crop_id;
+                DELETE FROM evaluation_stats WHERE crop_id = OLD.crop_id AND evaluations <= 0;
+
+                UPDATE evaluation_stats_inputs SET evaluations = evaluations - 1
+                WHERE input_id = OLD.input_id;
+                DELETE FROM evaluation_stats_inputs
+                WHERE input_id = OLD.input_id AND evaluations <= 0;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_evaluation_stats_update
+            AFTER UPDATE OF crop_id, lsi, lsc, input_id ON evaluation_results
+            BEGIN
+                UPDATE evaluation_stats SET
+                    evaluations = evaluations - 1,
+                    lsi_sum = lsi_sum - COALESCE(OLD.lsi, 0),
+                    s1_count = s1_count - (OLD.lsc = 'S1'),
+                    s2_count = s2_count - (OLD.lsc = 'S2'),
+                    s3_count = s3_count - (OLD.lsc = 'S3'),
+                    n_count = n_count - (OLD.lsc LIKE 'N%')
+                WHERE crop_id = OLD.crop_id;
+                DELETE FROM evaluation_stats WHERE crop_id = OLD.crop_id AND evaluations <= 0;
+
+                INSERT INTO evaluation_stats
+                    (crop_id, evaluations, lsi_sum, s1_count, s2_count, s3_count, n_count)
+                VALUES (
+                    NEW.crop_id, 1, COALESCE(NEW.lsi, 0),
+                    NEW.lsc = 'S1', NEW.lsc = 'S2', NEW.lsc = 'S3', NEW.lsc LIKE 'N%'
+                )
+                ON CONFLICT(crop_id) DO UPDATE SET
+                    evaluations = evaluations + 1,
+                    lsi_sum = lsi_sum + excluded.lsi_sum,
+                    s1_count = s1_count + excluded.s1_count,
+                    s2_count = s2_count + excluded.s2_count,
+                    s3_count = s3_count + excluded.s3_count,
+                    n_count = n_count + excluded.n_count;
+
+                UPDATE evaluation_stats_inputs SET evaluations = evaluations - 1
+                WHERE input_id = OLD.input_id;
+                DELETE FROM evaluation_stats_inputs
+                WHERE input_id = OLD.input_id AND evaluations <= 0;
+
+                INSERT INTO evaluation_stats_inputs (input_id, evaluations)
+                SELECT NEW.input_id, 1 WHERE NEW.input_id IS NOT NULL
+                ON CONFLICT(input_id) DO UPDATE SET evaluations = evaluations + 1;
+            END;
+
+            -- A new / vanished input_id changes the distinct soil-sample count
+            CREATE TRIGGER IF NOT EXISTS trg_evaluation_stats_inputs_insert
+            AFTER INSERT ON evaluation_stats_inputs
+            BEGIN
+                UPDATE evaluation_stats_totals SET value = value + 1 WHERE name = 'soil_samples';
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_evaluation_stats_inputs_delete
+            AFTER DELETE ON evaluation_stats_inputs
+            BEGIN
+                UPDATE evaluation_stats_totals SET value = value - 1 WHERE name = 'soil_samples';
+            END;
+        """)
+
+        cursor.execute("SELECT 1 FROM evaluation_stats_totals WHERE name = 'soil_samples'")
+        if cursor.fetchone() is None:
+            # First run on this database: backfill from existing history
+            self._rebuild_evaluation_stats(cursor)
+
+    def _rebuild_evaluation_stats(self, cursor):
+        """Recompute the statistics tables from evaluation_results"""
+        cursor.execute("DELETE FROM evaluation_stats")
+        cursor.execute("DELETE FROM evaluation_stats_inputs")
+        cursor.execute("DELETE FROM evaluation_stats_totals")
+        cursor.execute("""
+            INSERT INTO evaluation_stats
+                (crop_id, evaluations, lsi_sum, s1_count, s2_count, s3_count, n_count)
+            SELECT crop_id, COUNT(*), COALESCE(SUM(lsi), 0),
+                   SUM(lsc = 'S1'), SUM(lsc = 'S2'), SUM(lsc = 'S3'), SUM(lsc LIKE 'N%')
+            FROM evaluation_results
+            GROUP BY crop_id
+        """)
+        cursor.execute("""
+            INSERT INTO evaluation_stats_inputs (input_id, evaluations)
+            SELECT input_id, COUNT(*) FROM evaluation_results
+            WHERE input_id IS NOT NULL
+            GROUP BY input_id
+        """)
+        cursor.execute("""
+            INSERT INTO evaluation_stats_totals (name, value)
+            SELECT 'soil_samples', COUNT(*) FROM evaluation_stats_inputs
+        """)
+
+    def rebuild_evaluation_stats(self):
+        """Recompute the trigger-maintained statistics from scratch"""
+        with self.get_connection() as conn:
+            self._rebuild_evaluation_stats(conn.cursor())
+
+    # ========== PARAMETER RATINGS ==========
+
+    def _init_parameter_ratings(self, cursor):
+        """
+        Create the normalized per-parameter ratings table.
+
+        One row per rated parameter of each evaluation, so questions such as
+        "how often is drainage limiting for Banana" are indexed SQL
+        aggregates instead of parsing every evaluation_data blob.
+        """
+        cursor.execute("""
+            SELECT 1 FROM sqlite_master
+            WHERE type = 'table' AND name = 'evaluation_parameter_ratings'
+        """)
+        existed = cursor.fetchone() is not None
+
+        cursor.executescript("""
+            CREATE TABLE IF NOT EXISTS evaluation_parameter_ratings (
+                evaluation_id INTEGER NOT NULL,
+                parameter TEXT NOT NULL,
+                value,
+                rating REAL NOT NULL,
+                class TEXT,
+                subclass TEXT,
+                limiting INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (evaluation_id, parameter)
+            ) WITHOUT ROWID;
+
+            CREATE INDEX IF NOT EXISTS idx_parameter_ratings_parameter
+            ON evaluation_parameter_ratings(parameter, limiting, class);
+
+            CREATE INDEX IF NOT EXISTS idx_parameter_ratings_limiting
+            ON evaluation_parameter_ratings(limiting, subclass)
+            WHERE limiting = 1;
+
+            CREATE TRIGGER IF NOT EXISTS trg_parameter_ratings_delete
+            AFTER DELETE ON evaluation_results
+            BEGIN
+                DELETE FROM evaluation_parameter_ratings WHERE evaluation_id = OLD.evaluation_id;
+            END;
+        """)
+
+        if not existed:
+            self._backfill_parameter_ratings(cursor)
+
+    def _backfill_parameter_ratings(self, cursor):
+        """Fill evaluation_parameter_ratings from existing evaluation_data blobs"""
+        cursor.execute("""
+            SELECT evaluation_id, evaluation_data FROM evaluation_results
+            WHERE evaluation_data IS NOT NULL
+        """)
+        rows = []
+        for record in cursor.fetchall():
+            try:
+                full_result = decode_evaluation_data(record['evaluation_data'])
+            except (ValueError, zlib.error):
+                continue
+            rows.extend(_rating_rows(record['evaluation_id'], full_result))
+        if rows:
+            cursor.executemany(_insert_sql("evaluation_parameter_ratings", RATING_COLUMNS), rows)
+            print(f"✅ Backfilled {len(rows)} parameter ratings")
+
+    def get_parameter_ratings(self, evaluation_id: int) -> List[Dict]:
+        """Per-parameter ratings of one evaluation"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT parameter, value, rating, class, subclass, limiting
+                FROM evaluation_parameter_ratings
+                WHERE evaluation_id = ?
+                ORDER BY rating, parameter
+            """, (evaluation_id,))
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_evaluation_detail(self, evaluation_id: int) -> Optional[Dict]:
+        """Evaluation row with its parameter ratings and decoded full result"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM evaluation_results WHERE evaluation_id = ?", (evaluation_id,)
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            detail = dict(row)
+            detail['full_result'] = decode_evaluation_data(detail.pop('evaluation_data'))
+            detail['parameter_ratings'] = self.get_parameter_ratings(evaluation_id)
+            return detail
+
+    def get_limiting_factor_counts(self, crop_id: str = None) -> List[Dict]:
+        """
+        How often each parameter is the limiting one.
+
+        Args:
+            crop_id: optional filter by crop_id
+
+        Returns:
+            Rows with parameter, subclass, count and share (of the
+            evaluations that have parameter ratings), most frequent first
+        """
+        join = "JOIN evaluation_results e ON e.evaluation_id = r.evaluation_id" if crop_id else ""
+        crop_filter = "AND e.crop_id = ?" if crop_id else ""
+        params = (crop_id,) if crop_id else ()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # Every rated evaluation has at least one limiting parameter
+            cursor.execute(f"""
+                SELECT COUNT(DISTINCT r.evaluation_id) AS rated
+                FROM evaluation_parameter_ratings r
+                {join}
+                WHERE r.limiting = 1 {crop_filter}
+            """, params)
+            rated = cursor.fetchone()['rated']
+
+            cursor.execute(f"""
+                SELECT r.parameter, r.subclass, COUNT(*) AS count
+                FROM evaluation_parameter_ratings r
+                {join}
+                WHERE r.limiting = 1 {crop_filter}
+                GROUP BY r.parameter, r.subclass
+                ORDER BY count DESC, r.parameter
+            """, params)
+            rows = [dict(row) for row in cursor.fetchall()]
+
+        for row in rows:
+            row['share'] = row['count'] / rated if rated else 0.0
+        return rows
+
+    def get_parameter_summary(self, parameter: str, crop_id: str = None) -> Dict:
+        """
+        Rating distribution of one parameter.
+
+        Args:
+            parameter: soil_data key (e.g. 'drainage', 'ph')
+            crop_id: optional filter by crop_id
+
+        Returns:
+            Dict with evaluations, avg_rating, limiting count and class_counts
+        """
+        join = "JOIN evaluation_results e ON e.evaluation_id = r.evaluation_id" if crop_id else ""
+        crop_filter = "AND e.crop_id = ?" if crop_id else ""
+        params = (parameter, crop_id) if crop_id else (parameter,)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT r.class, COUNT(*) AS count, SUM(r.rating) AS rating_sum,
+                       SUM(r.limiting) AS limiting
+                FROM evaluation_parameter_ratings r
+                {join}
+                WHERE r.parameter = ? {crop_filter}
+                GROUP BY r.class
+            """, params)
+            rows = cursor.fetchall()
+
+        evaluations = sum(row['count'] for row in rows)
+        return {
+            'parameter': parameter,
+            'evaluations': evaluations,
+            'avg_rating': sum(row['rating_sum'] for row in rows) / evaluations if evaluations else 0.0,
+            'limiting': sum(row['limiting'] for row in rows),
+            'class_counts': {row['class']: row['count'] for row in rows},
+        }
+
+    def get_dashboard_stats(self) -> Dict:
+        """
+        Dashboard counters from the trigger-maintained statistics tables.
+
+        Reads one row per evaluated crop plus one totals row, so the cost
+        does not grow with the evaluation history.
+
+        Returns:
+            Dict with soil_samples, crops_evaluated, evaluations, avg_lsi,
+            suitability_rate (share of S1/S2, percent), class_counts,
+            most_evaluated_crop and per_crop rows
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM evaluation_stats ORDER BY evaluations DESC, crop_id")
+            per_crop = [dict(row) for row in cursor.fetchall()]
+            cursor.execute("SELECT value FROM evaluation_stats_totals WHERE name = 'soil_samples'")
+            row = cursor.fetchone()
+            soil_samples = row['value'] if row else 0
+
+        evaluations = sum(crop['evaluations'] for crop in per_crop)
+        lsi_sum = sum(crop['lsi_sum'] for crop in per_crop)
+        class_counts = {
+            lsc: sum(crop[f'{lsc.lower()}_count'] for crop in per_crop)
+            for lsc in ('S1', 'S2', 'S3', 'N')
+        }
+        suitable = class_counts['S1'] + class_counts['S2']
+
+        return {
+            'soil_samples': soil_samples,
+            'crops_evaluated': len(per_crop),
+            'evaluations': evaluations,
+            'avg_lsi': lsi_sum / evaluations if evaluations else 0.0,
+            'suitability_rate': int(suitable / evaluations * 100) if evaluations else 0,
+            'class_counts': class_counts,
+            'most_evaluated_crop': per_crop[0]['crop_id'] if per_crop else None,
+            'per_crop': per_crop,
+        }
+
     # ========== CROP OPERATIONS ==========
 
     def add_crop(self, crop_data: Dict) -> str:
@@ -264,32 +884,23 @@ class DatabaseManager:
         """Save soil data input"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO soil_data_inputs
-                (location, ph, temperature, precipitation, texture, drainage,
-                 flooding, soil_depth, gravel_content, erosion, slope_percent,
-                 electrical_conductivity, organic_carbon, cec, base_saturation, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                soil_data.get('location'),
-                soil_data.get('ph'),
-                soil_data.get('temperature'),
-                soil_data.get('precipitation'),
-                soil_data.get('texture'),
-                soil_data.get('drainage'),
-                soil_data.get('flooding'),
-                soil_data.get('soil_depth'),
-                soil_data.get('gravel_content'),
-                soil_data.get('erosion'),
-                soil_data.get('slope_percent'),
-                soil_data.get('electrical_conductivity'),
-                soil_data.get('organic_carbon'),
-                soil_data.get('cec'),
-                soil_data.get('base_saturation'),
-                soil_data.get('notes')
-            ))
+            cursor.execute(_insert_sql("soil_data_inputs", SOIL_INPUT_COLUMNS),
+                           _row(soil_data, SOIL_INPUT_COLUMNS))
             return cursor.lastrowid
 
+    def save_soil_inputs_batch(self, soil_inputs: List[Dict]) -> List[int]:
+        """
+        Save many soil data inputs in one transaction
+
+        Args:
+            soil_inputs: Dicts with the same keys save_soil_input accepts
+
+        Returns:
+            Assigned input_ids, in input order
+        """
+        rows = [_row(soil_data, SOIL_INPUT_COLUMNS) for soil_data in soil_inputs]
+        return self._insert_many("soil_data_inputs", SOIL_INPUT_COLUMNS, rows)
+
     def get_soil_input(self, input_id: int) -> Optional[Dict]:
         """Get a specific soil input"""
         with self.get_connection() as conn:
@@ -314,23 +925,54 @@ class DatabaseManager:
         """Save evaluation result"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO evaluation_results
-                (input_id, crop_id, season, lsi, lsc, full_classification,
-                 limiting_factors, recommendation, evaluation_data)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                evaluation_data.get('input_id'),
-                evaluation_data.get('crop_id'),
-                evaluation_data.get('season'),
-                evaluation_data.get('lsi'),
-                evaluation_data.get('lsc'),
-                evaluation_data.get('full_classification'),
-                evaluation_data.get('limiting_factors'),
-                evaluation_data.get('recommendation'),
-                json.dumps(evaluation_data.get('full_result', {}))
-            ))
-            return cursor.lastrowid
+            cursor.execute(_insert_sql("evaluation_results", EVALUATION_COLUMNS),
+                           _evaluation_row(evaluation_data, self.evaluation_data_mode))
+            evaluation_id = cursor.lastrowid
+            cursor.executemany(
+                _insert_sql("evaluation_parameter_ratings", RATING_COLUMNS),
+                _rating_rows(evaluation_id, evaluation_data.get('full_result'))
+            )
+            return evaluation_id
+
+    def save_evaluation_results_batch(self, evaluations: List[Dict]) -> List[int]:
+        """
+        Save many evaluation results in one transaction
+
+        Used by the batch CLI's sqlite writer. The UI saves one result per
+        evaluation and keeps using save_evaluation_result.
+
+        Args:
+            evaluations: Dicts with the same keys save_evaluation_result accepts
+
+        Returns:
+            Assigned evaluation_ids, in input order
+        """
+        rows = [
+            _evaluation_row(evaluation_data, self.evaluation_data_mode)
+            for evaluation_data in evaluations
+        ]
+        with self.get_connection() as conn:
+            evaluation_ids = self._insert_many("evaluation_results", EVALUATION_COLUMNS, rows)
+            conn.executemany(
+                _insert_sql("evaluation_parameter_ratings", RATING_COLUMNS),
+                [
+                    rating_row
+                    for evaluation_id, evaluation_data in zip(evaluation_ids, evaluations)
+                    for rating_row in _rating_rows(evaluation_id, evaluation_data.get('full_result'))
+                ]
+            )
+        return evaluation_ids
+
+    def _insert_many(self, table: str, columns: tuple, rows: List[tuple]) -> List[int]:
+        """executemany inside one transaction; returns the new rowids"""
+        if not rows:
+            return []
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(_insert_sql(table, columns), rows)
+            # AUTOINCREMENT ids are consecutive while this transaction holds the write lock
+            last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+            return list(range(last_id - len(rows) + 1, last_id + 1))
 
     def get_evaluation_history(self, crop_id: str = None, limit: int = 50) -> List[Dict]:
         """Get evaluation history (legacy method, still usable)"""
@@ -357,40 +999,12 @@ class DatabaseManager:
 
     def get_evaluation_stats_fast(self) -> Dict:
         """Fast aggregate stats for evaluation history (used by Evaluation History page)."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            stats = {
-                "total_evaluations": 0,
-                "avg_lsi": 0.0,
-                "most_evaluated_crop": None,
-            }
-
-            # Total evaluations
-            cursor.execute("SELECT COUNT(*) AS cnt FROM evaluation_results")
-            row = cursor.fetchone()
-            stats["total_evaluations"] = row["cnt"] if row else 0
-
-            if stats["total_evaluations"] == 0:
-                return stats
-
-            # Average LSI
-            cursor.execute("SELECT AVG(lsi) AS avg_lsi FROM evaluation_results")
-            row = cursor.fetchone()
-            stats["avg_lsi"] = float(row["avg_lsi"]) if row and row["avg_lsi"] is not None else 0.0
-
-            # Most evaluated crop
-            cursor.execute("""
-                SELECT crop_id, COUNT(*) AS cnt
-                FROM evaluation_results
-                GROUP BY crop_id
-                ORDER BY cnt DESC
-                LIMIT 1
-            """)
-            row = cursor.fetchone()
-            if row:
-                stats["most_evaluated_crop"] = row["crop_id"]
-
-            return stats
+        stats = self.get_dashboard_stats()
+        return {
+            "total_evaluations": stats["evaluations"],
+            "avg_lsi": stats["avg_lsi"],
+            "most_evaluated_crop": stats["most_evaluated_crop"],
+        }
 
     def get_evaluation_page(
         self,
@@ -399,7 +1013,10 @@ class DatabaseManager:
         crop_id: str = None,
     ) -> List[Dict]:
         """
-        Get a single page of evaluation history (for paging in UI).
+        Get a single page of evaluation history by page number (legacy).
+
+        OFFSET paging re-reads every skipped row; prefer
+        get_evaluation_page_after for deep pages.
 
         Args:
             page: zero-based page index (0 = first page).
@@ -430,6 +1047,65 @@ class DatabaseManager:
 
             return [dict(row) for row in cursor.fetchall()]
 
+    def get_evaluation_page_after(
+        self,
+        after: Optional[Tuple[str, int]] = None,
+        page_size: int = 25,
+        crop_id: str = None,
+    ) -> Tuple[List[Dict], Optional[Tuple[str, int]]]:
+        """
+        Get the page of evaluation history that follows a cursor (keyset paging).
+
+        Rows are ordered newest first by (created_at, evaluation_id). The
+        page's ids are found by seeking the created_at index, then only
+        those rows are joined with their soil input, so every page costs
+        O(page_size) however deep it is.
+
+        Args:
+            after: (created_at, evaluation_id) of the last row on the
+                previous page; None for the first page.
+            page_size: number of records per page.
+            crop_id: optional filter by crop_id.
+
+        Returns:
+            (rows, next_cursor): next_cursor is None on the last page.
+        """
+        conditions = []
+        params: List[Any] = []
+        if crop_id:
+            conditions.append("crop_id = ?")
+            params.append(crop_id)
+        if after is not None:
+            conditions.append("(created_at, evaluation_id) < (?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        index = "idx_evaluation_results_crop_created" if crop_id else "idx_evaluation_results_created"
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # One extra row tells whether another page follows
+            cursor.execute(f"""
+                WITH page AS (
+                    SELECT evaluation_id
+                    FROM evaluation_results INDEXED BY {index}
+                    {where}
+                    ORDER BY created_at DESC, evaluation_id DESC
+                    LIMIT ?
+                )
+                SELECT e.*, s.location, s.ph, s.temperature
+                FROM page
+                JOIN evaluation_results e ON e.evaluation_id = page.evaluation_id
+                LEFT JOIN soil_data_inputs s ON e.input_id = s.input_id
+                ORDER BY e.created_at DESC, e.evaluation_id DESC
+            """, (*params, page_size + 1))
+            rows = [dict(row) for row in cursor.fetchall()]
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = (rows[-1]['created_at'], rows[-1]['evaluation_id'])
+        return rows, next_cursor
+
     # ========== COMPARISON HISTORY OPERATIONS ==========
 
     def save_comparison(self, comparison_data: Dict) -> int:
@@ -465,6 +1141,173 @@ class DatabaseManager:
                 results.append(record)
             return results
 
+    # ========== EVALUATION CACHE OPERATIONS ==========
+
+    def _init_evaluation_cache_totals(self, cursor):
+        """
+        Create the trigger-maintained entry count and byte size of evaluation_cache.
+
+        Eviction checks these two numbers on every put instead of running
+        COUNT/SUM over the whole cache table.
+        """
+        cursor.executescript("""
+            CREATE TABLE IF NOT EXISTS evaluation_cache_totals (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                entries INTEGER NOT NULL DEFAULT 0,
+                size_bytes INTEGER NOT NULL DEFAULT 0
+            );
+
+            CREATE TRIGGER IF NOT EXISTS trg_evaluation_cache_insert
+            AFTER INSERT ON evaluation_cache
+            BEGIN
+                UPDATE evaluation_cache_totals SET
+                    entries = entries + 1,
+                    size_bytes = size_bytes + NEW.size_bytes
+                WHERE id = 1;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_evaluation_cache_delete
+            AFTER DELETE ON evaluation_cache
+            BEGIN
+                UPDATE evaluation_cache_totals SET
+                    entries = entries - 1,
+                    size_bytes = size_bytes - OLD.size_bytes
+                WHERE id = 1;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_evaluation_cache_update
+            AFTER UPDATE OF size_bytes ON evaluation_cache
+            BEGIN
+                UPDATE evaluation_cache_totals SET
+                    size_bytes = size_bytes - OLD.size_bytes + NEW.size_bytes
+                WHERE id = 1;
+            END;
+        """)
+
+        cursor.execute("SELECT 1 FROM evaluation_cache_totals WHERE id = 1")
+        if cursor.fetchone() is None:
+            # First run on this database: count what is already cached
+            cursor.execute("""
+                INSERT INTO evaluation_cache_totals (id, entries, size_bytes)
+                SELECT 1, COUNT(*), COALESCE(SUM(size_bytes), 0) FROM evaluation_cache
+            """)
+
+    def get_cached_evaluation(self, cache_key: str) -> Optional[Dict]:
+        """
+        Get a memoized evaluation result.
+
+        Read-only: callers record the hit with touch_cached_evaluations,
+        which takes many keys in one write.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT result_json FROM evaluation_cache WHERE cache_key = ?",
+                (cache_key,)
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            return json.loads(row['result_json'])
+
+    def touch_cached_evaluations(self, touches: List[Tuple[str, float, int]]):
+        """
+        Record cache hits in one batch.
+
+        Args:
+            touches: (cache_key, last_used_at, hits) per key; hits are added
+                to the stored count
+        """
+        if not touches:
+            return
+        with self.get_connection() as conn:
+            conn.executemany("""
+                UPDATE evaluation_cache
+                SET last_used_at = MAX(last_used_at, ?), hits = hits + ?
+                WHERE cache_key = ?
+            """, [(last_used_at, hits, key) for key, last_used_at, hits in touches])
+
+    def put_cached_evaluation(
+        self,
+        cache_key: str,
+        crop_name: str,
+        season: Optional[str],
+        kb_version: str,
+        result: Dict,
+        max_entries: int = 5000,
+        max_bytes: int = 50 * 1024 * 1024,
+    ):
+        """Store a memoized evaluation result, evicting least recently used entries"""
+        result_json = json.dumps(result)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # Upsert rather than INSERT OR REPLACE: REPLACE deletes without
+            # firing the delete trigger, which would skew the running totals
+            cursor.execute("""
+                INSERT INTO evaluation_cache
+                (cache_key, crop_name, season, kb_version, result_json,
+                 size_bytes, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    crop_name = excluded.crop_name,
+                    season = excluded.season,
+                    kb_version = excluded.kb_version,
+                    result_json = excluded.result_json,
+                    size_bytes = excluded.size_bytes,
+                    last_used_at = excluded.last_used_at
+            """, (
+                cache_key,
+                crop_name,
+                season,
+                kb_version,
+                result_json,
+                len(result_json),
+                time.time()
+            ))
+            self._evict_cached_evaluations(cursor, max_entries, max_bytes)
+
+    def _evict_cached_evaluations(self, cursor, max_entries: int, max_bytes: int):
+        """Delete least recently used cache rows until both limits hold"""
+        cursor.execute("SELECT entries, size_bytes FROM evaluation_cache_totals WHERE id = 1")
+        row = cursor.fetchone()
+        count, total = row['entries'], row['size_bytes']
+        if count <= max_entries and total <= max_bytes:
+            return
+
+        # Walk the last_used_at index oldest first, only as far as needed
+        cursor.execute("""
+            SELECT cache_key, size_bytes FROM evaluation_cache
+            ORDER BY last_used_at ASC
+        """)
+        stale_keys = []
+        while count > max_entries or total > max_bytes:
+            stale = cursor.fetchone()
+            if stale is None:
+                break
+            stale_keys.append((stale['cache_key'],))
+            count -= 1
+            total -= stale['size_bytes']
+        cursor.executemany("DELETE FROM evaluation_cache WHERE cache_key = ?", stale_keys)
+
+    def clear_evaluation_cache(self, keep_kb_version: str = None) -> int:
+        """
+        Remove cached evaluations.
+
+        Args:
+            keep_kb_version: If given, only entries from other knowledge-base
+                versions are removed.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if keep_kb_version:
+                cursor.execute(
+                    "DELETE FROM evaluation_cache WHERE kb_version != ?",
+                    (keep_kb_version,)
+                )
+            else:
+                cursor.execute("DELETE FROM evaluation_cache")
+            return cursor.rowcount
+
     # ========== USER PREFERENCES ==========
 
     def set_preference(self, key: str, value: Any):
@@ -503,7 +1346,7 @@ class DatabaseManager:
             cursor.execute("SELECT COUNT(*) as count FROM soil_data_inputs")
             stats['soil_inputs'] = cursor.fetchone()['count']
 
-            cursor.execute("SELECT COUNT(*) as count FROM evaluation_results")
+            cursor.execute("SELECT COALESCE(SUM(evaluations), 0) as count FROM evaluation_stats")
             stats['evaluations'] = cursor.fetchone()['count']
 
             cursor.execute("SELECT COUNT(*) as count FROM comparison_history")
@@ -519,8 +1362,13 @@ class DatabaseManager:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_path = backup_dir / f"soilwise_backup_{timestamp}.db"
 
-        import shutil
-        shutil.copy2(self.db_path, backup_path)
+        # Online backup: includes commits still in the WAL file
+        with self.get_connection() as conn:
+            target = sqlite3.connect(str(backup_path))
+            try:
+                conn.backup(target)
+            finally:
+                target.close()
         print(f"✅ Database backed up to: {backup_path}")
         return str(backup_path)
 
@@ -0,0 +1,175 @@
+"""
+Evaluation Result Cache for SoilWise
+Persists evaluator results across sessions in the SQLite database
+"""
+
+import hashlib
+import json
+import time
+from typing import Any, Dict, Optional
+
+from database.db_manager import DatabaseManager
+
+
+# Cache hits are written back to the database in batches of this size
+TOUCH_BATCH_SIZE = 64
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize NumPy scalars by value; anything else by its str()"""
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def make_cache_key(
+    soil_data: Dict,
+    crop_name: str,
+    season: Optional[str],
+    kb_version: str
+) -> str:
+    """
+    Build a stable cache key for one evaluation.
+
+    Only key order is normalized. Values are hashed exactly as given:
+    the evaluator matches categorical values by str() and echoes
+    soil_data in its result, so "CL " vs "CL" or 6 vs 6.0 are different
+    evaluations.
+
+    Args:
+        soil_data: Soil parameter values passed to the evaluator
+        crop_name: Crop being evaluated
+        season: Season for seasonal crops (None otherwise)
+        kb_version: Knowledge-base version the result was computed with
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps(
+        {
+            "soil": soil_data,
+            "crop": crop_name,
+            "season": season,
+            "kb": kb_version,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=_json_default,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EvaluationCache:
+    """
+    Read-through cache in front of SuitabilityEvaluator.evaluate_suitability.
+
+    Results are keyed by (soil_data, crop, season, knowledge-base version),
+    so editing any crop requirement file invalidates old entries
+    automatically. The table is bounded by entry count and total size;
+    the least recently used rows are evicted first. Hits are buffered and
+    written back in batches (and before every put, so eviction sees them).
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        evaluator,
+        max_entries: int = 5000,
+        max_bytes: int = 50 * 1024 * 1024
+    ):
+        self.db = db
+        self.evaluator = evaluator
+        self.kb_version = evaluator.knowledge_base.version
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._touches: Dict[str, list] = {}   # cache_key -> [last_used_at, hits]
+
+        # Entries from older knowledge-base versions can never hit again
+        try:
+            self.db.clear_evaluation_cache(keep_kb_version=self.kb_version)
+        except Exception as e:
+            print(f"⚠️ Could not prune evaluation cache: {e}")
+
+    def get(self, soil_data: Dict, crop_name: str, season: Optional[str] = None) -> Optional[Dict]:
+        """Return the cached result, or None on a miss"""
+        key = make_cache_key(soil_data, crop_name, season, self.kb_version)
+        try:
+            result = self.db.get_cached_evaluation(key)
+        except Exception as e:
+            print(f"⚠️ Evaluation cache read failed: {e}")
+            return None
+        if result is None:
+            return None
+        self._touch(key)
+
+        # JSON turns the (rating, class, subclass) tuples into lists
+        ratings = result.get('parameter_ratings')
+        if isinstance(ratings, dict):
+            result['parameter_ratings'] = {
+                param: tuple(rating) if isinstance(rating, list) else rating
+                for param, rating in ratings.items()
+            }
+        return result
+
+    def _touch(self, key: str):
+        """Buffer a hit; flush once TOUCH_BATCH_SIZE keys are pending"""
+        touch = self._touches.setdefault(key, [0.0, 0])
+        touch[0] = time.time()
+        touch[1] += 1
+        if len(self._touches) >= TOUCH_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """Write buffered hits (last_used_at, hit counts) to the database"""
+        if not self._touches:
+            return
+        touches = [(key, last_used_at, hits) for key, (last_used_at, hits) in self._touches.items()]
+        self._touches = {}
+        try:
+            self.db.touch_cached_evaluations(touches)
+        except Exception as e:
+            print(f"⚠️ Evaluation cache touch failed: {e}")
+
+    def put(self, soil_data: Dict, crop_name: str, season: Optional[str], result: Dict):
+        """Store an evaluator result"""
+        key = make_cache_key(soil_data, crop_name, season, self.kb_version)
+        cached = {k: v for k, v in result.items() if k != 'trace'}
+        self.flush()
+        try:
+            self.db.put_cached_evaluation(
+                key, crop_name, season, self.kb_version, cached,
+                max_entries=self.max_entries,
+                max_bytes=self.max_bytes
+            )
+        except (TypeError, ValueError) as e:
+            print(f"⚠️ Evaluation result for {crop_name} is not cacheable: {e}")
+        except Exception as e:
+            print(f"⚠️ Evaluation cache write failed: {e}")
+
+    def evaluate(self, soil_data: Dict, crop_name: str, season: Optional[str] = None) -> Dict:
+        """
+        Evaluate through the cache.
+
+        Args:
+            soil_data: Soil parameter values
+            crop_name: Crop to evaluate
+            season: Season for seasonal crops
+
+        Returns:
+            Enriched evaluation result (same shape as evaluate_suitability)
+        """
+        result = self.get(soil_data, crop_name, season)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        result = self.evaluator.evaluate_suitability(
+            soil_data=soil_data,
+            crop_name=crop_name,
+            season=season
+        )
+        self.put(soil_data, crop_name, season, result)
+        return result
@@ -0,0 +1,605 @@
+"""
+
+Batch Evaluation for SoilWise
+
+Evaluates large site tables (tens of thousands of soil records) against
+one or more crops. Records are split into chunks and farmed out to a pool
+of warm worker processes: each worker loads the shared knowledge base once
+(from the snapshot) when it starts and keeps it for every chunk it
+receives. Results stream back in input order with only a bounded number
+of chunks in flight, so memory stays flat however long the input is.
+
+Small jobs skip the pool entirely and run in-process, where process
+start-up would cost more than the evaluation itself.
+
+Command line (streams input and output, so file size is not limited by memory):
+
+    python -m knowledge_base.batch sites.csv -o results.csv --crops Banana Cocoa
+    python -m knowledge_base.batch sites.xlsx -o results.jsonl --season may_august
+    python -m knowledge_base.batch sites.jsonl --format sqlite --workers 4 --no-enrich
+
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+from knowledge_base.evaluation import SuitabilityEvaluator
+from knowledge_base.registry import get_knowledge_base
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CHUNK_SIZE = 250
+
+# Jobs with fewer records than this run in-process
+DEFAULT_MIN_PARALLEL_RECORDS = 2000
+
+# Chunks submitted ahead of the one being consumed, per worker
+PREFETCH_PER_WORKER = 2
+
+
+@contextmanager
+def _quiet_logging(level: int = logging.WARNING):
+    """Temporarily silence the per-evaluation INFO logging of the knowledge base."""
+    kb_logger = logging.getLogger("knowledge_base")
+    previous = kb_logger.level
+    kb_logger.setLevel(max(level, previous))
+    try:
+        yield
+    finally:
+        kb_logger.setLevel(previous)
+
+
+# ---------------------------------------------------------------------- #
+# Worker side
+# ---------------------------------------------------------------------- #
+
+_worker_evaluator: Optional[SuitabilityEvaluator] = None
+
+
+def _init_worker() -> None:
+    """Pool initializer: load the knowledge base once per worker process."""
+    global _worker_evaluator
+    logging.getLogger("knowledge_base").setLevel(logging.WARNING)
+    _worker_evaluator = SuitabilityEvaluator(get_knowledge_base())
+
+
+def _evaluate_record(
+    evaluator: SuitabilityEvaluator,
+    record: Mapping[str, Any],
+    crop_seasons: Sequence[tuple],
+    enrich: bool,
+) -> List[Dict]:
+    """Evaluate one record against every crop; failures become error entries."""
+    results = []
+    for crop_name, crop_season in crop_seasons:
+        try:
+            if enrich:
+                result = evaluator.evaluate_suitability(record, crop_name, crop_season)
+            else:
+                result = evaluator.rules_engine.evaluate(crop_name, record, crop_season)
+        except Exception as e:
+            result = {"crop_name": crop_name, "season": crop_season, "error": str(e)}
+        results.append(result)
+    return results
+
+
+def _evaluate_chunk(
+    records: List[Mapping[str, Any]],
+    crop_seasons: Sequence[tuple],
+    enrich: bool,
+) -> List[List[Dict]]:
+    """Evaluate a chunk in a worker process (uses the warm evaluator)."""
+    evaluator = _worker_evaluator
+    if evaluator is None:
+        _init_worker()
+        evaluator = _worker_evaluator
+    return [_evaluate_record(evaluator, record, crop_seasons, enrich) for record in records]
+
+
+# ---------------------------------------------------------------------- #
+# Driver side
+# ---------------------------------------------------------------------- #
+
+def _chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class BatchEvaluator:
+    """
+    Evaluate many soil records against many crops with a warm process pool.
+
+    Usage:
+        with BatchEvaluator(workers=4) as batch:
+            for record_results in batch.evaluate(records, ["Banana", "Cocoa"]):
+                ...   # one list of per-crop results per record, in input order
+
+    The pool is started lazily on the first job that needs it and reused
+    by later jobs until close() (or the end of the with-block).
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        min_parallel_records: int = DEFAULT_MIN_PARALLEL_RECORDS,
+        enrich: bool = True,
+    ):
+        """
+        Args:
+            workers: Worker processes (default: CPU count). 0 or 1 always
+                runs in-process.
+            chunk_size: Records sent to a worker per task
+            min_parallel_records: Smaller jobs run in-process
+            enrich: Produce full evaluate_suitability results (recommendations,
+                interpretation, ...). If False, returns the plain
+                RulesEngine.evaluate results, which is much cheaper.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.chunk_size = chunk_size
+        self.min_parallel_records = min_parallel_records
+        self.enrich = enrich
+        self.knowledge_base = get_knowledge_base()
+        self._evaluator: Optional[SuitabilityEvaluator] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker pool (if it was started)."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _crop_seasons(
+        self,
+        crop_names: Optional[Sequence[str]],
+        season: Optional[str],
+    ) -> List[tuple]:
+        """Pair each crop with the season it is evaluated in (None if not seasonal)."""
+        compiled_rules = self.knowledge_base.compiled_rules
+        if crop_names is None:
+            crop_names = self._get_evaluator()._default_crops(season)
+        crop_seasons = []
+        for crop_name in crop_names:
+            crop_season = season if compiled_rules.seasonal.get(crop_name) else None
+            compiled_rules.validate_season(crop_name, crop_season)
+            crop_seasons.append((crop_name, crop_season))
+        return crop_seasons
+
+    def _get_evaluator(self) -> SuitabilityEvaluator:
+        if self._evaluator is None:
+            self._evaluator = SuitabilityEvaluator(self.knowledge_base)
+        return self._evaluator
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            logger.info(f"Starting batch worker pool ({self.workers} processes)")
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker
+            )
+        return self._pool
+
+    def evaluate(
+        self,
+        records: Iterable[Mapping[str, Any]],
+        crop_names: Optional[Sequence[str]] = None,
+        season: Optional[str] = None,
+    ) -> Iterator[List[Dict]]:
+        """
+        Evaluate every record against every crop, streaming results in order.
+
+        Args:
+            records: soil_data dicts (any iterable; consumed lazily)
+            crop_names: Crops to evaluate. If None, all crops (seasonal crops
+                only when a season is given).
+            season: Season applied to seasonal crops
+
+        Yields:
+            For each record, a list with one result per crop (in crop order).
+            A crop that fails for a record yields {'crop_name', 'season', 'error'}.
+
+        Raises:
+            ValueError: Unknown crop, or a seasonal crop without a valid season
+        """
+        crop_seasons = self._crop_seasons(crop_names, season)
+        return self._stream(records, crop_seasons)
+
+    def _stream(
+        self,
+        records: Iterable[Mapping[str, Any]],
+        crop_seasons: List[tuple],
+    ) -> Iterator[List[Dict]]:
+        chunks = _chunked(records, self.chunk_size)
+
+        # Peek far enough ahead to decide whether the pool is worth starting
+        head: List[List[Mapping[str, Any]]] = []
+        buffered = 0
+        if self.workers > 1:
+            for chunk in chunks:
+                head.append(chunk)
+                buffered += len(chunk)
+                if buffered >= self.min_parallel_records:
+                    break
+        all_chunks = itertools.chain(head, chunks)
+
+        if self.workers <= 1 or buffered < self.min_parallel_records:
+            yield from self._evaluate_serial(all_chunks, crop_seasons)
+        else:
+            yield from self._evaluate_parallel(all_chunks, crop_seasons)
+
+    def _evaluate_serial(
+        self,
+        chunks: Iterable[List[Mapping[str, Any]]],
+        crop_seasons: List[tuple],
+    ) -> Iterator[List[Dict]]:
+        evaluator = self._get_evaluator()
+        for chunk in chunks:
+            with _quiet_logging():
+                results = [
+                    _evaluate_record(evaluator, record, crop_seasons, self.enrich)
+                    for record in chunk
+                ]
+            yield from results
+
+    def _evaluate_parallel(
+        self,
+        chunks: Iterable[List[Mapping[str, Any]]],
+        crop_seasons: List[tuple],
+    ) -> Iterator[List[Dict]]:
+        pool = self._get_pool()
+        max_in_flight = max(1, self.workers * PREFETCH_PER_WORKER)
+        pending = deque()
+
+        for chunk in chunks:
+            pending.append(pool.submit(_evaluate_chunk, chunk, crop_seasons, self.enrich))
+            if len(pending) >= max_in_flight:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def evaluate_records(
+    records: Iterable[Mapping[str, Any]],
+    crop_names: Optional[Sequence[str]] = None,
+    season: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    enrich: bool = True,
+    min_parallel_records: int = DEFAULT_MIN_PARALLEL_RECORDS,
+) -> Iterator[List[Dict]]:
+    """
+    One-shot helper around BatchEvaluator (the pool is closed when the
+    iterator is exhausted or garbage-collected).
+
+    Yields:
+        Per-record lists of per-crop results, in input order
+    """
+    with BatchEvaluator(workers, chunk_size, min_parallel_records, enrich) as batch:
+        yield from batch.evaluate(records, crop_names, season)
+
+
+# ---------------------------------------------------------------------- #
+# Command line: readers
+# ---------------------------------------------------------------------- #
+
+INPUT_FORMATS = ("csv", "xlsx", "jsonl")
+OUTPUT_FORMATS = ("csv", "jsonl", "sqlite")
+
+RESULT_COLUMNS = [
+    "crop_name", "season", "lsi", "lsc", "full_classification", "limiting_factors", "error"
+]
+
+
+def _coerce(value: Any) -> Any:
+    """Spreadsheet cell -> soil value: blanks become None, numeric text becomes float."""
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _normalize_column(name: Any) -> str:
+    """Header name -> record key (case-insensitive, surrounding spaces ignored)."""
+    return str(name).strip().lower()
+
+
+def _clean_record(raw: Mapping[Any, Any], id_column: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Normalize header names and drop empty cells.
+
+    The id column is only stripped, never coerced, so IDs such as "007"
+    survive unchanged.
+    """
+    id_key = _normalize_column(id_column) if id_column else None
+    record = {}
+    for key, value in raw.items():
+        if key is None:
+            continue
+        key = _normalize_column(key)
+        if key == id_key:
+            if isinstance(value, str):
+                value = value.strip() or None
+        else:
+            value = _coerce(value)
+        if value is not None:
+            record[key] = value
+    return record
+
+
+def _infer_format(path: str, choices: Sequence[str], fallback: Optional[str] = None) -> str:
+    suffix = Path(path).suffix.lower().lstrip(".")
+    suffix = {"ndjson": "jsonl", "json": "jsonl", "db": "sqlite", "sqlite3": "sqlite"}.get(
+        suffix, suffix
+    )
+    if suffix in choices:
+        return suffix
+    if fallback:
+        return fallback
+    raise ValueError(f"Cannot infer format of '{path}'; use one of: {', '.join(choices)}")
+
+
+def read_records(
+    path: str,
+    input_format: Optional[str] = None,
+    id_column: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream soil records from a CSV, XLSX or JSONL file ('-' reads stdin).
+
+    Column names are matched case-insensitively against the soil_data keys
+    (ph, rainfall, texture, ...); other columns are passed through. Values
+    of ``id_column`` are kept as text.
+    """
+    input_format = input_format or _infer_format(path, INPUT_FORMATS)
+
+    if input_format == "xlsx":
+        import openpyxl
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            for row in rows:
+                if any(cell is not None for cell in row):
+                    yield _clean_record(dict(zip(header, row)), id_column)
+        finally:
+            workbook.close()
+        return
+
+    stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8-sig")
+    try:
+        if input_format == "csv":
+            for row in csv.DictReader(stream):
+                yield _clean_record(row, id_column)
+        else:
+            for line_number, line in enumerate(stream, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    raw = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_number}: invalid JSON ({e})") from e
+                # Accept this module's own JSONL output as input
+                if isinstance(raw.get("soil_data"), dict):
+                    raw = raw["soil_data"]
+                yield _clean_record(raw, id_column)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+# ---------------------------------------------------------------------- #
+# Command line: writers
+# ---------------------------------------------------------------------- #
+
+class _CsvWriter:
+    """One row per (record, crop)."""
+
+    def __init__(self, stream, id_column: Optional[str]):
+        self.id_column = id_column
+        self.id_key = _normalize_column(id_column) if id_column else None
+        columns = ["row"] + ([id_column] if id_column else []) + RESULT_COLUMNS
+        self.writer = csv.DictWriter(stream, fieldnames=columns, extrasaction="ignore")
+        self.writer.writeheader()
+
+    def write(self, row: int, record: Mapping[str, Any], results: List[Dict]) -> None:
+        for result in results:
+            line = {column: result.get(column) for column in RESULT_COLUMNS}
+            line["row"] = row
+            if self.id_column:
+                line[self.id_column] = record.get(self.id_key)
+            self.writer.writerow(line)
+
+    def close(self) -> None:
+        pass
+
+
+class _JsonlWriter:
+    """One JSON object per record with all of its crop results."""
+
+    def __init__(self, stream, id_column: Optional[str]):
+        self.stream = stream
+        self.id_column = id_column
+        self.id_key = _normalize_column(id_column) if id_column else None
+
+    def write(self, row: int, record: Mapping[str, Any], results: List[Dict]) -> None:
+        line = {"row": row}
+        if self.id_column:
+            line[self.id_column] = record.get(self.id_key)
+        line["soil_data"] = record
+        line["results"] = [
+            {key: value for key, value in result.items() if key != "soil_data"}
+            for result in results
+        ]
+        self.stream.write(json.dumps(line, default=str) + "\n")
+
+    def close(self) -> None:
+        pass
+
+
+class _SqliteWriter:
+    """Rows in the application's soil_data_inputs and evaluation_results tables."""
+
+    # Records buffered per transaction
+    FLUSH_RECORDS = 200
+
+    def __init__(self, db_path: Optional[str], id_column: Optional[str] = None):
+        from database.db_manager import DatabaseManager, get_database
+        self.db = DatabaseManager(db_path) if db_path else get_database()
+        self.id_key = _normalize_column(id_column) if id_column else None
+        self.pending: List[tuple] = []
+
+    def write(self, row: int, record: Mapping[str, Any], results: List[Dict]) -> None:
+        self.pending.append((record, results))
+        if len(self.pending) >= self.FLUSH_RECORDS:
+            self.flush()
+
+    def _soil_input(self, record: Mapping[str, Any]) -> Dict[str, Any]:
+        from database.db_manager import SOIL_DATA_COLUMNS
+        soil_input = {
+            column: record.get(key)
+            for key, column in SOIL_DATA_COLUMNS.items()
+            if record.get(key) not in (None, "")
+        }
+        location = record.get("location")
+        if location is None and self.id_key:
+            location = record.get(self.id_key)
+        soil_input["location"] = location
+        soil_input["notes"] = "Batch import"
+        return soil_input
+
+    def flush(self) -> None:
+        """Write buffered records and their results in one transaction."""
+        if not self.pending:
+            return
+        from database.db_manager import evaluation_data_from_result
+        with self.db.get_connection():
+            input_ids = self.db.save_soil_inputs_batch(
+                [self._soil_input(record) for record, _ in self.pending]
+            )
+            self.db.save_evaluation_results_batch([
+                evaluation_data_from_result(result, input_id)
+                for input_id, (_, results) in zip(input_ids, self.pending)
+                for result in results
+                if "error" not in result
+            ])
+        self.pending = []
+
+    def close(self) -> None:
+        self.flush()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m knowledge_base.batch",
+        description="Evaluate a table of soil records against crops.",
+    )
+    parser.add_argument("input", help="CSV, XLSX or JSONL file ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="Output file ('-' for stdout; database path for sqlite)")
+    parser.add_argument("--input-format", choices=INPUT_FORMATS)
+    parser.add_argument("--format", choices=OUTPUT_FORMATS,
+                        help="Output format (default: from --output extension, else csv)")
+    parser.add_argument("--crops", nargs="+", metavar="CROP",
+                        help="Crops to evaluate (default: all)")
+    parser.add_argument("--season", help="Season for seasonal crops, e.g. may_august")
+    parser.add_argument("--id-column", help="Input column copied to each output row")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count; 1 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--min-parallel", type=int, default=DEFAULT_MIN_PARALLEL_RECORDS,
+                        help="Jobs smaller than this run in-process")
+    parser.add_argument("--no-enrich", action="store_true",
+                        help="Skip recommendations/interpretation (much faster)")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("knowledge_base").setLevel(logging.WARNING)
+
+    output_format = args.format or (
+        "csv" if args.output == "-" else _infer_format(args.output, OUTPUT_FORMATS, "csv")
+    )
+
+    # Keep the records alongside their results so writers can echo the input
+    pending_records = deque()
+
+    def tee(source):
+        for record in source:
+            pending_records.append(record)
+            yield record
+
+    batch = BatchEvaluator(
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        min_parallel_records=args.min_parallel,
+        enrich=not args.no_enrich,
+    )
+    writer = stream = None
+    started = time.perf_counter()
+    count = 0
+    try:
+        results = batch.evaluate(
+            tee(read_records(args.input, args.input_format, args.id_column)),
+            args.crops, args.season
+        )
+        if output_format == "sqlite":
+            writer = _SqliteWriter(None if args.output == "-" else args.output, args.id_column)
+        else:
+            stream = sys.stdout if args.output == "-" else open(
+                args.output, "w", newline="", encoding="utf-8"
+            )
+            writer_class = _CsvWriter if output_format == "csv" else _JsonlWriter
+            writer = writer_class(stream, args.id_column)
+
+        for count, record_results in enumerate(results, 1):
+            writer.write(count, pending_records.popleft(), record_results)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        batch.close()
+        if writer is not None:
+            writer.close()
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"Evaluated {count} records in {elapsed:.1f}s ({rate:.0f} records/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    # Re-import so worker processes pickle knowledge_base.batch functions,
+    # not __main__ ones
+    from knowledge_base.batch import main as batch_main
+    sys.exit(batch_main())
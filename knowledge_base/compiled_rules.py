@@ -0,0 +1,413 @@
+"""
+
+Compiled Rule Tables for SoilWise
+
+Turns the raw crop requirement dictionaries loaded by CropRules into
+sorted, normalized interval tables so that a parameter rating becomes a
+bisect lookup instead of a scan over every classification key.
+
+Each numeric table is decomposed into elementary slots: every breakpoint
+is its own slot and so is every open gap between two breakpoints. The
+winning classification of each slot is resolved once at compile time
+using the same first-match-in-file-order rule as the original engine,
+so overlapping ranges keep their precedence and gaps still fall back to
+the table default. Inverted ranges (e.g. [1600, 1500]) are normalized;
+malformed ranges raise ValueError so bad knowledge base data fails at
+load time instead of silently rating as the table default.
+
+"""
+
+import logging
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from knowledge_base.crop_rules import CropRules
+
+logger = logging.getLogger(__name__)
+
+
+SUBCLASS_CODES = {
+    "climate_requirements": "c",
+    "topography_requirements": "t",
+    "wetness_requirements": "w",
+    "physical_soil_requirements": "s",
+    "soil_fertility_requirements": "f",
+    "salinity_alkalinity_requirements": "n",
+}
+
+NEG_INF = float("-inf")
+POS_INF = float("inf")
+
+
+def classification_from_key(key: str) -> str:
+    """Extract the suitability class (S1/S2/S3/N) from a classification key."""
+    for prefix in ("S1", "S2", "S3", "N"):
+        if key.startswith(prefix):
+            return prefix
+    return key
+
+
+class CompiledTable:
+    """
+    Normalized lookup table for one (crop, season, category, parameter).
+
+    Numeric specs are stored as a sorted list of breakpoints with ratings
+    and classes held in parallel per-slot arrays. Slot ``2*i + 1`` is the
+    breakpoint ``bounds[i]`` itself and slot ``2*i`` is the open gap just
+    below it. Categorical specs are stored as a value -> spec index map.
+    """
+
+    __slots__ = (
+        "subclass",
+        "default_rating",
+        "default_class",
+        "keys",
+        "spec_ratings",
+        "spec_classes",
+        "spec_ranges",
+        "bounds",
+        "slot_spec",
+        "slot_ratings",
+        "slot_classes",
+        "value_spec",
+        "is_numeric",
+        "_arrays",
+    )
+
+    def __init__(
+        self,
+        specs: Dict[str, Any],
+        subclass: str,
+        default_rating: float = 1.0,
+        default_class: str = "S1",
+    ) -> None:
+        self.subclass = subclass
+        self.default_rating = default_rating
+        self.default_class = default_class
+
+        self.keys: List[str] = []
+        self.spec_ratings: List[float] = []
+        self.spec_classes: List[str] = []
+        self.spec_ranges: List[Optional[Tuple[float, float]]] = []
+        self.value_spec: Dict[str, int] = {}
+
+        for key, spec in specs.items():
+            if not isinstance(spec, dict) or "rating" not in spec:
+                continue
+
+            if "range" in spec:
+                interval = self._normalize_range(spec["range"], key)
+                index = self._add_spec(key, spec["rating"], interval)
+            elif "values" in spec:
+                index = self._add_spec(key, spec["rating"], None)
+                for value in spec["values"]:
+                    # First listed classification wins, as in the original scan
+                    self.value_spec.setdefault(str(value), index)
+
+        self.is_numeric = any(interval is not None for interval in self.spec_ranges)
+        self._arrays = None
+        self._build_slots()
+
+    # ------------------------------------------------------------------ #
+    # Compilation
+    # ------------------------------------------------------------------ #
+
+    def _add_spec(
+        self,
+        key: str,
+        rating: float,
+        interval: Optional[Tuple[float, float]],
+    ) -> int:
+        self.keys.append(key)
+        self.spec_ratings.append(float(rating))
+        self.spec_classes.append(classification_from_key(key))
+        self.spec_ranges.append(interval)
+        return len(self.keys) - 1
+
+    @staticmethod
+    def _normalize_range(raw: Any, key: str) -> Tuple[float, float]:
+        """
+        Convert a JSON range to a closed (low, high) interval with ±inf bounds.
+
+        Raises:
+            ValueError: The range is not a [low, high] pair of numbers/nulls
+        """
+        if not isinstance(raw, (list, tuple)) or len(raw) != 2:
+            raise ValueError(f"Malformed range for '{key}': {raw}")
+
+        try:
+            low = NEG_INF if raw[0] is None else float(raw[0])
+            high = POS_INF if raw[1] is None else float(raw[1])
+        except (TypeError, ValueError):
+            raise ValueError(f"Malformed range for '{key}': {raw}") from None
+        if low > high:
+            low, high = high, low
+        return (low, high)
+
+    def _build_slots(self) -> None:
+        intervals = [
+            (index, interval)
+            for index, interval in enumerate(self.spec_ranges)
+            if interval is not None
+        ]
+
+        bounds = sorted({
+            bound
+            for _, (low, high) in intervals
+            for bound in (low, high)
+            if bound not in (NEG_INF, POS_INF)
+        })
+        self.bounds: List[float] = bounds
+
+        slot_spec: List[int] = []
+        for slot in range(2 * len(bounds) + 1):
+            point = self._slot_representative(slot)
+            winner = -1
+            for index, (low, high) in intervals:
+                if low <= point <= high:
+                    winner = index
+                    break
+            slot_spec.append(winner)
+
+        self.slot_spec = slot_spec
+        self.slot_ratings = [
+            self.spec_ratings[i] if i >= 0 else self.default_rating for i in slot_spec
+        ]
+        self.slot_classes = [
+            self.spec_classes[i] if i >= 0 else self.default_class for i in slot_spec
+        ]
+
+    def _slot_representative(self, slot: int) -> float:
+        """Return a value lying inside the given elementary slot."""
+        bounds = self.bounds
+        i, is_point = divmod(slot, 2)
+        if is_point:
+            return bounds[i]
+        if not bounds:
+            return 0.0
+        if i == 0:
+            return bounds[0] - 1.0
+        if i == len(bounds):
+            return bounds[-1] + 1.0
+        return (bounds[i - 1] + bounds[i]) / 2.0
+
+    # ------------------------------------------------------------------ #
+    # Lookup
+    # ------------------------------------------------------------------ #
+
+    def slot_of(self, value: float) -> int:
+        """Return the elementary slot index containing ``value`` (O(log k))."""
+        bounds = self.bounds
+        i = bisect_left(bounds, value)
+        if i < len(bounds) and bounds[i] == value:
+            return 2 * i + 1
+        return 2 * i
+
+    def match(self, value: Any) -> int:
+        """
+        Return the index of the matching spec, or -1 if nothing matches.
+
+        Raises TypeError for non-numeric values against numeric tables,
+        which callers treat as an unevaluable parameter.
+        """
+        if self.is_numeric:
+            if value != value:  # NaN never falls inside a range
+                return -1
+            return self.slot_spec[self.slot_of(value)]
+        return self.value_spec.get(str(value), -1)
+
+    def as_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return (bounds, slot_ratings, slot_spec) as NumPy arrays.
+
+        Built on first use and cached, for np.searchsorted-based batch lookups.
+        """
+        if self._arrays is None:
+            self._arrays = (
+                np.asarray(self.bounds, dtype=float),
+                np.asarray(self.slot_ratings, dtype=float),
+                np.asarray(self.slot_spec, dtype=np.intp),
+            )
+        return self._arrays
+
+    def rate(self, value: Any) -> Tuple[float, str, str]:
+        """Return (rating, classification, subclass) for a parameter value."""
+        index = self.match(value)
+        if index < 0:
+            return (self.default_rating, self.default_class, self.subclass)
+        return (self.spec_ratings[index], self.spec_classes[index], self.subclass)
+
+    def __repr__(self):
+        return (
+            f"CompiledTable(specs={len(self.keys)}, bounds={len(self.bounds)}, "
+            f"values={len(self.value_spec)}, subclass='{self.subclass}')"
+        )
+
+
+class CompiledRules:
+    """
+    Compiled form of every crop requirement table in the knowledge base.
+
+    Tables are keyed by (crop, season, category, parameter). Season is None
+    for non-seasonal crops and for the season-independent categories of
+    seasonal crops, mirroring CropRules.get_parameter_requirement.
+    """
+
+    SLOPE_PARAMETER = "slope_pct"
+
+    def __init__(self, crop_rules: CropRules) -> None:
+        self.crop_rules = crop_rules
+        self.tables: Dict[Tuple[str, Optional[str], str, str], CompiledTable] = {}
+        self.slope_tables: Dict[str, CompiledTable] = {}
+        self.seasonal: Dict[str, bool] = {}
+        self.seasons: Dict[str, List[str]] = {}
+        self._missing_slope = CompiledTable({}, "t", 0.25, "N")
+
+        for crop_name in crop_rules.get_crop_names():
+            self._compile_crop(crop_name, crop_rules.crop_requirements[crop_name])
+
+        logger.info(
+            f"CompiledRules built {len(self.tables)} tables for "
+            f"{len(self.seasonal)} crops"
+        )
+
+    def _compile_crop(self, crop_name: str, crop_data: Dict[str, Any]) -> None:
+        is_seasonal = bool(crop_data.get("seasonal"))
+        seasons_data = crop_data.get("seasons") or {}
+        self.seasonal[crop_name] = is_seasonal
+        self.seasons[crop_name] = (
+            list(seasons_data.keys()) if isinstance(seasons_data, dict) else []
+        )
+
+        for category in SUBCLASS_CODES:
+            self._compile_category(crop_name, None, category, crop_data.get(category))
+
+        if is_seasonal and isinstance(seasons_data, dict):
+            for season, season_data in seasons_data.items():
+                self._compile_category(
+                    crop_name,
+                    season,
+                    "climate_requirements",
+                    (season_data or {}).get("climate_requirements"),
+                )
+
+        self.slope_tables[crop_name] = self._compile_slope(crop_name, crop_data)
+
+    def _compile_category(
+        self,
+        crop_name: str,
+        season: Optional[str],
+        category: str,
+        category_data: Optional[Dict[str, Any]],
+    ) -> None:
+        if not isinstance(category_data, dict):
+            return
+        subclass = SUBCLASS_CODES[category]
+        for parameter, specs in category_data.items():
+            if isinstance(specs, dict):
+                try:
+                    table = CompiledTable(specs, subclass)
+                except ValueError as e:
+                    where = f"{crop_name}/{season}" if season else crop_name
+                    raise ValueError(f"{where} {category}.{parameter}: {e}") from e
+                self.tables[(crop_name, season, category, parameter)] = table
+
+    def _compile_slope(self, crop_name: str, crop_data: Dict[str, Any]) -> CompiledTable:
+        """Slope supports a direct structure or a level-based one (level1 is used)."""
+        slope_reqs = (crop_data.get("topography_requirements") or {}).get(
+            self.SLOPE_PARAMETER
+        ) or {}
+        if not slope_reqs:
+            return self._missing_slope
+
+        has_direct_structure = any(
+            key.startswith(("S1", "S2", "S3", "N")) for key in slope_reqs
+        )
+        specs = slope_reqs if has_direct_structure else slope_reqs.get("level1")
+        if not specs:
+            return self._missing_slope
+        try:
+            return CompiledTable(specs, "t", 0.25, "N")
+        except ValueError as e:
+            raise ValueError(f"{crop_name} topography_requirements.slope_pct: {e}") from e
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    def get_table(
+        self,
+        crop_name: str,
+        category: str,
+        parameter: str,
+        season: Optional[str] = None,
+    ) -> Optional[CompiledTable]:
+        """
+        Get the compiled table used to rate a parameter.
+
+        Args:
+            crop_name: Name of the crop
+            category: Requirement category (e.g., 'climate_requirements')
+            parameter: Parameter key inside the category (e.g., 'ph_h2o')
+            season: Season key for seasonal crops
+
+        Returns:
+            CompiledTable, or None when the crop/season has no such table
+        """
+        if parameter == self.SLOPE_PARAMETER:
+            return self.slope_tables.get(crop_name, self._missing_slope)
+
+        is_seasonal = self.seasonal.get(crop_name)
+        if is_seasonal is None:
+            return None
+
+        if is_seasonal:
+            if not season or season not in self.seasons[crop_name]:
+                return None
+            if category == "climate_requirements":
+                return self.tables.get((crop_name, season, category, parameter))
+
+        return self.tables.get((crop_name, None, category, parameter))
+
+    def validate_season(self, crop_name: str, season: Optional[str]) -> None:
+        """
+        Check that a crop exists and that a valid season is given if it is seasonal.
+
+        Raises:
+            ValueError: Unknown crop, or missing/invalid season for a seasonal crop
+        """
+        if crop_name not in self.seasonal:
+            raise ValueError(f"Crop '{crop_name}' not found in knowledge base")
+        if not self.seasonal[crop_name]:
+            return
+
+        available_seasons = self.seasons[crop_name]
+        if not season:
+            raise ValueError(
+                f"{crop_name} is a seasonal crop. "
+                f"Please specify season: {', '.join(available_seasons)}"
+            )
+        if season not in available_seasons:
+            raise ValueError(
+                f"Invalid season '{season}' for {crop_name}. "
+                f"Available seasons: {', '.join(available_seasons)}"
+            )
+
+    def rate(
+        self,
+        crop_name: str,
+        category: str,
+        parameter: str,
+        value: Any,
+        season: Optional[str] = None,
+    ) -> Tuple[float, str, str]:
+        """Return (rating, classification, subclass); missing tables rate S1."""
+        table = self.get_table(crop_name, category, parameter, season)
+        if table is None:
+            return (1.0, "S1", SUBCLASS_CODES.get(category, ""))
+        return table.rate(value)
+
+    def __repr__(self):
+        return f"CompiledRules(crops={len(self.seasonal)}, tables={len(self.tables)})"
@@ -29,16 +29,33 @@ class CropRules:
     Supports both seasonal and non-seasonal crops.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        crop_requirements: Optional[Dict[str, Dict[str, Any]]] = None,
+        data_dir: Optional[Path] = None
+    ):
+        """
+        Args:
+            crop_requirements: Already-loaded requirements (e.g. from a snapshot).
+                If None, all JSON files in the data directory are loaded.
+            data_dir: Override for the data/crop_requirements directory.
+        """
+        self._data_dir = Path(data_dir) if data_dir is not None else None
         self.crop_requirements: Dict[str, Dict[str, Any]] = {}
-        self._load_all_crops()
+        if crop_requirements is not None:
+            self.crop_requirements = crop_requirements
+        else:
+            self._load_all_crops()
         logger.info(f"CropRules initialized with {len(self.crop_requirements)} crops")
     
     def _get_data_dir(self) -> Path:
         """Get the data/crop_requirements directory path."""
-        current_file = Path(__file__)
-        project_root = current_file.parent.parent
-        data_dir = project_root / "data" / "crop_requirements"
+        if self._data_dir is not None:
+            data_dir = self._data_dir
+        else:
+            current_file = Path(__file__)
+            project_root = current_file.parent.parent
+            data_dir = project_root / "data" / "crop_requirements"
         
         if not data_dir.exists():
             logger.error(f"Crop requirements directory not found: {data_dir}")
@@ -79,11 +96,59 @@ class CropRules:
         
         return True
     
+    def _read_crop_file(self, json_file: Path) -> Optional[Dict[str, Any]]:
+        """
+        Parse and validate a single crop requirement file.
+        
+        Returns:
+            Crop data, or None if the file is invalid
+        """
+        try:
+            logger.debug(f"Loading {json_file.name}...")
+            
+            with open(json_file, 'r', encoding='utf-8') as f:
+                crop_data = json.load(f)
+            
+            # Validate crop data
+            if not self._validate_crop_data(crop_data, json_file.name):
+                return None
+            return crop_data
+        
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error in {json_file.name}: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error loading {json_file.name}: {e}", exc_info=True)
+        return None
+    
+    def _add_crop(self, crop_data: Dict[str, Any], filename: str):
+        """Register loaded crop data under its crop name."""
+        crop_name = crop_data.get('crop_name')
+        
+        # Check for duplicates
+        if crop_name in self.crop_requirements:
+            logger.warning(
+                f"Duplicate crop name '{crop_name}' found in {filename}. "
+                f"Overwriting previous entry."
+            )
+        
+        self.crop_requirements[crop_name] = crop_data
+        
+        # Log if seasonal
+        if crop_data.get('seasonal'):
+            seasons = crop_data.get('seasons', {})
+            logger.info(f"✓ Loaded: {crop_name} ({filename}) - SEASONAL with {len(seasons)} seasons")
+        else:
+            logger.info(f"✓ Loaded: {crop_name} ({filename})")
+    
+    def _list_crop_files(self) -> List[Path]:
+        """List the crop requirement JSON files in the data directory."""
+        return list(self._get_data_dir().glob("*.json"))
+    
     def _load_all_crops(self):
         """Load all crop requirement JSON files from the data directory."""
         try:
             data_dir = self._get_data_dir()
-            json_files = list(data_dir.glob("*.json"))
+            json_files = self._list_crop_files()
             
             if not json_files:
                 logger.warning(f"No crop requirement files found in {data_dir}")
@@ -93,39 +158,11 @@ class CropRules:
             loaded_count = 0
             
             for json_file in json_files:
-                try:
-                    logger.debug(f"Loading {json_file.name}...")
-                    
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        crop_data = json.load(f)
-                    
-                    # Validate crop data
-                    if not self._validate_crop_data(crop_data, json_file.name):
-                        continue
-                    
-                    crop_name = crop_data.get('crop_name')
-                    
-                    # Check for duplicates
-                    if crop_name in self.crop_requirements:
-                        logger.warning(
-                            f"Duplicate crop name '{crop_name}' found in {json_file.name}. "
-                            f"Overwriting previous entry."
-                        )
-                    
-                    self.crop_requirements[crop_name] = crop_data
-                    loaded_count += 1
-                    
-                    # Log if seasonal
-                    if crop_data.get('seasonal'):
-                        seasons = crop_data.get('seasons', {})
-                        logger.info(f"✓ Loaded: {crop_name} ({json_file.name}) - SEASONAL with {len(seasons)} seasons")
-                    else:
-                        logger.info(f"✓ Loaded: {crop_name} ({json_file.name})")
-                
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON decode error in {json_file.name}: {e}")
-                except Exception as e:
-                    logger.error(f"Unexpected error loading {json_file.name}: {e}", exc_info=True)
+                crop_data = self._read_crop_file(json_file)
+                if crop_data is None:
+                    continue
+                self._add_crop(crop_data, json_file.name)
+                loaded_count += 1
             
             logger.info(f"Successfully loaded {loaded_count}/{len(json_files)} crop requirement files")
         
@@ -6,10 +6,16 @@ Orchestrates the complete evaluation workflow using the Square Root Method
 Reference: Khiddir et al. 1986, FAO 1976, Sys et al. 1993
 """
 
+import heapq
 import logging
-from typing import Dict, List, Optional, Tuple
-from knowledge_base.crop_rules import CropRules
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+from knowledge_base.inverse import ValueWindow, value_windows
+from knowledge_base.registry import KnowledgeBase, get_knowledge_base
 from knowledge_base.rules_engine import RulesEngine
+from knowledge_base.session import EvaluationSession
+from knowledge_base.streaming import CompactResult, iter_evaluate
+from knowledge_base.uncertainty import ErrorSpec, UncertaintyResult, evaluate_uncertainty
+from knowledge_base.vectorized import MatrixResult, SweepResult, evaluate_matrix, sweep
 
 # Configure logging
 logging.basicConfig(
@@ -32,10 +38,18 @@ class SuitabilityEvaluator:
     5. Generates comprehensive evaluation reports
     """
 
-    def __init__(self) -> None:
+    def __init__(self, knowledge_base: Optional[KnowledgeBase] = None) -> None:
+        """
+        Args:
+            knowledge_base: Shared, read-only knowledge base. Defaults to the
+                process-wide instance, so the crop JSON files are parsed once
+                no matter how many evaluators are created.
+        """
         logger.info("Initializing SuitabilityEvaluator...")
-        self.crop_rules = CropRules()
-        self.rules_engine = RulesEngine()
+        self.knowledge_base = knowledge_base or get_knowledge_base()
+        self.crop_rules = self.knowledge_base.crop_rules
+        self.rules_engine = RulesEngine(self.knowledge_base)
+        self.compiled_rules = self.knowledge_base.compiled_rules
         num_crops = len(self.crop_rules.get_crop_names())
         logger.info("✓ SuitabilityEvaluator initialized with %d crops", num_crops)
 
@@ -48,6 +62,7 @@ class SuitabilityEvaluator:
         soil_data: Dict[str, float],
         crop_name: str,
         season: Optional[str] = None,
+        explain: bool = False,
     ) -> Dict:
         """
         Evaluate crop suitability for given soil data.
@@ -56,6 +71,7 @@ class SuitabilityEvaluator:
             soil_data: Dictionary containing soil and climate parameters.
             crop_name: Name of the crop to evaluate.
             season: Optional season for seasonal crops.
+            explain: Attach an EvaluationTrace under the 'trace' key.
             
         Returns:
             Dictionary containing comprehensive evaluation results.
@@ -116,15 +132,14 @@ class SuitabilityEvaluator:
             logger.info("✓ Seasonal crop detected - using '%s' season requirements", season)
 
         # Log input data
-        logger.info("\n" + "-" * 100)
-        logger.info("INPUT SOIL/CLIMATE DATA")
-        logger.info("-" * 100)
-        for key, value in sorted(soil_data.items()):
-            logger.info("   %-30s = %s", key, value)
-        logger.info("-" * 100)
+        if logger.isEnabledFor(logging.DEBUG):
+            for key, value in sorted(soil_data.items()):
+                logger.debug("   %-30s = %s", key, value)
 
         # Perform evaluation using rules engine
-        evaluation_result = self.rules_engine.evaluate(crop_name, soil_data, season)
+        evaluation_result = self.rules_engine.evaluate(
+            crop_name, soil_data, season, explain=explain
+        )
 
         # Enrich result with additional information (and attach soil_data)
         enriched_result = self._enrich_evaluation_result(
@@ -141,6 +156,69 @@ class SuitabilityEvaluator:
         
         return enriched_result
 
+    def evaluate_all_seasons(
+        self,
+        soil_data: Dict[str, float],
+        crop_name: str,
+        enrich: bool = False,
+    ) -> Dict:
+        """
+        Evaluate a crop in every season and build a season comparison table.
+        
+        Season-independent parameters are rated once; only the climate
+        parameters are re-rated per season.
+        
+        Args:
+            soil_data: Dictionary containing soil and climate parameters.
+            crop_name: Name of the crop to evaluate.
+            enrich: Also run full enrichment (recommendations, limiting
+                factor details, ...) for every season's result.
+            
+        Returns:
+            Dictionary with:
+                crop_name, seasonal (bool), best_season (highest LSI, first
+                season on ties; None for non-seasonal crops and for
+                seasonal crops without season tables, whose table and
+                results are empty),
+                table: one row per season (season, lsi, lsc,
+                    full_classification, limiting_factors, climate_ratings),
+                results: full result per season key.
+        """
+        season_results = self.rules_engine.evaluate_all_seasons(crop_name, soil_data)
+        
+        if enrich:
+            crop_data = self.crop_rules.get_crop_requirements(crop_name)
+            season_results = {
+                season: self._enrich_evaluation_result(
+                    result, crop_data, soil_data, crop_name, season
+                )
+                for season, result in season_results.items()
+            }
+        
+        table = []
+        for season, result in season_results.items():
+            table.append({
+                "season": season,
+                "lsi": result["lsi"],
+                "lsc": result["lsc"],
+                "full_classification": result["full_classification"],
+                "limiting_factors": result["limiting_factors"],
+                "climate_ratings": {
+                    soil_key: rated
+                    for soil_key, rated in result["parameter_ratings"].items()
+                    if rated[2] == "c"
+                },
+            })
+        
+        best = max(table, key=lambda row: row["lsi"], default=None)
+        return {
+            "crop_name": crop_name,
+            "seasonal": bool(self.compiled_rules.seasonal.get(crop_name)),
+            "best_season": best["season"] if best else None,
+            "table": table,
+            "results": season_results,
+        }
+
     def evaluate_multiple_crops(
         self,
         soil_data: Dict[str, float],
@@ -211,10 +289,252 @@ class SuitabilityEvaluator:
         logger.info("=" * 100 + "\n")
         return results
 
+    def top_k_crops(
+        self,
+        soil_data: Dict[str, float],
+        k: int = 3,
+        season: Optional[str] = None,
+        crop_names: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """
+        Rank crops and return only the k most suitable, fully enriched.
+        
+        Uses LSI ≤ Rmin × 100 (tightened by the partial product) to stop
+        rating a crop as soon as it can no longer beat the current k-th
+        best LSI. Only the winners go through _enrich_evaluation_result.
+        
+        Args:
+            soil_data: Dictionary containing soil and climate parameters.
+            k: Number of crops to return.
+            season: Season applied to seasonal crops. If None, seasonal
+                crops are skipped.
+            crop_names: Crops to rank. If None, ranks all crops.
+            
+        Returns:
+            Up to k enriched evaluation results, sorted by LSI (descending),
+            in the same order evaluate_multiple_crops would rank them.
+        """
+        compiled_rules = self.compiled_rules
+        if crop_names is None:
+            crop_names = self._default_crops(season)
+        if k <= 0:
+            return []
+        
+        # Min-heap of (lsi, -position, crop_name, crop_season, parameter_ratings)
+        heap = []
+        pruned = 0
+        for position, crop_name in enumerate(crop_names):
+            crop_season = season if compiled_rules.seasonal.get(crop_name) else None
+            compiled_rules.validate_season(crop_name, crop_season)
+            
+            floor = heap[0][0] if len(heap) >= k else 0.0
+            parameter_ratings = self.rules_engine.evaluate_bounded(
+                crop_name, soil_data, crop_season, floor
+            )
+            if parameter_ratings is None:
+                pruned += 1
+                continue
+            
+            lsi = self.rules_engine._build_result(
+                crop_name, crop_season, parameter_ratings
+            )["lsi"]
+            entry = (lsi, -position, crop_name, crop_season, parameter_ratings)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+        
+        logger.debug(
+            "top_k_crops: k=%d, %d crops, %d pruned early", k, len(crop_names), pruned
+        )
+        
+        winners = []
+        for _, _, crop_name, crop_season, parameter_ratings in sorted(heap, reverse=True):
+            result = self.rules_engine._build_result(
+                crop_name, crop_season, parameter_ratings
+            )
+            winners.append(self._enrich_evaluation_result(
+                result,
+                self.crop_rules.get_crop_requirements(crop_name),
+                soil_data,
+                crop_name,
+                crop_season,
+            ))
+        return winners
+
+    def iter_evaluate(
+        self,
+        records: Iterable[Mapping[str, Any]],
+        crop_names: Optional[Sequence[str]] = None,
+        season: Optional[str] = None,
+        batch_size: int = 0,
+    ) -> Iterator[CompactResult]:
+        """
+        Evaluate a stream of soil records in constant memory.
+        
+        Args:
+            records: Iterable of soil_data dicts, consumed lazily
+            crop_names: Crops to evaluate. If None, all crops (seasonal
+                crops only when a season is given).
+            season: Season applied to seasonal crops
+            batch_size: Micro-batch size for the vectorized path (0 = off)
+            
+        Returns:
+            Iterator of CompactResult (index, crop_name, season, lsi, lsc,
+            limiting_factors), one per record and crop, in input order.
+        """
+        if crop_names is None:
+            crop_names = self._default_crops(season)
+        return iter_evaluate(self.rules_engine, records, crop_names, season, batch_size)
+
+    def evaluate_matrix(
+        self,
+        samples: Mapping[str, Sequence],
+        crop_names: Optional[Sequence[str]] = None,
+        season: Optional[str] = None,
+    ) -> MatrixResult:
+        """
+        Evaluate N soil samples against M crops in one vectorized pass.
+        
+        Args:
+            samples: Columnar soil data (soil_data key -> column of values),
+                e.g. {"ph": [5.2, 6.1], "texture": ["L", "CL"]} or a DataFrame.
+            crop_names: Crops to evaluate. If None, all crops (seasonal
+                crops only when a season is given).
+            season: Season for seasonal crops.
+            
+        Returns:
+            MatrixResult with (N, M) LSI, class and limiting-factor bitmask arrays.
+            No recommendations or per-parameter details are produced.
+        """
+        if crop_names is None:
+            crop_names = self._default_crops(season)
+        return evaluate_matrix(self.compiled_rules, samples, crop_names, season)
+
+    def sweep(
+        self,
+        crop_name: str,
+        base_soil: Mapping,
+        parameter: str,
+        values: Sequence,
+        season: Optional[str] = None,
+    ) -> SweepResult:
+        """
+        LSI curve of one crop as a single parameter varies over a grid.
+        
+        Args:
+            crop_name: Crop to evaluate
+            base_soil: Soil data for every other parameter
+            parameter: soil_data key to vary (e.g. 'ph', 'rainfall')
+            values: Grid of values, e.g. np.linspace(4.0, 8.0, 81)
+            season: Season for seasonal crops
+            
+        Returns:
+            SweepResult with LSI, class and limiting-factor arrays plus the
+            rule-table breakpoints inside the grid. No recommendations are
+            produced.
+        """
+        return sweep(self.compiled_rules, crop_name, base_soil, parameter, values, season)
+
+    def required_ranges(
+        self,
+        crop_name: str,
+        soil_data: Mapping,
+        target_class: str = "S2",
+        season: Optional[str] = None,
+        parameters: Optional[Sequence[str]] = None,
+    ) -> Dict[str, ValueWindow]:
+        """
+        Parameter values that keep a crop at or above a target class.
+        
+        Each parameter is solved for separately with the others held at
+        their values in soil_data, e.g. "what pH window keeps Banana at
+        S2 or better with this soil".
+        
+        Args:
+            crop_name: Crop to evaluate
+            soil_data: Current soil data
+            target_class: 'S1', 'S2' or 'S3'
+            season: Season for seasonal crops
+            parameters: soil_data keys to solve for (default: all given)
+            
+        Returns:
+            ValueWindow per parameter (intervals for numeric parameters,
+            passing values for categorical ones)
+        """
+        return value_windows(
+            self.compiled_rules, crop_name, soil_data, target_class, season, parameters
+        )
+
+    def evaluate_uncertainty(
+        self,
+        soil_data: Mapping,
+        crop_name: str,
+        errors: Optional[Mapping[str, ErrorSpec]] = None,
+        season: Optional[str] = None,
+        n_draws: int = 2000,
+        confidence: float = 0.90,
+        seed: Optional[int] = None,
+    ) -> UncertaintyResult:
+        """
+        Monte Carlo evaluation under measurement error.
+        
+        Draws n_draws perturbed copies of soil_data and rates them in one
+        vectorized pass (a few milliseconds for the default 2000 draws).
+        
+        Args:
+            soil_data: Measured soil and climate values
+            crop_name: Crop to evaluate
+            errors: Error model per parameter, e.g.
+                {"ph": 0.2, "cec": {"relative": 0.1}}. Defaults to typical
+                lab repeatability for the numeric parameters given.
+            season: Season for seasonal crops
+            n_draws: Number of draws
+            confidence: Coverage of the LSI interval
+            seed: Random seed for reproducible results
+            
+        Returns:
+            UncertaintyResult with class probabilities, the LSI interval
+            and the parameters driving the variance
+        """
+        return evaluate_uncertainty(
+            self.compiled_rules, crop_name, soil_data, errors, season,
+            n_draws, confidence, seed
+        )
+
+    def create_session(
+        self,
+        crop_names: Optional[Sequence[str]] = None,
+        soil_data: Optional[Mapping] = None,
+        season: Optional[str] = None,
+    ) -> EvaluationSession:
+        """
+        Start an incremental evaluation session for live "what if" edits.
+        
+        Args:
+            crop_names: Crops to track. If None, tracks all crops (seasonal
+                crops only when a season is given).
+            soil_data: Initial soil values
+            season: Season for seasonal crops
+            
+        Returns:
+            EvaluationSession sharing this evaluator's knowledge base
+        """
+        if crop_names is None:
+            crop_names = self._default_crops(season)
+        return EvaluationSession(crop_names, soil_data, season, self.knowledge_base)
+
     # ------------------------------------------------------------------ #
     # Internal helpers
     # ------------------------------------------------------------------ #
 
+    def _default_crops(self, season: Optional[str]) -> List[str]:
+        """Default crop list: every crop, skipping seasonal crops when no season is given."""
+        return [
+            crop for crop in self.crop_rules.get_crop_names()
+            if season or not self.compiled_rules.seasonal.get(crop)
+        ]
+
     def _enrich_evaluation_result(
         self,
         evaluation_result: Dict,
@@ -0,0 +1,225 @@
+"""
+
+Inverse Suitability Queries for SoilWise
+
+Answers "which values of this parameter keep the crop at or above a target
+class, given the rest of the soil?" analytically instead of by search.
+
+Every compiled rule table is piecewise constant over its elementary slots
+(open gaps between breakpoints and the breakpoints themselves), and the
+Square Root Method is non-decreasing in each individual rating. So for
+each parameter it is enough to evaluate one representative value per
+slot (a single vectorized sweep) and merge the passing slots into
+intervals. Categorical parameters (texture, drainage, flooding) yield
+the set of passing values instead.
+
+"""
+
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from knowledge_base.compiled_rules import CompiledRules, CompiledTable, NEG_INF, POS_INF
+from knowledge_base.rules_engine import PARAMETER_MAPPING
+from knowledge_base.vectorized import sweep
+
+logger = logging.getLogger(__name__)
+
+
+# Minimum LSI for each target class (same cut-offs as RulesEngine.classify_lsi)
+CLASS_THRESHOLDS = {"S1": 75.0, "S2": 50.0, "S3": 25.0, "N": 0.0}
+
+# Stand-in for "any value not listed in a categorical table"
+_UNLISTED = "\0unlisted"
+
+# (low, high, low_inclusive, high_inclusive)
+Interval = Tuple[float, float, bool, bool]
+
+
+@dataclass
+class ValueWindow:
+    """Values of one parameter that keep a crop at or above a target class."""
+
+    parameter: str
+    target_class: str
+    current_value: Any = None
+    current_ok: Optional[bool] = None
+    intervals: List[Interval] = field(default_factory=list)  # numeric parameters
+    values: List[str] = field(default_factory=list)          # categorical parameters
+    listed: List[str] = field(default_factory=list)          # categorical: every table value
+    unlisted_ok: bool = False     # categorical: values absent from the table pass
+    categorical: bool = False
+
+    @property
+    def feasible(self) -> bool:
+        """True if some value of this parameter reaches the target class."""
+        return bool(self.intervals or self.values or self.unlisted_ok)
+
+    def contains(self, value: Any) -> bool:
+        """Check whether a value lies inside the window."""
+        if self.categorical:
+            return str(value) in self.values or (
+                self.unlisted_ok and str(value) not in self.listed
+            )
+        for low, high, low_inc, high_inc in self.intervals:
+            above = value > low or (low_inc and value == low)
+            below = value < high or (high_inc and value == high)
+            if above and below:
+                return True
+        return False
+
+    def describe(self) -> str:
+        """Human-readable window, e.g. '[5.5, 7] ∪ (7.5, ∞)'."""
+        if self.categorical:
+            parts = list(self.values)
+            if self.unlisted_ok:
+                parts.append("any unlisted value")
+            return ", ".join(parts) if parts else "none"
+        if not self.intervals:
+            return "none"
+        return " ∪ ".join(_format_interval(interval) for interval in self.intervals)
+
+
+def _format_interval(interval: Interval) -> str:
+    low, high, low_inc, high_inc = interval
+    if low == high:
+        return f"{{{low:g}}}"
+    left = "[" if low_inc else "("
+    right = "]" if high_inc else ")"
+    low_text = "-∞" if low == NEG_INF else f"{low:g}"
+    high_text = "∞" if high == POS_INF else f"{high:g}"
+    return f"{left}{low_text}, {high_text}{right}"
+
+
+def _slot_interval(table: CompiledTable, slot: int) -> Interval:
+    """Value interval covered by one elementary slot."""
+    bounds = table.bounds
+    i, is_point = divmod(slot, 2)
+    if is_point:
+        return (bounds[i], bounds[i], True, True)
+    low = bounds[i - 1] if i > 0 else NEG_INF
+    high = bounds[i] if i < len(bounds) else POS_INF
+    return (low, high, False, False)
+
+
+def _merge_slots(table: CompiledTable, passing: Sequence[bool]) -> List[Interval]:
+    """Merge runs of consecutive passing slots into intervals."""
+    intervals: List[Interval] = []
+    current: Optional[List[Any]] = None
+    for slot, ok in enumerate(passing):
+        if not ok:
+            if current is not None:
+                intervals.append(tuple(current))
+                current = None
+            continue
+        low, high, low_inc, high_inc = _slot_interval(table, slot)
+        if current is None:
+            current = [low, high, low_inc, high_inc]
+        else:
+            current[1], current[3] = high, high_inc
+    if current is not None:
+        intervals.append(tuple(current))
+    return intervals
+
+
+def value_window(
+    compiled_rules: CompiledRules,
+    crop_name: str,
+    soil_data: Mapping[str, Any],
+    parameter: str,
+    target_class: str = "S2",
+    season: Optional[str] = None,
+) -> ValueWindow:
+    """
+    Values of one parameter that keep a crop at or above ``target_class``.
+
+    Args:
+        compiled_rules: Compiled knowledge base
+        crop_name: Crop to evaluate
+        soil_data: Current soil data (the other parameters stay fixed)
+        parameter: soil_data key to solve for (e.g. 'ph', 'slope')
+        target_class: 'S1', 'S2', 'S3' or 'N'
+        season: Season key for seasonal crops
+
+    Returns:
+        ValueWindow with the passing intervals (numeric) or values (categorical)
+
+    Raises:
+        ValueError: Unknown parameter, target class, crop or season
+    """
+    if target_class not in CLASS_THRESHOLDS:
+        raise ValueError(
+            f"Unknown target class '{target_class}'. "
+            f"Use one of: {', '.join(CLASS_THRESHOLDS)}"
+        )
+    if parameter not in PARAMETER_MAPPING:
+        raise ValueError(f"Unknown parameter '{parameter}'")
+    threshold = CLASS_THRESHOLDS[target_class]
+
+    category, requirement = PARAMETER_MAPPING[parameter]
+    table = compiled_rules.get_table(crop_name, category, requirement, season)
+    window = ValueWindow(
+        parameter=parameter,
+        target_class=target_class,
+        current_value=soil_data.get(parameter),
+    )
+
+    if table is None:
+        # No requirement: every value rates 1.0, so only the rest of the soil matters
+        result = sweep(compiled_rules, crop_name, soil_data, parameter, [0.0], season)
+        if result.lsi[0] >= threshold:
+            window.intervals = [(NEG_INF, POS_INF, False, False)]
+    elif table.is_numeric:
+        slots = range(2 * len(table.bounds) + 1)
+        representatives = [table._slot_representative(slot) for slot in slots]
+        result = sweep(
+            compiled_rules, crop_name, soil_data, parameter, representatives, season
+        )
+        window.intervals = _merge_slots(table, list(result.lsi >= threshold))
+    else:
+        listed = list(table.value_spec)
+        result = sweep(
+            compiled_rules, crop_name, soil_data, parameter, listed + [_UNLISTED], season
+        )
+        passing = result.lsi >= threshold
+        window.categorical = True
+        window.listed = listed
+        window.values = [value for value, ok in zip(listed, passing[:-1]) if ok]
+        window.unlisted_ok = bool(passing[-1])
+
+    current = window.current_value
+    if current is not None and not (isinstance(current, float) and math.isnan(current)):
+        try:
+            window.current_ok = window.contains(current)
+        except TypeError:
+            window.current_ok = None
+    return window
+
+
+def value_windows(
+    compiled_rules: CompiledRules,
+    crop_name: str,
+    soil_data: Mapping[str, Any],
+    target_class: str = "S2",
+    season: Optional[str] = None,
+    parameters: Optional[Sequence[str]] = None,
+) -> Dict[str, ValueWindow]:
+    """
+    value_window for several parameters at once.
+
+    Args:
+        parameters: soil_data keys to solve for. Defaults to every mapped
+            parameter present in soil_data.
+
+    Returns:
+        Windows keyed by parameter
+    """
+    if parameters is None:
+        parameters = [key for key in soil_data if key in PARAMETER_MAPPING]
+    return {
+        parameter: value_window(
+            compiled_rules, crop_name, soil_data, parameter, target_class, season
+        )
+        for parameter in parameters
+    }
@@ -0,0 +1,416 @@
+"""
+
+Crop Calendar Planner for SoilWise
+
+Chooses a year-round planting plan for each site (barangay): either one
+perennial crop that holds the land all year, or a sequence of seasonal
+crops over the three planting seasons (Jan-Apr, May-Aug, Sep-Dec). The
+plan maximizes the summed LSI over the seasons, subject to rotation
+constraints:
+
+    - no two consecutive seasons with crops of the same botanical family
+      (Maize after Sorghum, Tomato after Tomato, ...)
+    - the calendar repeats, so the Sep-Dec crop must also rotate with the
+      next year's Jan-Apr crop (cyclic=True)
+    - crops below min_lsi are not planted; the season is left fallow
+
+Suitability is precomputed once as a site × crop × season LSI tensor
+(one evaluate_matrix call per season) and every site is solved at once
+by dynamic programming over "previous crop" states, so planning all 37
+barangays of Piagapo takes milliseconds.
+
+Run:
+    python -m knowledge_base.planner [--db PATH] [--min-lsi 25] [--no-perennials]
+
+"""
+
+import argparse
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from database.db_manager import SOIL_DATA_COLUMNS
+from knowledge_base.registry import KnowledgeBase, get_knowledge_base
+from knowledge_base.rules_engine import RulesEngine
+from knowledge_base.sensitivity import CATEGORICAL_PARAMETERS, _to_float
+from knowledge_base.vectorized import classify_lsi_array, evaluate_matrix, records_to_columns
+
+logger = logging.getLogger(__name__)
+
+
+FALLOW = "Fallow"
+
+# Botanical family used by the rotation constraint
+CROP_FAMILIES: Dict[str, str] = {
+    "Arabica Coffee": "Rubiaceae",
+    "Robusta Coffee": "Rubiaceae",
+    "Banana": "Musaceae",
+    "Cabbage": "Brassicaceae",
+    "Carrots": "Apiaceae",
+    "Cocoa": "Malvaceae",
+    "Maize": "Poaceae",
+    "Sorghum": "Poaceae",
+    "Sugarcane": "Poaceae",
+    "Oil Palm": "Arecaceae",
+    "Pineapple": "Bromeliaceae",
+    "Sweet Potato": "Convolvulaceae",
+    "Tomato": "Solanaceae",
+}
+
+# Lowest LSI worth planting (S3 lower bound)
+DEFAULT_MIN_LSI = 25.0
+
+
+@dataclass
+class SuitabilityTensor:
+    """LSI of every site × crop × season."""
+
+    sites: List[str]
+    crops: List[str]
+    seasons: List[str]
+    lsi: np.ndarray              # (sites, crops, seasons) float
+    perennial: np.ndarray        # (crops,) bool
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.lsi.shape
+
+
+@dataclass
+class SitePlan:
+    """Best year-round plan for one site."""
+
+    site: str
+    seasons: List[str]
+    crops: List[str]             # one per season; a perennial fills every season
+    lsi: List[float]             # LSI per season (0 for fallow)
+    total_lsi: float
+    perennial: bool = False
+    feasible: bool = True
+    classes: List[str] = field(default_factory=list)
+
+    @property
+    def mean_lsi(self) -> float:
+        return round(self.total_lsi / len(self.seasons), 2) if self.seasons else 0.0
+
+    def describe(self) -> str:
+        if not self.feasible:
+            return "no feasible plan"
+        if self.perennial:
+            return f"{self.crops[0]} (perennial)"
+        return " → ".join(self.crops)
+
+
+def sites_from_history(records: Iterable[Mapping[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Latest soil sample per location from soil_data_inputs rows.
+
+    Args:
+        records: Rows of soil_data_inputs, newest first (as returned by
+            DatabaseManager.get_recent_soil_inputs)
+
+    Returns:
+        Location name -> soil_data dict
+    """
+    sites: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        location = (record.get("location") or "").strip()
+        if not location or location in sites:
+            continue
+        soil_data: Dict[str, Any] = {}
+        for key, column in SOIL_DATA_COLUMNS.items():
+            value = record.get(column)
+            if key in CATEGORICAL_PARAMETERS:
+                if value:
+                    soil_data[key] = str(value).strip()
+            else:
+                number = _to_float(value)
+                if number is not None:
+                    soil_data[key] = number
+        sites[location] = soil_data
+    return sites
+
+
+class CropCalendarPlanner:
+    """
+    Year-round crop plans for many sites at once.
+
+    Usage:
+        planner = CropCalendarPlanner()
+        tensor = planner.build_tensor({"Gacap": soil, "Bubong": soil2})
+        for plan in planner.plan(tensor):
+            print(plan.site, plan.describe(), plan.total_lsi)
+    """
+
+    def __init__(
+        self,
+        knowledge_base: Optional[KnowledgeBase] = None,
+        families: Optional[Mapping[str, str]] = None,
+        min_lsi: float = DEFAULT_MIN_LSI,
+        allow_fallow: bool = True,
+        include_perennials: bool = True,
+        cyclic: bool = True,
+    ) -> None:
+        """
+        Args:
+            knowledge_base: Shared knowledge base (defaults to get_knowledge_base())
+            families: Crop -> family for the rotation constraint
+                (defaults to CROP_FAMILIES; unknown crops are their own family)
+            min_lsi: Crops below this LSI in a season are not planted there
+            allow_fallow: Allow leaving a season unplanted (LSI 0)
+            include_perennials: Consider whole-year perennial plans
+            cyclic: Also rotate the last season into next year's first
+        """
+        self.knowledge_base = knowledge_base or get_knowledge_base()
+        self.rules_engine = RulesEngine(self.knowledge_base)
+        self.compiled_rules = self.rules_engine.compiled_rules
+        self.families = dict(families if families is not None else CROP_FAMILIES)
+        self.min_lsi = min_lsi
+        self.allow_fallow = allow_fallow
+        self.include_perennials = include_perennials
+        self.cyclic = cyclic
+
+    def _seasons(self, crops: Sequence[str]) -> List[str]:
+        """Planting seasons shared by the seasonal crops."""
+        seasons: List[str] = []
+        for crop_name in crops:
+            crop_seasons = self.compiled_rules.seasons.get(crop_name) or []
+            if not crop_seasons:
+                continue
+            if seasons and crop_seasons != seasons:
+                raise ValueError(
+                    f"{crop_name} has seasons {crop_seasons}, expected {seasons}"
+                )
+            seasons = list(crop_seasons)
+        return seasons
+
+    def build_tensor(
+        self,
+        sites: Mapping[str, Mapping[str, Any]],
+        crop_names: Optional[Sequence[str]] = None,
+    ) -> SuitabilityTensor:
+        """
+        Evaluate every site against every crop in every season.
+
+        Perennial crops are evaluated once and their LSI repeated across
+        the seasons.
+
+        Args:
+            sites: Site name -> soil_data
+            crop_names: Crops to plan with (default: all)
+
+        Returns:
+            SuitabilityTensor
+        """
+        crops = list(crop_names) if crop_names is not None else list(self.knowledge_base.crop_names)
+        for crop_name in crops:
+            if crop_name not in self.compiled_rules.seasonal:
+                raise ValueError(f"Unknown crop '{crop_name}'")
+        seasons = self._seasons(crops)
+        if not seasons:
+            raise ValueError("At least one seasonal crop is needed to build a calendar")
+
+        names = list(sites.keys())
+        columns = records_to_columns(sites[name] for name in names)
+        perennial = np.array([not self.compiled_rules.seasonal[crop] for crop in crops])
+        seasonal_idx = np.flatnonzero(~perennial)
+        perennial_idx = np.flatnonzero(perennial)
+
+        lsi = np.zeros((len(names), len(crops), len(seasons)), dtype=float)
+        if len(perennial_idx):
+            matrix = evaluate_matrix(self.compiled_rules, columns, [crops[i] for i in perennial_idx])
+            lsi[:, perennial_idx, :] = matrix.lsi[:, :, None]
+        for t, season in enumerate(seasons):
+            matrix = evaluate_matrix(
+                self.compiled_rules, columns, [crops[i] for i in seasonal_idx], season
+            )
+            lsi[:, seasonal_idx, t] = matrix.lsi
+
+        logger.debug(f"build_tensor: {len(names)} sites × {len(crops)} crops × {len(seasons)} seasons")
+        return SuitabilityTensor(names, crops, seasons, lsi, perennial)
+
+    def _rotation_mask(self, states: Sequence[str]) -> np.ndarray:
+        """allowed[a, b]: state b may follow state a in the next season."""
+        families = [
+            None if state == FALLOW else self.families.get(state, state) for state in states
+        ]
+        allowed = np.ones((len(states), len(states)), dtype=bool)
+        for a, family_a in enumerate(families):
+            for b, family_b in enumerate(families):
+                if family_a is not None and family_a == family_b:
+                    allowed[a, b] = False
+        return allowed
+
+    def _solve_sequences(
+        self, scores: np.ndarray, allowed: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best state sequence per site by dynamic programming.
+
+        Args:
+            scores: (sites, states, seasons) reward, -inf where not allowed
+            allowed: (states, states) rotation mask
+
+        Returns:
+            (totals, paths): (sites,) best total and (sites, seasons) state indices
+        """
+        n_sites, n_states, n_seasons = scores.shape
+        penalty = np.where(allowed, 0.0, -np.inf)
+        sites = np.arange(n_sites)
+        starts = range(n_states) if self.cyclic else [None]
+
+        best_total = np.full(n_sites, -np.inf)
+        best_path = np.zeros((n_sites, n_seasons), dtype=int)
+
+        for start in starts:
+            value = scores[:, :, 0].copy()
+            if start is not None:
+                keep = np.arange(n_states) == start
+                value[:, ~keep] = -np.inf
+            back = np.zeros((n_sites, n_states, n_seasons), dtype=int)
+            for t in range(1, n_seasons):
+                candidates = value[:, :, None] + penalty[None, :, :]
+                back[:, :, t] = np.argmax(candidates, axis=1)
+                value = np.max(candidates, axis=1) + scores[:, :, t]
+            if start is not None:
+                value = value + penalty[:, start][None, :]
+
+            last = np.argmax(value, axis=1)
+            total = value[sites, last]
+            better = total > best_total
+            if not better.any():
+                continue
+
+            path = np.zeros((n_sites, n_seasons), dtype=int)
+            path[:, -1] = last
+            for t in range(n_seasons - 1, 0, -1):
+                path[:, t - 1] = back[sites, path[:, t], t]
+            best_total = np.where(better, total, best_total)
+            best_path[better] = path[better]
+
+        return best_total, best_path
+
+    def plan(self, tensor: SuitabilityTensor) -> List[SitePlan]:
+        """
+        Best plan for every site in the tensor.
+
+        Args:
+            tensor: Precomputed site × crop × season LSI
+
+        Returns:
+            One SitePlan per site, in tensor order
+        """
+        seasonal_idx = np.flatnonzero(~tensor.perennial)
+        states = [tensor.crops[i] for i in seasonal_idx] + [FALLOW]
+        n_sites = len(tensor.sites)
+        n_seasons = len(tensor.seasons)
+
+        seasonal_lsi = tensor.lsi[:, seasonal_idx, :]
+        scores = np.where(seasonal_lsi >= self.min_lsi, seasonal_lsi, -np.inf)
+        fallow = np.full((n_sites, 1, n_seasons), 0.0 if self.allow_fallow else -np.inf)
+        scores = np.concatenate([scores, fallow], axis=1)
+
+        totals, paths = self._solve_sequences(scores, self._rotation_mask(states))
+
+        perennial_idx = np.flatnonzero(tensor.perennial)
+        if self.include_perennials and len(perennial_idx):
+            perennial_lsi = tensor.lsi[:, perennial_idx, 0]
+            perennial_scores = np.where(
+                perennial_lsi >= self.min_lsi, perennial_lsi * n_seasons, -np.inf
+            )
+            best_perennial = np.argmax(perennial_scores, axis=1)
+            perennial_totals = perennial_scores[np.arange(n_sites), best_perennial]
+        else:
+            best_perennial = np.zeros(n_sites, dtype=int)
+            perennial_totals = np.full(n_sites, -np.inf)
+
+        plans = []
+        for s, site in enumerate(tensor.sites):
+            if perennial_totals[s] > totals[s]:
+                crop_index = perennial_idx[best_perennial[s]]
+                crops = [tensor.crops[crop_index]] * n_seasons
+                lsi = [float(value) for value in tensor.lsi[s, crop_index, :]]
+                total = float(perennial_totals[s])
+                is_perennial = True
+            else:
+                crops = [states[k] for k in paths[s]]
+                lsi = [
+                    0.0 if k == len(states) - 1 else float(seasonal_lsi[s, k, t])
+                    for t, k in enumerate(paths[s])
+                ]
+                total = float(totals[s])
+                is_perennial = False
+
+            feasible = bool(np.isfinite(total))
+            plans.append(SitePlan(
+                site=site,
+                seasons=list(tensor.seasons),
+                crops=crops if feasible else [],
+                lsi=lsi if feasible else [],
+                total_lsi=round(total, 2) if feasible else 0.0,
+                perennial=is_perennial and feasible,
+                feasible=feasible,
+                classes=[
+                    FALLOW if crop == FALLOW else str(lsc)
+                    for crop, lsc in zip(crops, classify_lsi_array(np.array(lsi)))
+                ] if feasible else [],
+            ))
+
+        logger.debug(f"plan: {n_sites} sites, {len(states)} seasonal states")
+        return plans
+
+    def plan_sites(
+        self,
+        sites: Mapping[str, Mapping[str, Any]],
+        crop_names: Optional[Sequence[str]] = None,
+    ) -> List[SitePlan]:
+        """Build the suitability tensor for these sites and plan them."""
+        return self.plan(self.build_tensor(sites, crop_names))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m knowledge_base.planner",
+        description="Plan year-round crop calendars for every sampled location.",
+    )
+    parser.add_argument("--db", help="SQLite database path (default: app database)")
+    parser.add_argument("--crops", help="Comma-separated crop names (default: all)")
+    parser.add_argument("--min-lsi", type=float, default=DEFAULT_MIN_LSI)
+    parser.add_argument("--no-perennials", action="store_true")
+    parser.add_argument("--no-fallow", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("knowledge_base").setLevel(logging.WARNING)
+
+    from knowledge_base.sensitivity import load_history
+    db = None
+    if args.db:
+        from database.db_manager import DatabaseManager
+        db = DatabaseManager(args.db)
+    sites = sites_from_history(load_history(db))
+    if not sites:
+        print("No soil samples with a location in the database.")
+        return
+
+    crop_names = None
+    if args.crops:
+        crop_names = [name.strip() for name in args.crops.split(",") if name.strip()]
+
+    planner = CropCalendarPlanner(
+        min_lsi=args.min_lsi,
+        allow_fallow=not args.no_fallow,
+        include_perennials=not args.no_perennials,
+    )
+    tensor = planner.build_tensor(sites, crop_names)
+    print(f"{len(tensor.sites)} sites, seasons: {', '.join(tensor.seasons)}\n")
+    for plan in planner.plan(tensor):
+        detail = ", ".join(
+            f"{crop} {lsi:.1f}" for crop, lsi in zip(plan.crops, plan.lsi)
+        ) if plan.feasible and not plan.perennial else ""
+        print(f"{plan.site:<28} {plan.describe():<44} Σ {plan.total_lsi:>7.2f}  {detail}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+
+Knowledge Base Registry for SoilWise
+
+Loads and validates the crop requirement JSON files once per process
+(from the persistent snapshot when it is up to date) and shares the
+result, read-only, with every RulesEngine and SuitabilityEvaluator. The
+raw requirement dictionaries are frozen after loading so evaluators can
+be shared safely across worker threads.
+
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from knowledge_base.crop_rules import CropRules
+from knowledge_base.compiled_rules import CompiledRules
+from knowledge_base.snapshot import compute_kb_version, hash_file, load_rules
+
+logger = logging.getLogger(__name__)
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict.
+
+    Still an instance of dict (isinstance checks and json.dumps keep
+    working) but every mutating method raises TypeError.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Knowledge base data is read-only")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to FrozenDict and lists to tuples."""
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class KnowledgeBase:
+    """
+    Immutable, process-wide crop knowledge base.
+
+    Bundles the loaded CropRules (with frozen requirement data), their
+    CompiledRules and the knowledge-base version (content hash of the
+    source JSON files) so every evaluator works from the same instance.
+    """
+
+    def __init__(
+        self,
+        crop_rules: Optional[CropRules] = None,
+        compiled_rules: Optional[CompiledRules] = None,
+        version: Optional[str] = None,
+    ) -> None:
+        if crop_rules is None:
+            crop_rules, compiled_rules, version = load_rules(
+                use_snapshot=False, freeze=freeze
+            )
+        crop_rules.crop_requirements = freeze(crop_rules.crop_requirements)
+
+        self.crop_rules = crop_rules
+        self.compiled_rules = compiled_rules or CompiledRules(crop_rules)
+        self.version = version or compute_kb_version({
+            json_file.name: hash_file(json_file)
+            for json_file in crop_rules._list_crop_files()
+        })
+
+        # Build the NumPy views up front so nothing is lazily mutated later
+        for table in self.compiled_rules.tables.values():
+            table.as_arrays()
+        for table in self.compiled_rules.slope_tables.values():
+            table.as_arrays()
+
+        logger.info(f"Knowledge base {self.version} ready: {len(self.crop_names)} crops")
+
+    @classmethod
+    def load(
+        cls,
+        data_dir: Optional[Path] = None,
+        snapshot_path: Optional[Path] = None,
+        use_snapshot: bool = True,
+    ) -> "KnowledgeBase":
+        """Load from the persistent snapshot, re-parsing only changed JSON files."""
+        crop_rules, compiled_rules, version = load_rules(
+            data_dir, snapshot_path, use_snapshot, freeze=freeze
+        )
+        return cls(crop_rules, compiled_rules, version)
+
+    @property
+    def crop_names(self):
+        return self.crop_rules.get_crop_names()
+
+    def __repr__(self):
+        return (
+            f"KnowledgeBase(version='{self.version}', "
+            f"crops={len(self.crop_rules.crop_requirements)})"
+        )
+
+
+# Singleton instance
+_kb_instance: Optional[KnowledgeBase] = None
+_kb_lock = threading.Lock()
+
+
+def get_knowledge_base() -> KnowledgeBase:
+    """Get or create the shared knowledge base (thread-safe)."""
+    global _kb_instance
+    if _kb_instance is None:
+        with _kb_lock:
+            if _kb_instance is None:
+                _kb_instance = KnowledgeBase.load()
+    return _kb_instance
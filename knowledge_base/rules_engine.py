@@ -4,36 +4,73 @@ Rules Engine for SoilWise - CORRECTED & VERIFIED WITH SEASONAL SUPPORT
 
 Implements the Square Root Method for crop suitability evaluation
 
-FORMULA: LSI = Rmin Ã— âˆš(product of ALL ratings) Ã— 100
+FORMULA: LSI = Rmin × √(product of ALL ratings) × 100
 
 """
 
 import math
 import logging
-from typing import Dict, List, Tuple, Optional
-from knowledge_base.crop_rules import CropRules
-
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from typing import Any, Dict, List, Tuple, Optional
+from knowledge_base.compiled_rules import SUBCLASS_CODES, classification_from_key
+from knowledge_base.registry import KnowledgeBase, get_knowledge_base
+from knowledge_base.trace import EvaluationTrace, ParameterTrace
 
 logger = logging.getLogger(__name__)
 
 
+# Input soil_data keys -> (requirement category, parameter key in crop JSON)
+PARAMETER_MAPPING = {
+    "temperature": ("climate_requirements", "mean_annual_temp_c"),
+    "rainfall": ("climate_requirements", "annual_precipitation_mm"),
+    "humidity": ("climate_requirements", "mean_relative_humidity_driest_month_pct"),
+    "slope": ("topography_requirements", "slope_pct"),
+    "drainage": ("wetness_requirements", "drainage"),
+    "flooding": ("wetness_requirements", "flooding"),
+    "texture": ("physical_soil_requirements", "texture"),
+    "soil_depth": ("physical_soil_requirements", "soil_depth_cm"),
+    "coarse_fragments": ("physical_soil_requirements", "coarse_fragments_pct"),
+    "caco3": ("physical_soil_requirements", "caco3_pct"),
+    "gypsum": ("physical_soil_requirements", "gypsum_pct"),
+    "ph": ("soil_fertility_requirements", "ph_h2o"),
+    "organic_carbon": ("soil_fertility_requirements", "organic_carbon_pct"),
+    "base_saturation": ("soil_fertility_requirements", "base_saturation_pct"),
+    "sum_basic_cations": ("soil_fertility_requirements", "sum_basic_cations_cmol_kg"),
+    "cec": ("soil_fertility_requirements", "apparent_cec_cmol_kg_clay"),
+    "ec": ("salinity_alkalinity_requirements", "ece_ds_m"),
+    "esp": ("salinity_alkalinity_requirements", "esp_pct"),
+}
+
+
+def is_missing(value: Any) -> bool:
+    """None and NaN mean "not measured": the parameter is skipped, not rated."""
+    return value is None or value != value
+
+
 class RulesEngine:
     """
-    CORRECTED FORMULA: LSI = Rmin Ã— âˆš(product of ALL ratings) Ã— 100
+    CORRECTED FORMULA: LSI = Rmin × √(product of ALL ratings) × 100
     SEASONAL SUPPORT: Handles crops with different requirements per season
     """
     
-    def __init__(self):
-        self.crop_rules = CropRules()
-        logger.info("="*80)
-        logger.info("RulesEngine initialized - CORRECTED FORMULA VERSION + SEASONAL SUPPORT")
-        logger.info("Formula: LSI = Rmin Ã— âˆš(product of ALL ratings) Ã— 100")
-        logger.info("="*80)
+    def __init__(self, knowledge_base: Optional[KnowledgeBase] = None):
+        """
+        Args:
+            knowledge_base: Shared knowledge base. Defaults to the process-wide
+                instance from get_knowledge_base().
+        """
+        self.knowledge_base = knowledge_base or get_knowledge_base()
+        self.crop_rules = self.knowledge_base.crop_rules
+        self.compiled_rules = self.knowledge_base.compiled_rules
+        
+        # Largest rating any table can return; bounds the unrated parameters
+        # in evaluate_bounded (1.0 for every current requirement file)
+        tables = list(self.compiled_rules.tables.values())
+        tables += list(self.compiled_rules.slope_tables.values())
+        self.max_rating = max(
+            [1.0] + [max(t.spec_ratings, default=t.default_rating) for t in tables]
+            + [t.default_rating for t in tables]
+        )
+        logger.info("RulesEngine initialized (LSI = Rmin × √(product of ALL ratings) × 100)")
     
     def get_parameter_rating(
         self,
@@ -43,336 +80,243 @@ class RulesEngine:
         value: float,
         season: Optional[str] = None
     ) -> Tuple[float, str, str]:
-        """Get rating for a specific parameter value."""
-        
-        # Special handling for slope
-        if parameter == "slope_pct":
-            return self._get_slope_rating(crop_name, value)
-        
-        # âœ… FIXED: Pass season parameter to get_parameter_requirement
-        requirements = self.crop_rules.get_parameter_requirement(
-            crop_name, category, parameter, season=season
-        )
+        """Get rating for a specific parameter value (bisect over the compiled table)."""
+        table = self.compiled_rules.get_table(crop_name, category, parameter, season)
         
-        if not requirements:
+        if table is None:
             logger.warning(
-                f"âš ï¸  No requirements for {parameter} in {category}. "
-                f"Defaulting to S1 (1.0)"
+                "No requirements for %s in %s. Defaulting to S1 (1.0)", parameter, category
             )
             return (1.0, "S1", self._get_subclass_code(category))
         
-        subclass = self._get_subclass_code(category)
-        
-        # Check each classification level
-        for classification_key, spec in requirements.items():
-            if "range" in spec:
-                min_val, max_val = spec["range"]
-                if min_val is None:
-                    min_val = float('-inf')
-                if max_val is None:
-                    max_val = float('inf')
-                
-                if min_val <= value <= max_val:
-                    rating = spec["rating"]
-                    classification = self._get_classification_from_key(classification_key)
-                    logger.debug(
-                        f"  âœ“ {parameter} = {value} â†’ {classification} "
-                        f"(rating: {rating:.4f}, range: [{min_val}, {max_val}])"
-                    )
-                    return (rating, classification, subclass)
-            
-            elif "values" in spec:
-                value_str = str(value)
-                if value_str in spec["values"]:
-                    rating = spec["rating"]
-                    classification = self._get_classification_from_key(classification_key)
-                    logger.debug(
-                        f"  âœ“ {parameter} = '{value_str}' â†’ {classification} "
-                        f"(rating: {rating:.4f})"
-                    )
-                    return (rating, classification, subclass)
-        
-        logger.warning(
-            f"  âœ— No match for {parameter} = {value}. Defaulting to S1 (1.0)"
-        )
-        return (1.0, "S1", subclass)
-
-    def _get_slope_rating(self, crop_name: str, slope_value: float) -> Tuple[float, str, str]:
-            """Special handler for slope parameter - supports both level-based and direct structures."""
-            logger.debug(f"Evaluating slope = {slope_value}% for {crop_name}")
-            
-            crop_data = self.crop_rules.get_crop_requirements(crop_name)
-            if not crop_data:
-                logger.warning(f"No crop data found for {crop_name}")
-                return (0.25, "N", "t")
-            
-            topo_reqs = crop_data.get('topography_requirements', {})
-            slope_reqs = topo_reqs.get('slope_pct', {})
-            
-            if not slope_reqs:
-                logger.warning(f"No slope requirements found for {crop_name}")
-                return (0.25, "N", "t")
-            
-            # FIX: Try direct structure first (for Oil Palm, Banana, etc.)
-            # Check if slope_reqs has direct classification keys (S1_0, S2, etc.)
-            has_direct_structure = any(key.startswith(('S1', 'S2', 'S3', 'N')) for key in slope_reqs.keys())
-            
-            if has_direct_structure:
-                logger.debug(f"Using DIRECT slope structure for {crop_name}")
-                for classification_key, spec in slope_reqs.items():
-                    if "range" not in spec:
-                        continue
-                    
-                    min_val, max_val = spec["range"]
-                    if min_val is None:
-                        min_val = float('-inf')
-                    if max_val is None:
-                        max_val = float('inf')
-                    
-                    if min_val <= slope_value <= max_val:
-                        rating = spec["rating"]
-                        classification = self._get_classification_from_key(classification_key)
-                        logger.debug(
-                            f"  âœ“ slope = {slope_value}% â†’ {classification} "
-                            f"(rating: {rating:.4f}, range: [{min_val}, {max_val}])"
-                        )
-                        return (rating, classification, "t")
-            
-            # âœ… FALLBACK: Try level-based structure (for Coffee crops)
-            else:
-                logger.debug(f"Using LEVEL-BASED slope structure for {crop_name}")
-                level1 = slope_reqs.get('level1', {})
-                
-                if not level1:
-                    logger.warning(f"No level1 found in slope requirements for {crop_name}")
-                    return (0.25, "N", "t")
-                
-                for classification_key, spec in level1.items():
-                    if "range" not in spec:
-                        continue
-                    
-                    min_val, max_val = spec["range"]
-                    if min_val is None:
-                        min_val = float('-inf')
-                    if max_val is None:
-                        max_val = float('inf')
-                    
-                    if min_val <= slope_value <= max_val:
-                        rating = spec["rating"]
-                        classification = self._get_classification_from_key(classification_key)
-                        logger.debug(
-                            f"  âœ“ slope = {slope_value}% â†’ {classification} "
-                            f"(rating: {rating:.4f})"
-                        )
-                        return (rating, classification, "t")
-            
-            # No match found
-            logger.warning(f"No matching slope range found for {slope_value}%")
-            return (0.25, "N", "t")
-
+        return table.rate(value)
     
     def _get_classification_from_key(self, key: str) -> str:
         """Extract classification from key."""
-        if key.startswith("S1"):
-            return "S1"
-        elif key.startswith("S2"):
-            return "S2"
-        elif key.startswith("S3"):
-            return "S3"
-        elif key.startswith("N"):
-            return "N"
-        else:
-            return key
+        return classification_from_key(key)
     
     def _get_subclass_code(self, category: str) -> str:
         """Get subclass code based on category."""
-        mapping = {
-            "climate_requirements": "c",
-            "topography_requirements": "t",
-            "wetness_requirements": "w",
-            "physical_soil_requirements": "s",
-            "soil_fertility_requirements": "f",
-            "salinity_alkalinity_requirements": "n"
-        }
-        return mapping.get(category, "")
+        return SUBCLASS_CODES.get(category, "")
     
     def calculate_lsi(self, ratings: List[float]) -> float:
         """
         Calculate LSI using CORRECTED formula.
-        FORMULA: LSI = Rmin Ã— âˆš(product of ALL ratings) Ã— 100
+        FORMULA: LSI = Rmin × √(product of ALL ratings) × 100
         
         Example with Arabica Coffee:
         ratings = [0.95, 0.60, 0.85, 0.95, 1.0, 1.0, 0.25, ...]
         Rmin = 0.25
-        Product = 0.95 Ã— 0.60 Ã— ... Ã— 0.25 = 0.088272
-        âˆšProduct = 0.297106
-        LSI = 0.25 Ã— 0.297106 Ã— 100 = 7.43 âœ“
+        Product = 0.95 × 0.60 × ... × 0.25 = 0.088272
+        √Product = 0.297106
+        LSI = 0.25 × 0.297106 × 100 = 7.43 ✓
         """
-        logger.info("\n" + "="*80)
-        logger.info("CALCULATING LSI - CORRECTED FORMULA")
-        logger.info("="*80)
-        logger.info(f"Input ratings: {ratings}")
-        logger.info(f"Number of parameters: {len(ratings)}")
-        
         if not ratings:
-            logger.error("âŒ No ratings provided!")
+            logger.error("No ratings provided to calculate_lsi")
             return 0.0
         
-        # Step 1: Find Rmin
         rmin = min(ratings)
-        logger.info(f"\nðŸ“ Step 1: Find Rmin")
-        logger.info(f"   Rmin = {rmin:.4f}")
-        
-        # Step 2: Calculate product of ALL ratings
-        logger.info(f"\nðŸ“ Step 2: Calculate product of ALL ratings")
-        logger.info(f"   Including Rmin in the product calculation")
-        
-        # Show all non-1.0 ratings being multiplied
-        non_one = [r for r in ratings if r != 1.0]
-        logger.info(f"   Non-1.0 ratings: {non_one}")
-        
         product = math.prod(ratings)
-        logger.info(f"   Product = {product:.10f}")
-        
-        # Step 3: Square root
-        sqrt_product = math.sqrt(product)
-        logger.info(f"\nðŸ“ Step 3: Calculate square root")
-        logger.info(f"   âˆš({product:.10f}) = {sqrt_product:.10f}")
-        
-        # Step 4: Calculate LSI
-        logger.info(f"\nðŸ“ Step 4: Calculate LSI")
-        logger.info(f"   Formula: LSI = Rmin Ã— âˆš(product) Ã— 100")
-        logger.info(f"   LSI = {rmin:.4f} Ã— {sqrt_product:.10f} Ã— 100")
-        
-        lsi = rmin * sqrt_product * 100
-        lsi_rounded = round(lsi, 2)
-        
-        logger.info(f"   LSI = {lsi:.10f}")
-        logger.info(f"   LSI (rounded) = {lsi_rounded}")
-        
-        logger.info("\n" + "="*80)
-        logger.info(f"âœ… FINAL LSI = {lsi_rounded}")
-        logger.info("="*80 + "\n")
-        
-        return lsi_rounded
+        return round(rmin * math.sqrt(product) * 100, 2)
     
     def classify_lsi(self, lsi: float) -> str:
         """Classify LSI into suitability class."""
         if lsi >= 75:
-            classification = "S1"
+            return "S1"
         elif lsi >= 50:
-            classification = "S2"
+            return "S2"
         elif lsi >= 25:
-            classification = "S3"
-        else:
-            classification = "N"
-        
-        logger.info(f"ðŸ“Š Classification: LSI {lsi:.2f} â†’ {classification}")
-        return classification
+            return "S3"
+        return "N"
     
     def identify_limiting_factors(
         self,
         parameter_ratings: Dict[str, Tuple[float, str, str]]
     ) -> str:
-        """Identify limiting factors."""
-        logger.info("\n" + "="*80)
-        logger.info("IDENTIFYING LIMITING FACTORS")
-        logger.info("="*80)
-        
+        """Identify limiting factors (subclasses of every parameter rated at Rmin)."""
         if not parameter_ratings:
             return ""
         
         min_rating = min(r[0] for r in parameter_ratings.values())
-        logger.info(f"Minimum rating (Rmin): {min_rating:.4f}")
-        
-        limiting_subclasses = set()
         threshold = 0.001
         
-        logger.info(f"\nParameters with rating = {min_rating:.4f}:")
-        for param_name, (rating, classification, subclass) in parameter_ratings.items():
-            if abs(rating - min_rating) < threshold and subclass:
-                limiting_subclasses.add(subclass)
-                logger.info(
-                    f"  ðŸ”´ {param_name}: {rating:.4f} ({classification}, subclass: {subclass})"
-                )
-        
-        limiting_codes = "".join(sorted(limiting_subclasses))
-        logger.info(f"\nâš ï¸  Limiting factors: {limiting_codes if limiting_codes else 'None'}")
-        logger.info("="*80 + "\n")
-        
-        return limiting_codes
+        limiting_subclasses = {
+            subclass
+            for rating, _, subclass in parameter_ratings.values()
+            if subclass and abs(rating - min_rating) < threshold
+        }
+        return "".join(sorted(limiting_subclasses))
     
     def evaluate(
         self,
         crop_name: str,
         soil_data: Dict[str, float],
-        season: Optional[str] = None
+        season: Optional[str] = None,
+        explain: bool = False
     ) -> Dict:
-        """Evaluate crop suitability."""
-        logger.info("\n" + "="*100)
-        logger.info(f"ðŸŒ± EVALUATING: {crop_name}")
-        if season:
-            logger.info(f"ðŸ—“ï¸  SEASON: {season}")
-        logger.info("="*100)
-        logger.info(f"Input parameters: {len(soil_data)}")
+        """
+        Evaluate crop suitability.
+        
+        Args:
+            crop_name: Name of the crop
+            soil_data: Soil/climate values keyed like PARAMETER_MAPPING
+            season: Season key for seasonal crops
+            explain: Also attach an EvaluationTrace under the 'trace' key
+            
+        Returns:
+            Result dictionary (lsi, lsc, full_classification, limiting_factors,
+            parameter_ratings, season)
+        """
+        if explain:
+            return self._evaluate_explained(crop_name, soil_data, season)
         
+        compiled_rules = self.compiled_rules
         parameter_ratings = {}
         
-        parameter_mapping = {
-            "temperature": ("climate_requirements", "mean_annual_temp_c"),
-            "rainfall": ("climate_requirements", "annual_precipitation_mm"),
-            "humidity": ("climate_requirements", "mean_relative_humidity_driest_month_pct"),
-            "slope": ("topography_requirements", "slope_pct"),
-            "drainage": ("wetness_requirements", "drainage"),
-            "flooding": ("wetness_requirements", "flooding"),
-            "texture": ("physical_soil_requirements", "texture"),
-            "soil_depth": ("physical_soil_requirements", "soil_depth_cm"),
-            "coarse_fragments": ("physical_soil_requirements", "coarse_fragments_pct"),
-            "caco3": ("physical_soil_requirements", "caco3_pct"),
-            "gypsum": ("physical_soil_requirements", "gypsum_pct"),
-            "ph": ("soil_fertility_requirements", "ph_h2o"),
-            "organic_carbon": ("soil_fertility_requirements", "organic_carbon_pct"),
-            "base_saturation": ("soil_fertility_requirements", "base_saturation_pct"),
-            "sum_basic_cations": ("soil_fertility_requirements", "sum_basic_cations_cmol_kg"),
-            "cec": ("soil_fertility_requirements", "apparent_cec_cmol_kg_clay"),
-            "ec": ("salinity_alkalinity_requirements", "ece_ds_m"),
-            "esp": ("salinity_alkalinity_requirements", "esp_pct"),
-        }
+        for soil_key, value in soil_data.items():
+            mapping = PARAMETER_MAPPING.get(soil_key)
+            if mapping is None or is_missing(value):
+                continue
+            category, parameter = mapping
+            try:
+                parameter_ratings[soil_key] = compiled_rules.rate(
+                    crop_name, category, parameter, value, season
+                )
+            except Exception:
+                logger.error(
+                    "Error evaluating %s = %r for %s", soil_key, value, crop_name,
+                    exc_info=True
+                )
         
-        ratings_list = []
+        return self._build_result(crop_name, season, parameter_ratings)
+    
+    def evaluate_bounded(
+        self,
+        crop_name: str,
+        soil_data: Dict[str, float],
+        season: Optional[str] = None,
+        floor: float = 0.0
+    ) -> Optional[Dict[str, Tuple[float, str, str]]]:
+        """
+        Rate parameters until the LSI provably falls below ``floor``.
         
-        logger.info("\n" + "-"*100)
-        logger.info("PARAMETER EVALUATION")
-        logger.info("-"*100)
+        After each rated parameter the LSI is bounded by
+        Rmin_partial × √(product_partial × max_rating^remaining) × 100, which
+        never increases, so the crop can be abandoned as soon as the bound
+        drops below the floor.
         
-        for soil_key, value in soil_data.items():
-            if soil_key in parameter_mapping:
-                category, parameter = parameter_mapping[soil_key]
-                try:
-                    # âœ… FIXED: Pass season to get_parameter_rating
-                    rating, classification, subclass = self.get_parameter_rating(
-                        crop_name, category, parameter, value, season
-                    )
-                    
-                    parameter_ratings[soil_key] = (rating, classification, subclass)
-                    ratings_list.append(rating)
-                    
-                    logger.info(
-                        f"{soil_key:<25} = {str(value):<15} â†’ {classification:<8} "
-                        f"(rating: {rating:.4f}, subclass: {subclass})"
-                    )
-                except Exception as e:
-                    logger.error(f"âŒ Error evaluating {soil_key}: {e}", exc_info=True)
-                    continue
-            else:
-                logger.debug(f"âš ï¸  {soil_key} not mapped")
+        Returns:
+            Full parameter_ratings (as in evaluate) or None if pruned
+        """
+        compiled_rules = self.compiled_rules
+        items = [
+            (soil_key, value, PARAMETER_MAPPING[soil_key])
+            for soil_key, value in soil_data.items()
+            if soil_key in PARAMETER_MAPPING and not is_missing(value)
+        ]
+        parameter_ratings = {}
+        partial_min = math.inf
+        partial_product = 1.0
+        remaining = len(items)
+        
+        for soil_key, value, (category, parameter) in items:
+            remaining -= 1
+            try:
+                rated = compiled_rules.rate(crop_name, category, parameter, value, season)
+            except Exception:
+                logger.error(
+                    "Error evaluating %s = %r for %s", soil_key, value, crop_name,
+                    exc_info=True
+                )
+                continue
+            parameter_ratings[soil_key] = rated
+            partial_min = min(partial_min, rated[0])
+            partial_product *= rated[0]
+            
+            bound = partial_min * math.sqrt(
+                partial_product * self.max_rating ** remaining
+            ) * 100
+            if round(bound, 2) < floor:
+                return None
+        
+        return parameter_ratings
+    
+    def evaluate_all_seasons(
+        self,
+        crop_name: str,
+        soil_data: Dict[str, float]
+    ) -> Dict[Optional[str], Dict]:
+        """
+        Evaluate a crop in every season it has.
+        
+        Only climate_requirements differ between seasons, so every other
+        parameter is rated once and shared; climate parameters are rated
+        per season. Results are identical to calling evaluate() per season.
+        
+        Args:
+            crop_name: Name of the crop
+            soil_data: Soil/climate values keyed like PARAMETER_MAPPING
+            
+        Returns:
+            Result per season key, in the crop file's season order
+            ({None: result} for non-seasonal crops, {} for a seasonal crop
+            without season tables)
+        """
+        compiled_rules = self.compiled_rules
+        if not compiled_rules.seasonal.get(crop_name):
+            compiled_rules.validate_season(crop_name, None)  # raises for unknown crops
+            return {None: self.evaluate(crop_name, soil_data)}
+        
+        seasons = compiled_rules.seasons[crop_name]
+        if not seasons:
+            logger.warning("%s is seasonal but has no season tables", crop_name)
+            return {}
+        items = [
+            (soil_key, value, PARAMETER_MAPPING[soil_key])
+            for soil_key, value in soil_data.items()
+            if soil_key in PARAMETER_MAPPING and not is_missing(value)
+        ]
+        
+        def rate(soil_key, value, category, parameter, season):
+            try:
+                return compiled_rules.rate(crop_name, category, parameter, value, season)
+            except Exception:
+                logger.error(
+                    "Error evaluating %s = %r for %s", soil_key, value, crop_name,
+                    exc_info=True
+                )
+                return None
         
-        logger.info("-"*100)
-        logger.info(f"âœ… Evaluated {len(ratings_list)} parameters successfully")
-        logger.info(f"ðŸ“‹ Ratings list: {ratings_list}")
+        # Season-independent ratings (any valid season resolves the shared tables)
+        shared = {
+            soil_key: rate(soil_key, value, category, parameter, seasons[0])
+            for soil_key, value, (category, parameter) in items
+            if category != "climate_requirements"
+        }
         
-        if not ratings_list:
-            logger.error("âŒ No parameters evaluated!")
+        results = {}
+        for season in seasons:
+            parameter_ratings = {}
+            # Keep soil_data order so the rating product matches evaluate()
+            for soil_key, value, (category, parameter) in items:
+                if category == "climate_requirements":
+                    rated = rate(soil_key, value, category, parameter, season)
+                else:
+                    rated = shared[soil_key]
+                if rated is not None:
+                    parameter_ratings[soil_key] = rated
+            results[season] = self._build_result(crop_name, season, parameter_ratings)
+        return results
+    
+    def _build_result(
+        self,
+        crop_name: str,
+        season: Optional[str],
+        parameter_ratings: Dict[str, Tuple[float, str, str]]
+    ) -> Dict:
+        """Apply the Square Root Method to rated parameters."""
+        if not parameter_ratings:
+            logger.error("No parameters evaluated for %s", crop_name)
             return {
                 "crop_name": crop_name,
                 "lsi": 0.0,
@@ -383,33 +327,84 @@ class RulesEngine:
                 "season": season
             }
         
-        # Calculate LSI
-        lsi = self.calculate_lsi(ratings_list)
-        
-        # Classify
+        lsi = self.calculate_lsi([r[0] for r in parameter_ratings.values()])
         lsc = self.classify_lsi(lsi)
-        
-        # Limiting factors
         limiting_factors = self.identify_limiting_factors(parameter_ratings)
         
-        full_classification = f"{lsc}{limiting_factors}" if limiting_factors else lsc
-        
-        logger.info("\n" + "="*100)
-        logger.info("ðŸ“Š FINAL RESULTS")
-        logger.info("="*100)
-        logger.info(f"Crop: {crop_name}")
-        if season:
-            logger.info(f"Season: {season}")
-        logger.info(f"LSI: {lsi:.2f}")
-        logger.info(f"Classification: {full_classification}")
-        logger.info("="*100 + "\n")
-        
         return {
             "crop_name": crop_name,
             "lsi": lsi,
             "lsc": lsc,
-            "full_classification": full_classification,
+            "full_classification": f"{lsc}{limiting_factors}",
             "limiting_factors": limiting_factors,
             "parameter_ratings": parameter_ratings,
             "season": season
-        }
\ No newline at end of file
+        }
+    
+    def _evaluate_explained(
+        self,
+        crop_name: str,
+        soil_data: Dict[str, float],
+        season: Optional[str]
+    ) -> Dict:
+        """Slow path for evaluate(explain=True): records an EvaluationTrace."""
+        trace = EvaluationTrace(crop_name=crop_name, season=season)
+        parameter_ratings = {}
+        
+        for soil_key, value in soil_data.items():
+            mapping = PARAMETER_MAPPING.get(soil_key)
+            if mapping is None:
+                trace.unmapped.append(soil_key)
+                continue
+            if is_missing(value):
+                continue
+            category, parameter = mapping
+            entry = ParameterTrace(
+                parameter=soil_key,
+                category=category,
+                requirement=parameter,
+                value=value,
+                subclass=self._get_subclass_code(category),
+            )
+            trace.parameters.append(entry)
+            
+            table = self.compiled_rules.get_table(crop_name, category, parameter, season)
+            if table is None:
+                entry.rating, entry.classification = 1.0, "S1"
+                entry.default_used = True
+                parameter_ratings[soil_key] = (1.0, "S1", entry.subclass)
+                continue
+            
+            try:
+                index = table.match(value)
+            except Exception as e:
+                entry.error = f"{type(e).__name__}: {e}"
+                continue
+            
+            entry.subclass = table.subclass
+            if index < 0:
+                entry.rating, entry.classification = table.default_rating, table.default_class
+                entry.default_used = True
+            else:
+                entry.rating = table.spec_ratings[index]
+                entry.classification = table.spec_classes[index]
+                entry.matched_key = table.keys[index]
+                entry.matched_range = table.spec_ranges[index]
+                if entry.matched_range is None:
+                    entry.matched_values = [
+                        v for v, i in table.value_spec.items() if i == index
+                    ]
+            parameter_ratings[soil_key] = (entry.rating, entry.classification, entry.subclass)
+        
+        result = self._build_result(crop_name, season, parameter_ratings)
+        
+        if parameter_ratings:
+            ratings = [r[0] for r in parameter_ratings.values()]
+            trace.rmin = min(ratings)
+            trace.product = math.prod(ratings)
+        trace.lsi = result["lsi"]
+        trace.lsc = result["lsc"]
+        trace.limiting_factors = result["limiting_factors"]
+        
+        result["trace"] = trace
+        return result
@@ -0,0 +1,397 @@
+"""
+
+Sensitivity Analysis for SoilWise
+
+Which measurements actually move a crop's suitability? Two global
+methods, both run on the vectorized batch path (one evaluate_matrix call
+per analysis):
+
+    Morris screening  - elementary effects along random one-at-a-time
+                        trajectories; μ* ranks parameters cheaply
+                        (r × (k + 1) evaluations)
+    Sobol indices     - variance decomposition with the Saltelli/Jansen
+                        estimators; first-order and total effects
+                        (N × (k + 2) evaluations)
+
+Parameter ranges come from the stored soil_data_inputs history (5th-95th
+percentile of what has actually been measured in the field), falling
+back to DEFAULT_RANGES for parameters without enough history.
+
+Run:
+    python -m knowledge_base.sensitivity [--method morris|sobol] [--season ...]
+
+"""
+
+import argparse
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from database.db_manager import SOIL_DATA_COLUMNS
+from knowledge_base.registry import KnowledgeBase, get_knowledge_base
+from knowledge_base.rules_engine import PARAMETER_MAPPING, RulesEngine
+from knowledge_base.vectorized import evaluate_matrix
+
+logger = logging.getLogger(__name__)
+
+
+CATEGORICAL_PARAMETERS = ("texture", "drainage", "flooding")
+
+# Plausible ranges for Piagapo when the history has too few samples
+DEFAULT_RANGES: Dict[str, Tuple[float, float]] = {
+    "ph": (4.0, 8.0),
+    "temperature": (18.0, 32.0),
+    "rainfall": (1200.0, 3500.0),
+    "slope": (0.0, 30.0),
+    "soil_depth": (20.0, 150.0),
+    "organic_carbon": (0.3, 4.0),
+    "cec": (5.0, 40.0),
+    "base_saturation": (10.0, 90.0),
+}
+
+# Fewer distinct measured values than this and the default range is used
+MIN_HISTORY_VALUES = 5
+
+HISTORY_PERCENTILES = (5.0, 95.0)
+
+
+@dataclass
+class MorrisResult:
+    """Elementary-effect statistics per parameter (LSI points over the full range)."""
+
+    crop_name: str
+    season: Optional[str]
+    parameters: List[str]
+    ranges: Dict[str, Tuple[float, float]]
+    mu: Dict[str, float]
+    mu_star: Dict[str, float]
+    sigma: Dict[str, float]
+    n_evaluations: int
+
+    def ranking(self) -> List[Tuple[str, float]]:
+        """Parameters by μ* (overall influence), most influential first."""
+        return sorted(self.mu_star.items(), key=lambda item: item[1], reverse=True)
+
+
+@dataclass
+class SobolResult:
+    """First-order and total Sobol indices per parameter."""
+
+    crop_name: str
+    season: Optional[str]
+    parameters: List[str]
+    ranges: Dict[str, Tuple[float, float]]
+    first_order: Dict[str, float]
+    total_order: Dict[str, float]
+    variance: float
+    n_evaluations: int
+    notes: List[str] = field(default_factory=list)
+
+    def ranking(self) -> List[Tuple[str, float]]:
+        """Parameters by total effect, most influential first."""
+        return sorted(self.total_order.items(), key=lambda item: item[1], reverse=True)
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if number != number else number
+
+
+def history_ranges(
+    records: Iterable[Mapping[str, Any]],
+    percentiles: Tuple[float, float] = HISTORY_PERCENTILES,
+    min_values: int = MIN_HISTORY_VALUES,
+) -> Tuple[Dict[str, Tuple[float, float]], Dict[str, Any]]:
+    """
+    Derive parameter ranges and a typical sample from soil_data_inputs rows.
+
+    Args:
+        records: Rows of soil_data_inputs (dicts keyed by column name)
+        percentiles: Lower/upper percentile of measured values used as range
+        min_values: Minimum distinct values before a history range is trusted
+
+    Returns:
+        (ranges, base_soil): numeric ranges keyed by soil_data key, with
+        DEFAULT_RANGES filling the gaps, and the median/most common value
+        of every parameter seen in the history
+    """
+    values: Dict[str, List[Any]] = {key: [] for key in SOIL_DATA_COLUMNS}
+    for record in records:
+        for key, column in SOIL_DATA_COLUMNS.items():
+            value = record.get(column)
+            if key in CATEGORICAL_PARAMETERS:
+                if value:
+                    values[key].append(str(value).strip())
+            else:
+                number = _to_float(value)
+                if number is not None:
+                    values[key].append(number)
+
+    ranges = dict(DEFAULT_RANGES)
+    base_soil: Dict[str, Any] = {}
+    for key, seen in values.items():
+        if not seen:
+            continue
+        if key in CATEGORICAL_PARAMETERS:
+            base_soil[key] = max(set(seen), key=seen.count)
+            continue
+        array = np.asarray(seen, dtype=float)
+        base_soil[key] = float(np.median(array))
+        if len(np.unique(array)) >= min_values:
+            low, high = np.percentile(array, percentiles)
+            if high > low:
+                ranges[key] = (float(low), float(high))
+    return ranges, base_soil
+
+
+def load_history(db=None, limit: int = 5000) -> List[Dict]:
+    """Read recent soil_data_inputs rows (uses the app database by default)."""
+    if db is None:
+        from database.db_manager import get_database
+        db = get_database()
+    return db.get_recent_soil_inputs(limit)
+
+
+class SensitivityAnalyzer:
+    """
+    Global sensitivity of a crop's LSI to its input measurements.
+
+    Usage:
+        analyzer = SensitivityAnalyzer.from_history(load_history())
+        analyzer.morris("Banana").ranking()
+        analyzer.sobol("Tomato", season="may_august").total_order
+    """
+
+    def __init__(
+        self,
+        ranges: Optional[Mapping[str, Tuple[float, float]]] = None,
+        base_soil: Optional[Mapping[str, Any]] = None,
+        knowledge_base: Optional[KnowledgeBase] = None,
+    ) -> None:
+        """
+        Args:
+            ranges: (low, high) per numeric soil_data key to vary
+                (defaults to DEFAULT_RANGES)
+            base_soil: Values for parameters that are not varied
+                (texture, drainage, ...)
+            knowledge_base: Shared knowledge base (defaults to get_knowledge_base())
+
+        Raises:
+            ValueError: Unknown or categorical parameter, or an empty range
+        """
+        self.knowledge_base = knowledge_base or get_knowledge_base()
+        self.rules_engine = RulesEngine(self.knowledge_base)
+        self.compiled_rules = self.rules_engine.compiled_rules
+        self.ranges = dict(ranges if ranges is not None else DEFAULT_RANGES)
+        self.base_soil = dict(base_soil or {})
+
+        for key, (low, high) in self.ranges.items():
+            if key not in PARAMETER_MAPPING or key in CATEGORICAL_PARAMETERS:
+                raise ValueError(f"Cannot vary parameter '{key}'")
+            if not high > low:
+                raise ValueError(f"Empty range for '{key}': ({low}, {high})")
+
+    @classmethod
+    def from_history(
+        cls,
+        records: Iterable[Mapping[str, Any]],
+        knowledge_base: Optional[KnowledgeBase] = None,
+    ) -> "SensitivityAnalyzer":
+        """Analyzer whose ranges and fixed values come from soil_data_inputs rows."""
+        ranges, base_soil = history_ranges(records)
+        return cls(ranges, base_soil, knowledge_base)
+
+    def _parameters(self, crop_name: str, season: Optional[str]) -> List[str]:
+        """Varied parameters that have a rule table for this crop."""
+        parameters = []
+        for key in self.ranges:
+            category, requirement = PARAMETER_MAPPING[key]
+            if self.compiled_rules.get_table(crop_name, category, requirement, season):
+                parameters.append(key)
+        return parameters
+
+    def _evaluate(
+        self, crop_name: str, season: Optional[str], parameters: Sequence[str], unit: np.ndarray
+    ) -> np.ndarray:
+        """LSI for each row of unit-cube samples (columns follow parameters)."""
+        n_rows = len(unit)
+        columns: Dict[str, Any] = {
+            key: [value] * n_rows
+            for key, value in self.base_soil.items()
+            if key in PARAMETER_MAPPING and key not in parameters
+        }
+        for j, key in enumerate(parameters):
+            low, high = self.ranges[key]
+            columns[key] = low + unit[:, j] * (high - low)
+        return evaluate_matrix(self.compiled_rules, columns, [crop_name], season).lsi[:, 0]
+
+    def morris(
+        self,
+        crop_name: str,
+        season: Optional[str] = None,
+        trajectories: int = 50,
+        levels: int = 4,
+        seed: Optional[int] = None,
+    ) -> MorrisResult:
+        """
+        Morris elementary-effects screening.
+
+        Args:
+            crop_name: Crop to analyse
+            season: Season for seasonal crops
+            trajectories: Number of random one-at-a-time trajectories (r)
+            levels: Grid levels per parameter (p, even)
+            seed: Random seed for reproducible results
+
+        Returns:
+            MorrisResult with μ, μ* and σ per parameter
+        """
+        self.compiled_rules.validate_season(crop_name, season)
+        parameters = self._parameters(crop_name, season)
+        k = len(parameters)
+        rng = np.random.default_rng(seed)
+        delta = levels / (2.0 * (levels - 1))
+
+        # Each trajectory: a base point on the grid, then +Δ on one parameter
+        # at a time in random order -> (r, k + 1, k) points
+        base_levels = rng.integers(0, levels // 2, size=(trajectories, k)) / (levels - 1)
+        orders = np.argsort(rng.random((trajectories, k)), axis=1)
+        steps = np.zeros((trajectories, k + 1, k))
+        for step in range(1, k + 1):
+            steps[:, step] = steps[:, step - 1]
+            steps[np.arange(trajectories), step, orders[:, step - 1]] = delta
+        points = base_levels[:, None, :] + steps
+
+        lsi = self._evaluate(crop_name, season, parameters, points.reshape(-1, k))
+        lsi = lsi.reshape(trajectories, k + 1)
+        effects = np.empty((trajectories, k))
+        rows = np.arange(trajectories)
+        for step in range(1, k + 1):
+            effects[rows, orders[:, step - 1]] = (lsi[:, step] - lsi[:, step - 1]) / delta
+
+        return MorrisResult(
+            crop_name=crop_name,
+            season=season,
+            parameters=parameters,
+            ranges={key: self.ranges[key] for key in parameters},
+            mu={key: round(float(effects[:, j].mean()), 3) for j, key in enumerate(parameters)},
+            mu_star={key: round(float(np.abs(effects[:, j]).mean()), 3) for j, key in enumerate(parameters)},
+            sigma={key: round(float(effects[:, j].std()), 3) for j, key in enumerate(parameters)},
+            n_evaluations=trajectories * (k + 1),
+        )
+
+    def sobol(
+        self,
+        crop_name: str,
+        season: Optional[str] = None,
+        n_samples: int = 2048,
+        seed: Optional[int] = None,
+    ) -> SobolResult:
+        """
+        Sobol first-order and total indices (Saltelli 2010 / Jansen estimators).
+
+        Args:
+            crop_name: Crop to analyse
+            season: Season for seasonal crops
+            n_samples: Base sample size N (cost is N × (k + 2) evaluations)
+            seed: Random seed for reproducible results
+
+        Returns:
+            SobolResult; indices are 0 when the LSI does not vary at all
+        """
+        self.compiled_rules.validate_season(crop_name, season)
+        parameters = self._parameters(crop_name, season)
+        k = len(parameters)
+        rng = np.random.default_rng(seed)
+
+        a = rng.random((n_samples, k))
+        b = rng.random((n_samples, k))
+        ab = np.repeat(a[None, :, :], k, axis=0)
+        for j in range(k):
+            ab[j, :, j] = b[:, j]
+
+        lsi = self._evaluate(
+            crop_name, season, parameters, np.concatenate([a, b, ab.reshape(-1, k)])
+        )
+        f_a = lsi[:n_samples]
+        f_b = lsi[n_samples:2 * n_samples]
+        f_ab = lsi[2 * n_samples:].reshape(k, n_samples)
+
+        variance = float(np.var(np.concatenate([f_a, f_b])))
+        notes = []
+        if variance <= 0:
+            notes.append("LSI is constant over these ranges")
+            first = total = np.zeros(k)
+        else:
+            first = np.mean(f_b[None, :] * (f_ab - f_a[None, :]), axis=1) / variance
+            total = 0.5 * np.mean((f_a[None, :] - f_ab) ** 2, axis=1) / variance
+
+        return SobolResult(
+            crop_name=crop_name,
+            season=season,
+            parameters=parameters,
+            ranges={key: self.ranges[key] for key in parameters},
+            first_order={key: round(float(first[j]), 4) for j, key in enumerate(parameters)},
+            total_order={key: round(float(total[j]), 4) for j, key in enumerate(parameters)},
+            variance=round(variance, 4),
+            n_evaluations=n_samples * (k + 2),
+            notes=notes,
+        )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m knowledge_base.sensitivity",
+        description="Rank soil measurements by their influence on crop suitability.",
+    )
+    parser.add_argument("--method", choices=("morris", "sobol"), default="morris")
+    parser.add_argument("--crops", help="Comma-separated crop names (default: all)")
+    parser.add_argument("--season", help="Season for seasonal crops (skipped if omitted)")
+    parser.add_argument("--db", help="SQLite database path (default: app database)")
+    parser.add_argument("--samples", type=int, default=0,
+                        help="Trajectories (morris) or base sample size (sobol)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.getLogger("knowledge_base").setLevel(logging.WARNING)
+
+    db = None
+    if args.db:
+        from database.db_manager import DatabaseManager
+        db = DatabaseManager(args.db)
+    history = load_history(db)
+    analyzer = SensitivityAnalyzer.from_history(history)
+
+    compiled_rules = analyzer.compiled_rules
+    if args.crops:
+        crop_names = [name.strip() for name in args.crops.split(",") if name.strip()]
+    else:
+        crop_names = [
+            crop for crop in analyzer.knowledge_base.crop_names
+            if args.season or not compiled_rules.seasonal.get(crop)
+        ]
+
+    print(f"{len(history)} stored samples; ranges:")
+    for key, (low, high) in analyzer.ranges.items():
+        print(f"  {key:<16} {low:>9.2f} – {high:<9.2f}")
+
+    for crop_name in crop_names:
+        crop_season = args.season if compiled_rules.seasonal.get(crop_name) else None
+        if args.method == "morris":
+            result = analyzer.morris(crop_name, crop_season, args.samples or 50, seed=args.seed)
+            label = "μ*"
+        else:
+            result = analyzer.sobol(crop_name, crop_season, args.samples or 2048, seed=args.seed)
+            label = "ST"
+        print(f"\n{crop_name}" + (f" ({crop_season})" if crop_season else ""))
+        for key, value in result.ranking():
+            print(f"  {key:<16} {label} = {value:.3f}")
+
+
+if __name__ == "__main__":
+    main()
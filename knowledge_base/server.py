@@ -0,0 +1,415 @@
+"""
+
+Local Evaluation Server for SoilWise
+
+A small asyncio HTTP/JSON service around one warm SuitabilityEvaluator,
+so GIS scripts and the field tablet app can get suitability results
+without importing the PySide6 application. Standard library only; binds
+to localhost by default.
+
+Endpoints (JSON bodies, JSON responses):
+
+    POST /evaluate  {"soil_data": {...}, "crop": "Banana", "season": null,
+                     "detail": false}
+    POST /rank      {"soil_data": {...}, "k": 3, "season": null, "crops": null}
+    POST /sweep     {"soil_data": {...}, "crop": "Cocoa", "parameter": "ph",
+                     "values": [...]  or  "start": 4, "stop": 8, "num": 81}
+    GET  /stats     request counts, batch sizes and latency percentiles
+    GET  /health
+
+Concurrent /evaluate requests arriving within a short window (2 ms by
+default) are coalesced into one vectorized evaluate_matrix call per
+season. "detail": true bypasses batching and returns the full enriched
+result instead of the compact one. Numeric fields sent as strings
+("6.2") are converted once on arrival, so every endpoint rates the same
+payload the same way.
+
+Run:
+    python -m knowledge_base.server [--port 8765] [--window-ms 2]
+
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from knowledge_base.evaluation import SuitabilityEvaluator
+from knowledge_base.registry import get_knowledge_base
+from knowledge_base.vectorized import (
+    coerce_numeric_values, decode_limiting_factors, evaluate_matrix, numeric_soil_keys,
+    records_to_columns,
+)
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WINDOW_MS = 2.0
+DEFAULT_MAX_BATCH = 512
+
+# Latency samples kept per endpoint for the percentiles in /stats
+LATENCY_WINDOW = 10000
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+HTTP_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error",
+}
+
+
+class RequestError(Exception):
+    """Client error reported as an HTTP status with a JSON message."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+class MicroBatcher:
+    """Coalesces single evaluations into vectorized batches."""
+
+    def __init__(self, evaluator: SuitabilityEvaluator, window_ms: float, max_batch: int):
+        self.evaluator = evaluator
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self._pending: List[Tuple[Dict, str, Optional[str], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.batches = 0
+        self.items = 0
+        self.largest = 0
+
+    def submit(self, soil_data: Dict, crop_name: str, season: Optional[str]) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((soil_data, crop_name, season, future))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+        return future
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        self.batches += 1
+        self.items += len(pending)
+        self.largest = max(self.largest, len(pending))
+
+        groups: Dict[Optional[str], List[int]] = defaultdict(list)
+        for i, (_, _, season, _) in enumerate(pending):
+            groups[season].append(i)
+
+        for season, indices in groups.items():
+            crops = list(dict.fromkeys(pending[i][1] for i in indices))
+            try:
+                matrix = evaluate_matrix(
+                    self.evaluator.compiled_rules,
+                    records_to_columns(pending[i][0] for i in indices),
+                    crops,
+                    season,
+                )
+            except Exception as e:
+                for i in indices:
+                    if not pending[i][3].done():
+                        pending[i][3].set_exception(e)
+                continue
+
+            column = {crop: col for col, crop in enumerate(crops)}
+            for row, i in enumerate(indices):
+                _, crop_name, _, future = pending[i]
+                if future.done():
+                    continue
+                col = column[crop_name]
+                lsc = str(matrix.classes[row, col])
+                limiting = decode_limiting_factors(int(matrix.limiting_masks[row, col]))
+                future.set_result({
+                    "crop_name": crop_name,
+                    "season": season,
+                    "lsi": float(matrix.lsi[row, col]),
+                    "lsc": lsc,
+                    "full_classification": f"{lsc}{limiting}",
+                    "limiting_factors": limiting,
+                })
+
+
+class EvaluationServer:
+    """HTTP/1.1 JSON server (keep-alive supported) around one evaluator."""
+
+    def __init__(
+        self,
+        evaluator: Optional[SuitabilityEvaluator] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        window_ms: float = DEFAULT_WINDOW_MS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        self.evaluator = evaluator or SuitabilityEvaluator(get_knowledge_base())
+        self.host = host
+        self.port = port
+        self.batcher = MicroBatcher(self.evaluator, window_ms, max_batch)
+        self.numeric_keys = numeric_soil_keys(self.evaluator.compiled_rules)
+        self.latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.errors = 0
+        self.started_at = time.time()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._routes = {
+            ("POST", "/evaluate"): self.handle_evaluate,
+            ("POST", "/rank"): self.handle_rank,
+            ("POST", "/sweep"): self.handle_sweep,
+            ("GET", "/stats"): self.handle_stats,
+            ("GET", "/health"): self.handle_health,
+        }
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+
+    async def start(self) -> None:
+        """Start listening (port 0 picks a free port; see self.port)."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Evaluation server listening on http://{self.host}:{self.port}")
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+
+    # ------------------------------------------------------------------ #
+    # HTTP plumbing
+    # ------------------------------------------------------------------ #
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._send(writer, 400, {"error": "Malformed request line"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (
+                    headers.get("connection", "").lower() != "close"
+                    if version == "HTTP/1.1"
+                    else headers.get("connection", "").lower() == "keep-alive"
+                )
+                try:
+                    length = int(headers.get("content-length", "0") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._send(writer, 400, {"error": "Invalid Content-Length"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._send(writer, 413, {"error": "Request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self._dispatch(method, target.split("?", 1)[0], body)
+                await self._send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _send(self, writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool):
+        body = json.dumps(payload, default=_json_default).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        handler = self._routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self._routes):
+                return 405, {"error": f"{method} not allowed on {path}"}
+            return 404, {"error": f"Unknown endpoint {path}"}
+
+        started = time.perf_counter()
+        try:
+            request = json.loads(body) if body else {}
+            if not isinstance(request, dict):
+                raise RequestError("Request body must be a JSON object")
+            status, payload = 200, await handler(request)
+        except RequestError as e:
+            status, payload = e.status, {"error": str(e)}
+        except (ValueError, KeyError, TypeError) as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:
+            logger.error(f"Error handling {path}", exc_info=True)
+            status, payload = 500, {"error": str(e)}
+
+        if status != 200:
+            self.errors += 1
+        self.counts[path] += 1
+        self.latencies[path].append((time.perf_counter() - started) * 1000.0)
+        return status, payload
+
+    # ------------------------------------------------------------------ #
+    # Endpoints
+    # ------------------------------------------------------------------ #
+
+    def _soil_data(self, request: Dict) -> Dict:
+        soil_data = request.get("soil_data")
+        if not isinstance(soil_data, dict):
+            raise RequestError("'soil_data' must be an object")
+        return coerce_numeric_values(soil_data, self.numeric_keys)
+
+    def _crop_season(self, crop_name: Any, season: Optional[str]) -> Optional[str]:
+        """Season the crop is evaluated in; validates crop and season."""
+        if not isinstance(crop_name, str):
+            raise RequestError("'crop' must be a string")
+        compiled_rules = self.evaluator.compiled_rules
+        crop_season = season if compiled_rules.seasonal.get(crop_name) else None
+        compiled_rules.validate_season(crop_name, crop_season)
+        return crop_season
+
+    async def handle_evaluate(self, request: Dict) -> Dict:
+        soil_data = self._soil_data(request)
+        crop_name = request.get("crop")
+        season = self._crop_season(crop_name, request.get("season"))
+        if request.get("detail"):
+            result = self.evaluator.evaluate_suitability(soil_data, crop_name, season)
+            result.pop("trace", None)
+            return result
+        return await self.batcher.submit(soil_data, crop_name, season)
+
+    async def handle_rank(self, request: Dict) -> Dict:
+        soil_data = self._soil_data(request)
+        k = int(request.get("k", 3))
+        results = self.evaluator.top_k_crops(
+            soil_data, k, request.get("season"), request.get("crops")
+        )
+        return {"results": results}
+
+    async def handle_sweep(self, request: Dict) -> Dict:
+        soil_data = self._soil_data(request)
+        crop_name = request.get("crop")
+        season = self._crop_season(crop_name, request.get("season"))
+        parameter = request.get("parameter")
+        values = request.get("values")
+        if values is None:
+            try:
+                values = np.linspace(
+                    float(request["start"]), float(request["stop"]), int(request.get("num", 50))
+                )
+            except KeyError:
+                raise RequestError("Give either 'values' or 'start' and 'stop'")
+        result = self.evaluator.sweep(crop_name, soil_data, parameter, values, season)
+        return {
+            "crop_name": result.crop_name,
+            "parameter": result.parameter,
+            "season": result.season,
+            "values": result.values,
+            "lsi": result.lsi,
+            "classes": result.classes,
+            "limiting_factors": [
+                result.limiting_factors(i) for i in range(len(result.lsi))
+            ],
+            "breakpoints": result.breakpoints,
+        }
+
+    async def handle_stats(self, request: Dict) -> Dict:
+        return self.stats()
+
+    async def handle_health(self, request: Dict) -> Dict:
+        return {"status": "ok", "kb_version": self.evaluator.knowledge_base.version}
+
+    def stats(self) -> Dict:
+        """Request counts, batching and latency percentiles (ms) per endpoint."""
+        endpoints = {}
+        for path, samples in self.latencies.items():
+            data = np.fromiter(samples, dtype=float)
+            p50, p90, p99 = np.percentile(data, [50, 90, 99]) if len(data) else (0, 0, 0)
+            endpoints[path] = {
+                "requests": self.counts[path],
+                "p50_ms": round(float(p50), 3),
+                "p90_ms": round(float(p90), 3),
+                "p99_ms": round(float(p99), 3),
+                "max_ms": round(float(data.max()), 3) if len(data) else 0.0,
+            }
+        batcher = self.batcher
+        return {
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "errors": self.errors,
+            "endpoints": endpoints,
+            "batching": {
+                "batches": batcher.batches,
+                "evaluations": batcher.items,
+                "mean_batch_size": round(batcher.items / batcher.batches, 2) if batcher.batches else 0,
+                "largest_batch": batcher.largest,
+            },
+        }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m knowledge_base.server",
+        description="Serve crop suitability evaluations over HTTP/JSON on localhost.",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--window-ms", type=float, default=DEFAULT_WINDOW_MS,
+                        help="How long /evaluate requests wait to be batched")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    args = parser.parse_args(argv)
+
+    logging.getLogger("knowledge_base").setLevel(logging.WARNING)
+    logger.setLevel(logging.INFO)
+
+    server = EvaluationServer(
+        host=args.host, port=args.port, window_ms=args.window_ms, max_batch=args.max_batch
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
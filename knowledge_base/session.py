@@ -0,0 +1,178 @@
+"""
+
+Incremental Evaluation Session for SoilWise
+
+Keeps the per-parameter rating vector of every crop under evaluation so a
+"what if" edit to one soil parameter only re-rates that parameter: one
+table lookup per crop instead of a full evaluation.
+
+Results are then built from the stored ratings by RulesEngine itself,
+with math.prod over the ratings in soil_data order, which is the order
+RulesEngine.evaluate multiplies them in. A maintained log-sum would be
+O(1) per edit but exp(Σ log rᵢ) does not round like the product, and
+the 2-decimal LSI can differ by 0.01; with at most ~18 parameters the
+product is cheap enough to recompute.
+
+"""
+
+import logging
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from knowledge_base.registry import KnowledgeBase, get_knowledge_base
+from knowledge_base.rules_engine import PARAMETER_MAPPING, RulesEngine, is_missing
+
+logger = logging.getLogger(__name__)
+
+
+class _CropState:
+    """Rating vector for one crop."""
+
+    __slots__ = ("crop_name", "season", "ratings")
+
+    def __init__(self, crop_name: str, season: Optional[str]) -> None:
+        self.crop_name = crop_name
+        self.season = season
+        self.ratings: Dict[str, Tuple[float, str, str]] = {}
+
+    def set(self, soil_key: str, rated: Optional[Tuple[float, str, str]]) -> None:
+        """Replace (or drop, when rated is None) one parameter's rating."""
+        if rated is None:
+            self.ratings.pop(soil_key, None)
+        else:
+            self.ratings[soil_key] = rated
+
+
+class EvaluationSession:
+    """
+    Live suitability results for a set of crops over one editable soil sample.
+
+    Usage:
+        session = EvaluationSession(["Banana", "Cocoa"], soil_data)
+        session.update("ph", 6.5)       # re-rates pH only
+        session.result("Banana")["lsi"]
+
+    Results have the same shape as RulesEngine.evaluate. The season is
+    applied to seasonal crops only (non-seasonal crops report season None),
+    matching the crop comparison page.
+    """
+
+    def __init__(
+        self,
+        crop_names: Iterable[str],
+        soil_data: Optional[Mapping[str, Any]] = None,
+        season: Optional[str] = None,
+        knowledge_base: Optional[KnowledgeBase] = None,
+    ) -> None:
+        """
+        Args:
+            crop_names: Crops to keep up to date
+            soil_data: Initial soil/climate values keyed like PARAMETER_MAPPING
+            season: Season key used for seasonal crops
+            knowledge_base: Shared knowledge base (defaults to get_knowledge_base())
+
+        Raises:
+            ValueError: Unknown crop, or missing/invalid season for a seasonal crop
+        """
+        self.knowledge_base = knowledge_base or get_knowledge_base()
+        self.compiled_rules = self.knowledge_base.compiled_rules
+        self.rules_engine = RulesEngine(self.knowledge_base)
+        self.season = season
+        self.soil_data: Dict[str, Any] = {}
+        self._crops: Dict[str, _CropState] = {}
+
+        for crop_name in crop_names:
+            self.add_crop(crop_name)
+        if soil_data:
+            self.update_many(soil_data)
+
+    @property
+    def crop_names(self):
+        return list(self._crops)
+
+    def _crop_season(self, crop_name: str) -> Optional[str]:
+        return self.season if self.compiled_rules.seasonal.get(crop_name) else None
+
+    def _rate(self, state: _CropState, soil_key: str, value: Any) -> Optional[Tuple[float, str, str]]:
+        """Rate one parameter, or None if it is unmapped, missing or unratable."""
+        mapping = PARAMETER_MAPPING.get(soil_key)
+        if mapping is None or is_missing(value):
+            return None
+        category, parameter = mapping
+        try:
+            return self.compiled_rules.rate(
+                state.crop_name, category, parameter, value, state.season
+            )
+        except Exception:
+            logger.error(
+                "Error evaluating %s = %r for %s", soil_key, value, state.crop_name,
+                exc_info=True
+            )
+            return None
+
+    def add_crop(self, crop_name: str) -> None:
+        """Start tracking a crop, rating every current soil value for it."""
+        season = self._crop_season(crop_name)
+        self.compiled_rules.validate_season(crop_name, season)
+        state = _CropState(crop_name, season)
+        for soil_key, value in self.soil_data.items():
+            rated = self._rate(state, soil_key, value)
+            if rated is not None:
+                state.ratings[soil_key] = rated
+        self._crops[crop_name] = state
+
+    def remove_crop(self, crop_name: str) -> None:
+        self._crops.pop(crop_name, None)
+
+    def set_season(self, season: Optional[str]) -> None:
+        """Change the season; only seasonal crops are re-rated."""
+        if season == self.season:
+            return
+        self.season = season
+        for crop_name, state in list(self._crops.items()):
+            if self.compiled_rules.seasonal.get(crop_name):
+                self.add_crop(crop_name)
+
+    def update(self, soil_key: str, value: Any) -> None:
+        """Change one soil parameter (None clears it) and re-rate it for every crop."""
+        if value is None:
+            self.soil_data.pop(soil_key, None)
+        else:
+            self.soil_data[soil_key] = value
+
+        if soil_key in PARAMETER_MAPPING:
+            for state in self._crops.values():
+                state.set(soil_key, self._rate(state, soil_key, value))
+
+    def update_many(self, changes: Mapping[str, Any]) -> None:
+        """Apply several parameter changes."""
+        for soil_key, value in changes.items():
+            self.update(soil_key, value)
+
+    def _ordered_ratings(self, state: _CropState) -> Dict[str, Tuple[float, str, str]]:
+        """Ratings in soil_data order, the order RulesEngine.evaluate multiplies them in."""
+        ratings = state.ratings
+        return {soil_key: ratings[soil_key] for soil_key in self.soil_data if soil_key in ratings}
+
+    def lsi(self, crop_name: str) -> float:
+        """Current LSI for one crop (cheaper than building the full result)."""
+        ratings = self._ordered_ratings(self._crops[crop_name])
+        if not ratings:
+            return 0.0
+        return self.rules_engine.calculate_lsi([rated[0] for rated in ratings.values()])
+
+    def result(self, crop_name: str) -> Dict:
+        """Current result for one crop (same shape as RulesEngine.evaluate)."""
+        state = self._crops[crop_name]
+        return self.rules_engine._build_result(
+            crop_name, state.season, self._ordered_ratings(state)
+        )
+
+    def results(self) -> Dict[str, Dict]:
+        """Current results for every tracked crop."""
+        return {crop_name: self.result(crop_name) for crop_name in self._crops}
+
+    def __repr__(self):
+        return (
+            f"EvaluationSession(crops={len(self._crops)}, "
+            f"parameters={len(self.soil_data)}, season={self.season!r})"
+        )
@@ -0,0 +1,182 @@
+"""
+
+Persistent Knowledge Base Snapshot for SoilWise
+
+Caches the parsed crop requirements and their compiled rule tables in a
+pickle file next to data/crop_requirements. Every source JSON file is
+identified by the SHA-256 of its bytes; on start-up only files whose hash
+changed are re-parsed, and when nothing changed the compiled tables are
+loaded directly from the snapshot.
+
+The combined hash of all source files is the knowledge-base version. It
+changes whenever any rule file is edited, added or removed, so result
+caches can key on it.
+
+Snapshots also record a fingerprint of the modules that define the
+pickled objects (crop_rules.py, compiled_rules.py and registry.py).
+Editing any of them discards the snapshot, so a change to the compile step never
+serves stale CompiledRules.
+
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from knowledge_base.crop_rules import CropRules
+from knowledge_base.compiled_rules import CompiledRules
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when the snapshot dict itself changes shape; edits to the pickled
+# classes are caught by code_fingerprint()
+SNAPSHOT_FORMAT = 2
+
+SNAPSHOT_SUFFIX = ".snapshot.pkl"
+
+# Modules defining the classes stored in the pickle (CropRules,
+# CompiledRules/CompiledTable, FrozenDict)
+SNAPSHOT_MODULES = ("crop_rules.py", "compiled_rules.py", "registry.py")
+
+
+def default_snapshot_path(data_dir: Path) -> Path:
+    """Snapshot lives next to the data directory: data/crop_requirements.snapshot.pkl"""
+    return data_dir.parent / f"{data_dir.name}{SNAPSHOT_SUFFIX}"
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's bytes."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def code_fingerprint() -> str:
+    """Short hash of the modules whose objects are pickled into the snapshot."""
+    package_dir = Path(__file__).parent
+    digest = hashlib.sha256()
+    for name in SNAPSHOT_MODULES:
+        digest.update(hash_file(package_dir / name).encode("ascii"))
+    return digest.hexdigest()[:16]
+
+
+def compute_kb_version(file_hashes: Dict[str, str]) -> str:
+    """Knowledge-base version: short hash over every (file name, file hash) pair."""
+    digest = hashlib.sha256()
+    for name in sorted(file_hashes):
+        digest.update(name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(file_hashes[name].encode("ascii"))
+        digest.update(b"\n")
+    return digest.hexdigest()[:16]
+
+
+def read_snapshot(path: Path) -> Optional[Dict[str, Any]]:
+    """Load a snapshot, or None if it is missing, unreadable or outdated."""
+    if not path.exists():
+        return None
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable knowledge base snapshot {path}: {e}")
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get("format") != SNAPSHOT_FORMAT:
+        logger.info(f"Knowledge base snapshot {path.name} has an old format; rebuilding")
+        return None
+    if snapshot.get("code") != code_fingerprint():
+        logger.info(f"Knowledge base snapshot {path.name} was built by other code; rebuilding")
+        return None
+    return snapshot
+
+
+def write_snapshot(path: Path, snapshot: Dict[str, Any]) -> bool:
+    """Atomically write a snapshot. Returns False if the location is not writable."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        logger.warning(f"Could not write knowledge base snapshot {path}: {e}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def load_rules(
+    data_dir: Optional[Path] = None,
+    snapshot_path: Optional[Path] = None,
+    use_snapshot: bool = True,
+    freeze=None,
+) -> Tuple[CropRules, CompiledRules, str]:
+    """
+    Load crop rules and compiled tables, reusing the snapshot where possible.
+
+    Args:
+        data_dir: Override for data/crop_requirements
+        snapshot_path: Override for the snapshot file location
+        use_snapshot: If False, always parse every file and do not write a snapshot
+        freeze: Optional callable applied to each parsed file and to the final
+            requirements mapping (the registry uses it to make them read-only)
+
+    Returns:
+        (crop_rules, compiled_rules, kb_version)
+    """
+    loader = CropRules(crop_requirements={}, data_dir=data_dir)
+    data_dir = loader._get_data_dir()
+    snapshot_path = Path(snapshot_path) if snapshot_path else default_snapshot_path(data_dir)
+
+    json_files = loader._list_crop_files()
+    file_hashes = {json_file.name: hash_file(json_file) for json_file in json_files}
+    version = compute_kb_version(file_hashes)
+
+    snapshot = read_snapshot(snapshot_path) if use_snapshot else None
+    if snapshot is not None and snapshot.get("version") == version:
+        logger.info(f"Loaded knowledge base {version} from snapshot {snapshot_path.name}")
+        return snapshot["crop_rules"], snapshot["compiled_rules"], version
+
+    cached_files = snapshot.get("files", {}) if snapshot is not None else {}
+    files: Dict[str, Dict[str, Any]] = {}
+    reparsed = 0
+
+    for json_file in json_files:
+        cached = cached_files.get(json_file.name)
+        if cached is not None and cached["sha256"] == file_hashes[json_file.name]:
+            crop_data = cached["crop_data"]
+        else:
+            crop_data = loader._read_crop_file(json_file)
+            reparsed += 1
+        if crop_data is not None and freeze is not None:
+            crop_data = freeze(crop_data)
+        files[json_file.name] = {"sha256": file_hashes[json_file.name], "crop_data": crop_data}
+        if crop_data is not None:
+            loader._add_crop(crop_data, json_file.name)
+
+    if freeze is not None:
+        loader.crop_requirements = freeze(loader.crop_requirements)
+    compiled_rules = CompiledRules(loader)
+
+    logger.info(
+        f"Built knowledge base {version}: re-parsed {reparsed}/{len(json_files)} files"
+    )
+
+    if use_snapshot:
+        write_snapshot(snapshot_path, {
+            "format": SNAPSHOT_FORMAT,
+            "code": code_fingerprint(),
+            "version": version,
+            "files": files,
+            "crop_rules": loader,
+            "compiled_rules": compiled_rules,
+        })
+
+    return loader, compiled_rules, version
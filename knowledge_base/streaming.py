@@ -0,0 +1,130 @@
+"""
+
+Streaming Evaluation for SoilWise
+
+Evaluates an unbounded iterator of soil records (a 1M-row survey file
+read line by line, a database cursor, ...) and yields one small result
+per (record, crop) as soon as it is ready. Nothing is accumulated, so
+memory stays constant no matter how long the stream is.
+
+With batch_size > 0, records are buffered into micro-batches and rated
+with the vectorized path (evaluate_matrix); only one batch is held at a
+time. Both paths produce identical results: the scalar path coerces
+numeric strings ("6.2") like the vectorized columns do, and each batch is
+rated in groups of records sharing a key order, so every product is
+multiplied in the record's own order as in RulesEngine.evaluate.
+
+"""
+
+import itertools
+import logging
+from typing import Any, Iterable, Iterator, Mapping, NamedTuple, Optional, Sequence
+
+from knowledge_base.rules_engine import RulesEngine
+from knowledge_base.vectorized import (
+    coerce_numeric_values, decode_limiting_factors, evaluate_matrix, numeric_soil_keys,
+    records_to_columns,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CompactResult(NamedTuple):
+    """Suitability of one record for one crop (no per-parameter details)."""
+
+    index: int                 # position of the record in the input stream
+    crop_name: str
+    season: Optional[str]
+    lsi: float
+    lsc: str
+    limiting_factors: str
+
+    @property
+    def full_classification(self) -> str:
+        return f"{self.lsc}{self.limiting_factors}"
+
+
+def iter_evaluate(
+    rules_engine: RulesEngine,
+    records: Iterable[Mapping[str, Any]],
+    crop_names: Sequence[str],
+    season: Optional[str] = None,
+    batch_size: int = 0,
+) -> Iterator[CompactResult]:
+    """
+    Evaluate a stream of soil records lazily.
+
+    Args:
+        rules_engine: Engine whose compiled rules are used
+        records: Iterable of soil_data dicts (consumed one at a time)
+        crop_names: Crops to evaluate for every record
+        season: Season applied to seasonal crops (non-seasonal crops report None)
+        batch_size: If > 0, rate this many records at a time with the
+            vectorized path; 0 evaluates record by record
+
+    Yields:
+        CompactResult per (record, crop), in record order then crop order
+
+    Raises:
+        ValueError: Unknown crop, or a seasonal crop without a valid season
+            (raised before any record is consumed)
+    """
+    compiled_rules = rules_engine.compiled_rules
+    crop_names = list(crop_names)
+    crop_seasons = [
+        season if compiled_rules.seasonal.get(crop_name) else None
+        for crop_name in crop_names
+    ]
+    for crop_name, crop_season in zip(crop_names, crop_seasons):
+        compiled_rules.validate_season(crop_name, crop_season)
+
+    if batch_size <= 0:
+        return _iter_scalar(rules_engine, records, crop_names, crop_seasons)
+    return _iter_batched(rules_engine, records, crop_names, crop_seasons, season, batch_size)
+
+
+def _iter_scalar(rules_engine, records, crop_names, crop_seasons) -> Iterator[CompactResult]:
+    numeric_keys = numeric_soil_keys(rules_engine.compiled_rules)
+    for index, record in enumerate(records):
+        record = coerce_numeric_values(record, numeric_keys)
+        for crop_name, crop_season in zip(crop_names, crop_seasons):
+            result = rules_engine.evaluate(crop_name, record, crop_season)
+            yield CompactResult(
+                index, crop_name, crop_season,
+                result["lsi"], result["lsc"], result["limiting_factors"],
+            )
+
+
+def _iter_batched(
+    rules_engine, records, crop_names, crop_seasons, season, batch_size
+) -> Iterator[CompactResult]:
+    iterator = iter(records)
+    offset = 0
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        # evaluate_matrix multiplies in column order, so rate each key order separately
+        groups = {}
+        for row, record in enumerate(batch):
+            groups.setdefault(tuple(record), []).append(row)
+        cells = [None] * len(batch)
+        for rows in groups.values():
+            matrix = evaluate_matrix(
+                rules_engine.compiled_rules,
+                records_to_columns(batch[row] for row in rows),
+                crop_names,
+                season,
+            )
+            for row, lsi, classes, masks in zip(
+                rows, matrix.lsi.tolist(), matrix.classes.tolist(),
+                matrix.limiting_masks.tolist(),
+            ):
+                cells[row] = (lsi, classes, masks)
+        for row, (lsi, classes, masks) in enumerate(cells):
+            for col, (crop_name, crop_season) in enumerate(zip(crop_names, crop_seasons)):
+                yield CompactResult(
+                    offset + row, crop_name, crop_season,
+                    lsi[col], classes[col], decode_limiting_factors(masks[col]),
+                )
+        offset += len(batch)
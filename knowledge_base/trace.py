@@ -0,0 +1,89 @@
+"""
+
+Evaluation Trace for SoilWise
+
+Structured record of how RulesEngine.evaluate arrived at a result:
+which compiled range each parameter matched, its rating and class, and
+the intermediate values of the Square Root Method. Produced only when
+evaluate(..., explain=True) is requested, so the default path does no
+per-parameter bookkeeping or log formatting.
+
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class ParameterTrace:
+    """How a single soil parameter was rated."""
+
+    parameter: str                          # soil_data key (e.g. 'ph')
+    category: str                           # requirement category
+    requirement: str                        # parameter key in the crop JSON
+    value: Any
+    rating: Optional[float] = None
+    classification: Optional[str] = None
+    subclass: str = ""
+    matched_key: Optional[str] = None       # e.g. 'S1_high'; None if defaulted
+    matched_range: Optional[Tuple[float, float]] = None
+    matched_values: Optional[List[str]] = None
+    default_used: bool = False
+    error: Optional[str] = None             # set when the value could not be rated
+
+
+@dataclass
+class EvaluationTrace:
+    """Step-by-step explanation of one crop evaluation."""
+
+    crop_name: str
+    season: Optional[str] = None
+    parameters: List[ParameterTrace] = field(default_factory=list)
+    unmapped: List[str] = field(default_factory=list)
+    rmin: Optional[float] = None
+    product: Optional[float] = None
+    lsi: float = 0.0
+    lsc: str = "N"
+    limiting_factors: str = ""
+
+    def get(self, parameter: str) -> Optional[ParameterTrace]:
+        """Get the trace entry for a soil_data key."""
+        for entry in self.parameters:
+            if entry.parameter == parameter:
+                return entry
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable representation."""
+        return asdict(self)
+
+    def format(self) -> str:
+        """Human-readable report, equivalent to the old verbose log output."""
+        lines = [f"EVALUATING: {self.crop_name}"]
+        if self.season:
+            lines.append(f"SEASON: {self.season}")
+
+        for entry in self.parameters:
+            if entry.error:
+                lines.append(f"  {entry.parameter:<25} = {entry.value!s:<15} ERROR: {entry.error}")
+                continue
+            if entry.matched_range is not None:
+                matched = f"{entry.matched_key} [{entry.matched_range[0]}, {entry.matched_range[1]}]"
+            elif entry.matched_key:
+                matched = entry.matched_key
+            else:
+                matched = "default"
+            lines.append(
+                f"  {entry.parameter:<25} = {entry.value!s:<15} -> {entry.classification:<3} "
+                f"(rating: {entry.rating:.4f}, subclass: {entry.subclass}, match: {matched})"
+            )
+
+        if self.unmapped:
+            lines.append(f"  Not mapped: {', '.join(self.unmapped)}")
+        if self.rmin is not None:
+            lines.append(f"Rmin = {self.rmin:.4f}, product = {self.product:.10f}")
+        lines.append(
+            f"LSI = {self.lsi:.2f} -> {self.lsc}"
+            f"{self.limiting_factors} (limiting: {self.limiting_factors or 'None'})"
+        )
+        return "\n".join(lines)
@@ -0,0 +1,254 @@
+"""
+
+Measurement Uncertainty for SoilWise
+
+Lab values carry measurement error, and a sample sitting on a rule-table
+boundary can change class on noise alone. This module propagates
+per-parameter error distributions through the Square Root Method by
+Monte Carlo: thousands of perturbed copies of the sample are drawn and
+rated in one vectorized evaluate_matrix call.
+
+The result gives class probabilities, an LSI confidence interval and, for
+every perturbed parameter, the share of LSI variance it explains on its
+own (correlation ratio of LSI over that parameter's rating) plus how
+often its rating differs from the measured value's rating.
+
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from knowledge_base.compiled_rules import CompiledRules
+from knowledge_base.rules_engine import PARAMETER_MAPPING, is_missing
+from knowledge_base.vectorized import LSI_CLASSES, evaluate_matrix, rate_column
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_DRAWS = 2000
+DEFAULT_CONFIDENCE = 0.90
+
+DISTRIBUTIONS = ("normal", "uniform")
+
+
+@dataclass(frozen=True)
+class MeasurementError:
+    """
+    Error model for one measured parameter.
+
+    The spread is ``sd + relative × |value|``: a standard deviation for
+    'normal', a half-width for 'uniform'. Draws are clipped to
+    [low, high]; the default low of 0 keeps concentrations non-negative.
+    """
+
+    sd: float = 0.0
+    relative: float = 0.0
+    distribution: str = "normal"
+    low: Optional[float] = 0.0
+    high: Optional[float] = None
+
+    def spread(self, value: float) -> float:
+        return self.sd + self.relative * abs(value)
+
+    def sample(self, value: float, size: int, rng: np.random.Generator) -> np.ndarray:
+        """Draw ``size`` perturbed values around ``value``."""
+        spread = self.spread(value)
+        if self.distribution == "normal":
+            draws = rng.normal(value, spread, size) if spread > 0 else np.full(size, value)
+        elif self.distribution == "uniform":
+            draws = rng.uniform(value - spread, value + spread, size)
+        else:
+            raise ValueError(
+                f"Unknown distribution '{self.distribution}'. "
+                f"Use one of: {', '.join(DISTRIBUTIONS)}"
+            )
+        if self.low is not None or self.high is not None:
+            draws = np.clip(draws, self.low, self.high)
+        return draws
+
+
+# Typical laboratory / field repeatability for the numeric parameters
+DEFAULT_MEASUREMENT_ERRORS: Dict[str, MeasurementError] = {
+    "ph": MeasurementError(sd=0.15),
+    "organic_carbon": MeasurementError(relative=0.10),
+    "base_saturation": MeasurementError(relative=0.10, high=100.0),
+    "sum_basic_cations": MeasurementError(relative=0.10),
+    "cec": MeasurementError(relative=0.10),
+    "ec": MeasurementError(relative=0.10),
+    "esp": MeasurementError(relative=0.10, high=100.0),
+    "caco3": MeasurementError(relative=0.10, high=100.0),
+    "gypsum": MeasurementError(relative=0.10, high=100.0),
+    "coarse_fragments": MeasurementError(sd=2.0, high=100.0),
+    "soil_depth": MeasurementError(sd=5.0),
+    "slope": MeasurementError(sd=1.0),
+}
+
+ErrorSpec = Union[MeasurementError, float, Mapping[str, Any]]
+
+
+def _as_error(spec: ErrorSpec) -> MeasurementError:
+    """Accept a MeasurementError, a bare standard deviation or a dict of fields."""
+    if isinstance(spec, MeasurementError):
+        return spec
+    if isinstance(spec, (int, float)):
+        return MeasurementError(sd=float(spec))
+    if isinstance(spec, Mapping):
+        return MeasurementError(**spec)
+    raise TypeError(f"Cannot interpret measurement error {spec!r}")
+
+
+@dataclass
+class UncertaintyResult:
+    """Monte Carlo summary of one crop evaluation under measurement error."""
+
+    crop_name: str
+    season: Optional[str]
+    n_draws: int
+    confidence: float
+    nominal_lsi: float
+    nominal_class: str
+    mean_lsi: float
+    std_lsi: float
+    lsi_interval: Tuple[float, float]
+    class_probabilities: Dict[str, float]
+    variance_drivers: List[Tuple[str, float]] = field(default_factory=list)
+    rating_flip_rates: Dict[str, float] = field(default_factory=dict)
+    lsi_draws: Optional[np.ndarray] = field(default=None, repr=False)
+
+    @property
+    def most_likely_class(self) -> str:
+        return max(self.class_probabilities, key=self.class_probabilities.get)
+
+    @property
+    def class_stability(self) -> float:
+        """Probability that noise leaves the class as measured."""
+        return self.class_probabilities.get(self.nominal_class, 0.0)
+
+
+def evaluate_uncertainty(
+    compiled_rules: CompiledRules,
+    crop_name: str,
+    soil_data: Mapping[str, Any],
+    errors: Optional[Mapping[str, ErrorSpec]] = None,
+    season: Optional[str] = None,
+    n_draws: int = DEFAULT_DRAWS,
+    confidence: float = DEFAULT_CONFIDENCE,
+    seed: Optional[int] = None,
+) -> UncertaintyResult:
+    """
+    Propagate measurement error through one crop evaluation.
+
+    Args:
+        compiled_rules: Compiled knowledge base
+        crop_name: Crop to evaluate
+        soil_data: Measured values
+        errors: Error model per soil_data key (MeasurementError, a bare
+            standard deviation, or a dict of MeasurementError fields).
+            Defaults to DEFAULT_MEASUREMENT_ERRORS for the numeric
+            parameters present in soil_data.
+        season: Season key for seasonal crops
+        n_draws: Number of Monte Carlo draws
+        confidence: Coverage of the LSI interval (e.g. 0.90)
+        seed: Random seed for reproducible results
+
+    Returns:
+        UncertaintyResult
+
+    Raises:
+        ValueError: Unknown crop/season/parameter, a categorical parameter
+            given an error model, or invalid n_draws/confidence
+    """
+    compiled_rules.validate_season(crop_name, season)
+    if n_draws < 2:
+        raise ValueError("n_draws must be at least 2")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+
+    if errors is None:
+        errors = {
+            key: error for key, error in DEFAULT_MEASUREMENT_ERRORS.items()
+            if isinstance(soil_data.get(key), (int, float))
+        }
+
+    rng = np.random.default_rng(seed)
+    columns: Dict[str, Any] = {
+        key: [value] * n_draws
+        for key, value in soil_data.items()
+        if key in PARAMETER_MAPPING
+    }
+    perturbed: Dict[str, np.ndarray] = {}
+    for key, spec in errors.items():
+        if key not in PARAMETER_MAPPING:
+            raise ValueError(f"Unknown parameter '{key}'")
+        value = soil_data.get(key)
+        if is_missing(value):
+            continue
+        if isinstance(value, str):
+            raise ValueError(f"'{key}' is categorical; only numeric parameters can have errors")
+        perturbed[key] = _as_error(spec).sample(float(value), n_draws, rng)
+        columns[key] = perturbed[key]
+
+    nominal = evaluate_matrix(compiled_rules, {key: [soil_data[key]] for key in columns}, [crop_name], season)
+    nominal_lsi = float(nominal.lsi[0, 0])
+    nominal_class = str(nominal.classes[0, 0])
+
+    matrix = evaluate_matrix(compiled_rules, columns, [crop_name], season)
+    lsi = matrix.lsi[:, 0]
+    classes = matrix.classes[:, 0]
+
+    tail = (1.0 - confidence) / 2 * 100
+    low, high = np.percentile(lsi, [tail, 100 - tail])
+    probabilities = {
+        str(lsc): float(np.count_nonzero(classes == lsc)) / n_draws for lsc in LSI_CLASSES
+    }
+
+    drivers = []
+    flip_rates = {}
+    total_variance = float(np.var(lsi))
+    for key, values in perturbed.items():
+        category, parameter = PARAMETER_MAPPING[key]
+        table = compiled_rules.get_table(crop_name, category, parameter, season)
+        if table is None:
+            drivers.append((key, 0.0))
+            flip_rates[key] = 0.0
+            continue
+        ratings = rate_column(table, values)
+        nominal_rating = rate_column(table, [soil_data[key]])[0]
+        flip_rates[key] = float(np.mean(ratings != nominal_rating))
+        drivers.append((key, _correlation_ratio(ratings, lsi, total_variance)))
+    drivers.sort(key=lambda item: item[1], reverse=True)
+
+    logger.debug(
+        "evaluate_uncertainty: %s, %d draws, %d perturbed parameters",
+        crop_name, n_draws, len(perturbed)
+    )
+
+    return UncertaintyResult(
+        crop_name=crop_name,
+        season=season,
+        n_draws=n_draws,
+        confidence=confidence,
+        nominal_lsi=nominal_lsi,
+        nominal_class=nominal_class,
+        mean_lsi=round(float(np.mean(lsi)), 2),
+        std_lsi=round(float(np.std(lsi)), 2),
+        lsi_interval=(round(float(low), 2), round(float(high), 2)),
+        class_probabilities=probabilities,
+        variance_drivers=drivers,
+        rating_flip_rates=flip_rates,
+        lsi_draws=lsi,
+    )
+
+
+def _correlation_ratio(ratings: np.ndarray, lsi: np.ndarray, total_variance: float) -> float:
+    """Share of LSI variance explained by one parameter's rating (η²)."""
+    if total_variance <= 0:
+        return 0.0
+    _, groups = np.unique(ratings, return_inverse=True)
+    counts = np.bincount(groups)
+    means = np.bincount(groups, weights=lsi) / counts
+    between = np.sum(counts * (means - lsi.mean()) ** 2) / len(lsi)
+    return round(float(between / total_variance), 4)
@@ -0,0 +1,411 @@
+"""
+
+Vectorized Batch Evaluation for SoilWise
+
+Evaluates N soil samples against M crops in one call. Ratings come from
+np.searchsorted over the compiled rule intervals and the Square Root
+Method is applied to whole arrays:
+
+    LSI = Rmin × √(product of ALL ratings) × 100
+
+Samples are given as a columnar table: a mapping (or pandas DataFrame)
+from soil_data keys (ph, rainfall, texture, ...) to equal-length columns.
+Missing cells (None/NaN) mean the parameter was not provided for that
+sample and are left out of the calculation, exactly as an absent key is
+in RulesEngine.evaluate.
+
+sweep() is the one-crop, one-parameter special case: every other
+parameter is rated once and only the swept parameter is looked up over
+the value grid, giving LSI curves like "Cocoa as pH goes from 4 to 8".
+
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from knowledge_base.compiled_rules import (
+    CompiledRules, CompiledTable, NEG_INF, POS_INF, SUBCLASS_CODES
+)
+from knowledge_base.rules_engine import PARAMETER_MAPPING, is_missing
+
+logger = logging.getLogger(__name__)
+
+
+# One bit per limiting-factor subclass code
+LIMITING_FACTOR_BITS = {
+    code: 1 << index for index, code in enumerate(sorted(SUBCLASS_CODES.values()))
+}
+
+LSI_CLASSES = np.array(["S1", "S2", "S3", "N"])
+
+# Same tolerance RulesEngine.identify_limiting_factors uses
+LIMITING_THRESHOLD = 0.001
+
+
+@dataclass
+class MatrixResult:
+    """Result of an N samples × M crops evaluation."""
+
+    crops: List[str]
+    lsi: np.ndarray              # (N, M) float, rounded to 2 decimals
+    classes: np.ndarray          # (N, M) str: S1 / S2 / S3 / N
+    limiting_masks: np.ndarray   # (N, M) int: OR of LIMITING_FACTOR_BITS
+    season: Optional[str] = None
+
+    def limiting_factors(self, row: int, col: int) -> str:
+        """Limiting-factor codes for one cell, formatted like RulesEngine."""
+        return decode_limiting_factors(int(self.limiting_masks[row, col]))
+
+
+def decode_limiting_factors(mask: int) -> str:
+    """Convert a limiting-factor bitmask back to sorted subclass codes (e.g. 'cf')."""
+    return "".join(
+        code for code, bit in sorted(LIMITING_FACTOR_BITS.items()) if mask & bit
+    )
+
+
+def round_lsi(lsi: np.ndarray) -> np.ndarray:
+    """
+    Round LSIs to 2 decimals with Python's round, as RulesEngine.calculate_lsi does.
+
+    np.round scales by 100 before rounding, so it disagrees on values like
+    2.295 (2.3 vs 2.29) and 49.995 (50.0, S2, vs 49.99, S3).
+    """
+    return np.array([round(value, 2) for value in lsi.ravel().tolist()]).reshape(lsi.shape)
+
+
+def classify_lsi_array(lsi: np.ndarray) -> np.ndarray:
+    """Vectorized RulesEngine.classify_lsi."""
+    index = np.select([lsi >= 75, lsi >= 50, lsi >= 25], [0, 1, 2], default=3)
+    return LSI_CLASSES[index]
+
+
+def records_to_columns(records: Iterable[Mapping[str, Any]]) -> Dict[str, List[Any]]:
+    """Convert a sequence of soil_data dicts into a columnar table."""
+    records = list(records)
+    keys: List[str] = []
+    for record in records:
+        for key in record:
+            if key not in keys:
+                keys.append(key)
+    return {key: [record.get(key) for record in records] for key in keys}
+
+
+def _column_length(samples: Mapping[str, Sequence[Any]]) -> int:
+    lengths = {len(samples[key]) for key in samples.keys()}
+    if len(lengths) > 1:
+        raise ValueError(f"Sample columns have different lengths: {sorted(lengths)}")
+    return lengths.pop() if lengths else 0
+
+
+def _to_float_column(column: Sequence[Any]) -> np.ndarray:
+    """Convert a column to float, mapping None and non-numeric cells to NaN."""
+    try:
+        return np.asarray(column, dtype=float)
+    except (TypeError, ValueError):
+        values = np.empty(len(column), dtype=float)
+        for i, value in enumerate(column):
+            try:
+                values[i] = float(value)
+            except (TypeError, ValueError):
+                values[i] = np.nan
+        return values
+
+
+def numeric_soil_keys(compiled_rules: CompiledRules) -> FrozenSet[str]:
+    """soil_data keys that are rated against numeric range tables."""
+    numeric = {
+        (category, parameter)
+        for (_, _, category, parameter), table in compiled_rules.tables.items()
+        if table.is_numeric
+    }
+    if any(table.is_numeric for table in compiled_rules.slope_tables.values()):
+        numeric.add(("topography_requirements", compiled_rules.SLOPE_PARAMETER))
+    return frozenset(
+        soil_key for soil_key, mapping in PARAMETER_MAPPING.items() if mapping in numeric
+    )
+
+
+def coerce_numeric_values(
+    soil_data: Mapping[str, Any],
+    numeric_keys: FrozenSet[str],
+) -> Dict[str, Any]:
+    """
+    Scalar counterpart of _to_float_column for one soil record.
+
+    Numeric fields become floats ("6.2" -> 6.2); values that cannot be
+    parsed become None, i.e. missing, as they are NaN in a column. Applying
+    this before RulesEngine.evaluate gives the same ratings as the
+    vectorized path.
+    """
+    coerced = dict(soil_data)
+    for key in numeric_keys:
+        value = coerced.get(key)
+        if value is None or isinstance(value, float):
+            continue
+        try:
+            coerced[key] = float(value)
+        except (TypeError, ValueError):
+            coerced[key] = None
+    return coerced
+
+
+def rate_column(table: CompiledTable, column: Sequence[Any]) -> np.ndarray:
+    """
+    Rate a whole column against one compiled table.
+
+    Returns:
+        Float array of ratings, NaN where the cell is missing
+    """
+    if table.is_numeric:
+        values = _to_float_column(column)
+        bounds, slot_ratings, _ = table.as_arrays()
+        if len(bounds):
+            i = np.searchsorted(bounds, values, side="left")
+            on_bound = bounds[np.minimum(i, len(bounds) - 1)] == values
+            slots = 2 * i + on_bound
+        else:
+            slots = np.zeros(len(values), dtype=np.intp)
+        return np.where(np.isnan(values), np.nan, slot_ratings[slots])
+
+    ratings = np.empty(len(column), dtype=float)
+    for i, value in enumerate(column):
+        if is_missing(value):
+            ratings[i] = np.nan
+            continue
+        index = table.value_spec.get(str(value), -1)
+        ratings[i] = table.spec_ratings[index] if index >= 0 else table.default_rating
+    return ratings
+
+
+def evaluate_matrix(
+    compiled_rules: CompiledRules,
+    samples: Mapping[str, Sequence[Any]],
+    crop_names: Sequence[str],
+    season: Optional[str] = None,
+) -> MatrixResult:
+    """
+    Evaluate every sample against every crop.
+
+    Args:
+        compiled_rules: Compiled knowledge base
+        samples: Columnar soil data (soil_data key -> column)
+        crop_names: Crops to evaluate (result columns, in this order)
+        season: Season key, required when any crop is seasonal
+
+    Returns:
+        MatrixResult with (N, M) LSI, class and limiting-factor arrays
+    """
+    for crop_name in crop_names:
+        compiled_rules.validate_season(crop_name, season)
+
+    n_samples = _column_length(samples)
+    n_crops = len(crop_names)
+    keys = [key for key in samples.keys() if key in PARAMETER_MAPPING]
+    columns = {key: samples[key] for key in keys}
+
+    lsi = np.zeros((n_samples, n_crops), dtype=float)
+    masks = np.zeros((n_samples, n_crops), dtype=np.int64)
+
+    for col, crop_name in enumerate(crop_names):
+        ratings = np.full((n_samples, len(keys)), np.nan)
+        bits = np.zeros(len(keys), dtype=np.int64)
+
+        for j, key in enumerate(keys):
+            category, parameter = PARAMETER_MAPPING[key]
+            table = compiled_rules.get_table(crop_name, category, parameter, season)
+            if table is None:
+                present = ~np.array([is_missing(v) for v in columns[key]], dtype=bool)
+                ratings[:, j] = np.where(present, 1.0, np.nan)
+                subclass = SUBCLASS_CODES.get(category, "")
+            else:
+                ratings[:, j] = rate_column(table, columns[key])
+                subclass = table.subclass
+            bits[j] = LIMITING_FACTOR_BITS.get(subclass, 0)
+
+        evaluated = ~np.isnan(ratings)
+        has_any = evaluated.any(axis=1)
+
+        rmin = np.min(np.where(evaluated, ratings, np.inf), axis=1)
+        # Multiply column by column, in the order RulesEngine.evaluate does
+        product = np.ones(n_samples)
+        for j in range(len(keys)):
+            product = product * np.where(evaluated[:, j], ratings[:, j], 1.0)
+        crop_lsi = np.where(has_any, round_lsi(rmin * np.sqrt(product) * 100), 0.0)
+
+        is_limiting = evaluated & (np.abs(ratings - rmin[:, None]) < LIMITING_THRESHOLD)
+        crop_masks = np.bitwise_or.reduce(
+            np.where(is_limiting, bits[None, :], 0), axis=1
+        ) if keys else np.zeros(n_samples, dtype=np.int64)
+
+        lsi[:, col] = crop_lsi
+        masks[:, col] = crop_masks
+
+    logger.debug(f"evaluate_matrix: {n_samples} samples × {n_crops} crops")
+
+    return MatrixResult(
+        crops=list(crop_names),
+        lsi=lsi,
+        classes=classify_lsi_array(lsi),
+        limiting_masks=masks,
+        season=season,
+    )
+
+
+@dataclass
+class SweepResult:
+    """LSI of one crop as a single parameter varies over a value grid."""
+
+    crop_name: str
+    parameter: str
+    values: np.ndarray           # (K,) swept values
+    ratings: np.ndarray          # (K,) rating of the swept parameter (NaN if missing)
+    lsi: np.ndarray              # (K,) float, rounded to 2 decimals
+    classes: np.ndarray          # (K,) str: S1 / S2 / S3 / N
+    limiting_masks: np.ndarray   # (K,) int: OR of LIMITING_FACTOR_BITS
+    breakpoints: List[float]     # rule-table bounds inside the grid where the rating changes
+    season: Optional[str] = None
+
+    def limiting_factors(self, index: int) -> str:
+        """Limiting-factor codes at one grid point, formatted like RulesEngine."""
+        return decode_limiting_factors(int(self.limiting_masks[index]))
+
+
+def rating_breakpoints(
+    table: CompiledTable,
+    low: float = NEG_INF,
+    high: float = POS_INF,
+) -> List[float]:
+    """
+    Bounds of a numeric table in [low, high] where the rating changes.
+
+    A bound counts when the rating just below it, at it, or just above it
+    differ (closed ranges make the bound itself a separate slot).
+    """
+    if not table.is_numeric:
+        return []
+    ratings = table.slot_ratings
+    breakpoints = []
+    for i, bound in enumerate(table.bounds):
+        if not low <= bound <= high:
+            continue
+        below, at, above = ratings[2 * i], ratings[2 * i + 1], ratings[2 * i + 2]
+        if below != at or at != above:
+            breakpoints.append(bound)
+    return breakpoints
+
+
+def sweep(
+    compiled_rules: CompiledRules,
+    crop_name: str,
+    base_soil: Mapping[str, Any],
+    parameter: str,
+    values: Sequence[Any],
+    season: Optional[str] = None,
+) -> SweepResult:
+    """
+    Evaluate one crop over a grid of values for a single parameter.
+
+    Args:
+        compiled_rules: Compiled knowledge base
+        crop_name: Crop to evaluate
+        base_soil: soil_data for every other parameter (its value for
+            ``parameter``, if any, is replaced by the grid)
+        parameter: soil_data key to vary (e.g. 'ph', 'rainfall', 'texture')
+        values: Grid of values for ``parameter``
+        season: Season key for seasonal crops
+
+    Returns:
+        SweepResult with per-grid-point LSI, class and limiting factors.
+        LSIs equal RulesEngine.evaluate on the same soil data.
+
+    Raises:
+        ValueError: Unknown parameter, unknown crop or invalid season
+    """
+    mapping = PARAMETER_MAPPING.get(parameter)
+    if mapping is None:
+        raise ValueError(
+            f"Unknown parameter '{parameter}'. "
+            f"Available: {', '.join(PARAMETER_MAPPING)}"
+        )
+    compiled_rules.validate_season(crop_name, season)
+
+    # Rate every fixed parameter once, keeping soil_data order so the
+    # product is multiplied in the same sequence as RulesEngine.evaluate
+    keys = list(base_soil.keys())
+    if parameter not in base_soil:
+        keys.append(parameter)
+    position = keys.index(parameter)
+
+    before, after = [], []
+    for index, key in enumerate(keys):
+        key_mapping = PARAMETER_MAPPING.get(key)
+        if index == position or key_mapping is None or is_missing(base_soil[key]):
+            continue
+        value = base_soil[key]
+        category, requirement = key_mapping
+        try:
+            rating, _, subclass = compiled_rules.rate(
+                crop_name, category, requirement, value, season
+            )
+        except Exception:
+            logger.error(f"Error evaluating {key} = {value!r} for {crop_name}", exc_info=True)
+            continue
+        target = before if index < position else after
+        target.append((rating, LIMITING_FACTOR_BITS.get(subclass, 0)))
+
+    category, requirement = mapping
+    table = compiled_rules.get_table(crop_name, category, requirement, season)
+    breakpoints: List[float] = []
+    if table is None:
+        grid = np.asarray(values)
+        ratings = np.where([not is_missing(v) for v in values], 1.0, np.nan)
+        swept_bit = LIMITING_FACTOR_BITS.get(SUBCLASS_CODES.get(category, ""), 0)
+    else:
+        ratings = rate_column(table, values)
+        swept_bit = LIMITING_FACTOR_BITS.get(table.subclass, 0)
+        if table.is_numeric:
+            grid = _to_float_column(values)
+            finite = grid[~np.isnan(grid)]
+            if len(finite):
+                breakpoints = rating_breakpoints(table, finite.min(), finite.max())
+        else:
+            grid = np.asarray(values)
+
+    fixed = before + after
+    present = ~np.isnan(ratings)
+    fixed_min = min((rating for rating, _ in fixed), default=np.inf)
+    rmin = np.where(present, np.minimum(ratings, fixed_min), fixed_min)
+
+    product = np.ones(len(ratings))
+    for rating, _ in before:
+        product = product * rating
+    product = product * np.where(present, ratings, 1.0)
+    for rating, _ in after:
+        product = product * rating
+
+    has_any = present | bool(fixed)
+    lsi = np.where(
+        has_any, round_lsi(np.where(has_any, rmin, 0.0) * np.sqrt(product) * 100), 0.0
+    )
+
+    masks = np.where(
+        present & (np.abs(ratings - rmin) < LIMITING_THRESHOLD), swept_bit, 0
+    ).astype(np.int64)
+    for rating, bit in fixed:
+        masks |= np.where(np.abs(rating - rmin) < LIMITING_THRESHOLD, bit, 0)
+
+    return SweepResult(
+        crop_name=crop_name,
+        parameter=parameter,
+        values=grid,
+        ratings=ratings,
+        lsi=lsi,
+        classes=classify_lsi_array(lsi),
+        limiting_masks=masks,
+        breakpoints=breakpoints,
+        season=season,
+    )
@@ -0,0 +1,118 @@
+"""
+Benchmark the per-evaluation cost of RulesEngine.evaluate.
+
+Compares:
+  - fast path        evaluate()              (no per-parameter logging)
+  - explain path     evaluate(explain=True)  (builds an EvaluationTrace)
+  - baseline         RulesEngine.evaluate of an older commit, checked out
+                     into a temporary git worktree and timed in a separate
+                     process with its own logging setup (stderr discarded)
+
+Run from the project root:
+    python scripts/benchmark_rules_engine.py [--runs 2000] [--baseline REV]
+
+--baseline takes any git revision, e.g. the commit before the fast path
+was introduced. Without it only the current tree is measured.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from knowledge_base.rules_engine import RulesEngine
+
+SOIL_DATA = {
+    "temperature": 25.0,
+    "rainfall": 2000.0,
+    "humidity": 75.0,
+    "slope": 3.0,
+    "drainage": "good",
+    "flooding": "Fo",
+    "texture": "CL",
+    "soil_depth": 120,
+    "coarse_fragments": 5.0,
+    "ph": 5.8,
+    "organic_carbon": 1.4,
+    "base_saturation": 45.0,
+    "cec": 18.0,
+    "ec": 0.5,
+    "esp": 2.0,
+}
+
+# Runs inside the baseline worktree; prints µs/eval on stdout
+BASELINE_TIMER = """
+import json, sys, timeit
+sys.path.insert(0, ".")
+from knowledge_base.rules_engine import RulesEngine
+crop, runs, soil_data = sys.argv[1], int(sys.argv[2]), json.loads(sys.argv[3])
+engine = RulesEngine()
+best = min(timeit.repeat(lambda: engine.evaluate(crop, soil_data), number=runs, repeat=5))
+print(best / runs * 1e6)
+"""
+
+
+def time_per_call(func, runs: int) -> float:
+    """Best-of-5 time per call in microseconds."""
+    return min(timeit.repeat(func, number=runs, repeat=5)) / runs * 1e6
+
+
+def time_baseline(revision: str, crop: str, runs: int) -> float:
+    """Time RulesEngine.evaluate at ``revision`` in a throwaway git worktree."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        worktree = Path(tmp_dir) / "baseline"
+        subprocess.run(
+            ["git", "worktree", "add", "--detach", str(worktree), revision],
+            cwd=project_root, check=True, capture_output=True,
+        )
+        try:
+            output = subprocess.run(
+                [sys.executable, "-c", BASELINE_TIMER, crop, str(runs), json.dumps(SOIL_DATA)],
+                cwd=worktree, check=True, stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL, text=True,
+            ).stdout
+        finally:
+            subprocess.run(
+                ["git", "worktree", "remove", "--force", str(worktree)],
+                cwd=project_root, check=True, capture_output=True,
+            )
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--crop", default="Banana")
+    parser.add_argument("--baseline", metavar="REV",
+                        help="git revision to measure as the 'before' case")
+    args = parser.parse_args()
+
+    engine = RulesEngine()
+
+    timings = [
+        ("fast path", time_per_call(lambda: engine.evaluate(args.crop, SOIL_DATA), args.runs)),
+        ("explain=True", time_per_call(
+            lambda: engine.evaluate(args.crop, SOIL_DATA, explain=True), args.runs
+        )),
+    ]
+    if args.baseline:
+        timings.append(
+            (f"baseline ({args.baseline})", time_baseline(args.baseline, args.crop, args.runs))
+        )
+
+    print(f"\nRulesEngine.evaluate('{args.crop}') with {len(SOIL_DATA)} parameters")
+    print("-" * 50)
+    for label, micros in timings:
+        print(f"{label:<26} {micros:>10.1f} µs/eval")
+    if args.baseline:
+        print(f"{'speedup vs baseline':<26} {timings[-1][1] / timings[0][1]:>10.1f} x")
+
+
+if __name__ == "__main__":
+    main()
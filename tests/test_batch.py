@@ -0,0 +1,188 @@
+"""
+Test the process-pool batch evaluator
+"""
+
+import csv
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from knowledge_base.batch import BatchEvaluator, evaluate_records, main
+from knowledge_base.evaluation import SuitabilityEvaluator
+
+
+def _records(count, seed=5):
+    rng = random.Random(seed)
+    return [
+        {
+            "temperature": round(rng.uniform(15, 32), 1),
+            "rainfall": round(rng.uniform(800, 3200)),
+            "ph": round(rng.uniform(4.0, 8.0), 1),
+            "texture": rng.choice(["L", "CL", "SL", "C"]),
+            "drainage": rng.choice(["good", "moderate", "poor"]),
+            "slope": round(rng.uniform(0, 25), 1),
+            "site": f"site-{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def test_serial_matches_evaluator():
+    """Small jobs run in-process and match SuitabilityEvaluator"""
+    print("\n" + "="*70)
+    print("TEST: Batch evaluation (in-process)")
+    print("="*70)
+    
+    records = _records(20)
+    evaluator = SuitabilityEvaluator()
+    results = list(evaluate_records(records, ["Banana", "Maize"], season="may_august"))
+    
+    assert len(results) == len(records)
+    for record, record_results in zip(records, results):
+        assert [r["crop_name"] for r in record_results] == ["Banana", "Maize"]
+        expected = evaluator.evaluate_suitability(record, "Maize", "may_august")
+        assert record_results[1]["lsi"] == expected["lsi"]
+        assert record_results[0]["season"] is None
+    print("✅ PASSED")
+
+
+def test_parallel_streams_in_order():
+    """Pool results come back in input order and equal the in-process results"""
+    records = _records(60)
+    serial = list(evaluate_records(records, ["Banana", "Cocoa"], workers=1, enrich=False))
+    
+    with BatchEvaluator(workers=2, chunk_size=7, min_parallel_records=0, enrich=False) as batch:
+        parallel = list(batch.evaluate(iter(records), ["Banana", "Cocoa"]))
+        # The warm pool is reused by a second job
+        again = list(batch.evaluate(records[:10], ["Banana", "Cocoa"]))
+    
+    assert [[r["lsi"] for r in rs] for rs in parallel] == [[r["lsi"] for r in rs] for rs in serial]
+    assert [[r["lsi"] for r in rs] for rs in again] == [[r["lsi"] for r in rs] for rs in serial[:10]]
+    print(f"✓ {len(parallel)} records in order across 2 workers")
+    print("✅ PASSED")
+
+
+def test_invalid_crop_fails_fast():
+    """Unknown crops are rejected before any record is read"""
+    try:
+        evaluate_records_iter = BatchEvaluator(workers=1).evaluate([], ["Moonfruit"])
+    except ValueError as e:
+        print(f"✓ Raised: {e}")
+    else:
+        raise AssertionError(f"Expected ValueError, got {evaluate_records_iter}")
+
+
+def test_command_line_csv_and_jsonl():
+    """The CLI streams CSV in and writes CSV / JSONL out"""
+    records = _records(5)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = Path(tmp_dir) / "sites.csv"
+        with open(source, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(records[0]))
+            writer.writeheader()
+            writer.writerows(records)
+        
+        csv_out = Path(tmp_dir) / "out.csv"
+        assert main([str(source), "-o", str(csv_out), "--crops", "Banana", "Maize",
+                     "--season", "may_august", "--id-column", "site", "--no-enrich"]) == 0
+        with open(csv_out, newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 10
+        assert rows[0]["site"] == "site-0" and rows[1]["crop_name"] == "Maize"
+        
+        jsonl_out = Path(tmp_dir) / "out.jsonl"
+        assert main([str(source), "-o", str(jsonl_out), "--crops", "Banana",
+                     "--workers", "1"]) == 0
+        lines = [json.loads(line) for line in open(jsonl_out)]
+        assert [line["row"] for line in lines] == [1, 2, 3, 4, 5]
+        assert "recommendations" in lines[0]["results"][0]
+        
+        expected = SuitabilityEvaluator().evaluate_suitability(records[2], "Banana")
+        assert lines[2]["results"][0]["lsi"] == expected["lsi"]
+        assert float(rows[4]["lsi"]) == expected["lsi"]
+        
+        assert main([str(source), "--crops", "Moonfruit"]) == 1
+    print("✅ PASSED")
+
+
+def test_command_line_id_column_case_and_text():
+    """--id-column matches headers case-insensitively and keeps IDs as text"""
+    records = _records(3)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = Path(tmp_dir) / "sites.csv"
+        with open(source, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["SampleID"] + list(records[0]))
+            writer.writeheader()
+            for i, record in enumerate(records):
+                writer.writerow({"SampleID": f"00{i + 7}", **record})
+
+        csv_out = Path(tmp_dir) / "out.csv"
+        assert main([str(source), "-o", str(csv_out), "--crops", "Banana",
+                     "--id-column", "SampleID", "--no-enrich"]) == 0
+        with open(csv_out, newline="") as f:
+            assert [row["SampleID"] for row in csv.DictReader(f)] == ["007", "008", "009"]
+
+        jsonl_out = Path(tmp_dir) / "out.jsonl"
+        assert main([str(source), "-o", str(jsonl_out), "--crops", "Banana",
+                     "--id-column", "SampleID", "--no-enrich"]) == 0
+        assert [json.loads(line)["SampleID"] for line in open(jsonl_out)] == ["007", "008", "009"]
+
+        db_path = Path(tmp_dir) / "out.db"
+        assert main([str(source), "-o", str(db_path), "--crops", "Banana",
+                     "--id-column", "SampleID", "--no-enrich"]) == 0
+        from database.db_manager import DatabaseManager
+        db = DatabaseManager(str(db_path))
+        locations = [row["location"] for row in db.get_recent_soil_inputs(10)]
+        db.close()
+        assert sorted(locations) == ["007", "008", "009"]
+    print("✅ PASSED")
+
+
+def test_command_line_sqlite():
+    """SQLite output stores each record as a soil input linked to its results"""
+    records = _records(5)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = Path(tmp_dir) / "sites.jsonl"
+        with open(source, "w") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+
+        db_path = Path(tmp_dir) / "out.db"
+        assert main([str(source), "-o", str(db_path), "--crops", "Banana", "Maize",
+                     "--season", "may_august", "--id-column", "site", "--no-enrich"]) == 0
+
+        from database.db_manager import DatabaseManager
+        db = DatabaseManager(str(db_path))
+        with db.get_connection() as conn:
+            inputs = conn.execute(
+                "SELECT input_id, location, ph, precipitation FROM soil_data_inputs ORDER BY input_id"
+            ).fetchall()
+            evaluations = conn.execute(
+                "SELECT input_id, crop_id FROM evaluation_results ORDER BY evaluation_id"
+            ).fetchall()
+        db.close()
+
+        assert [row["location"] for row in inputs] == [r["site"] for r in records]
+        assert inputs[0]["ph"] == records[0]["ph"]
+        assert inputs[0]["precipitation"] == records[0]["rainfall"]
+        assert len(evaluations) == 10
+        assert [row["input_id"] for row in evaluations[:2]] == [inputs[0]["input_id"]] * 2
+        assert evaluations[1]["crop_id"] == "maize"
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_serial_matches_evaluator()
+    test_parallel_streams_in_order()
+    test_invalid_crop_fails_fast()
+    test_command_line_csv_and_jsonl()
+    test_command_line_id_column_case_and_text()
+    test_command_line_sqlite()
+    print("\n" + "="*70)
+    print("🎉 ALL BATCH TESTS PASSED!")
+    print("="*70)
@@ -0,0 +1,67 @@
+"""
+Test the per-crop LRU comparison cache
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from SoilWise.services.comparison_cache import ComparisonCache
+
+
+def _result(crop_name, season=None, lsi=50.0):
+    return {"crop_name": crop_name, "season": season, "lsi": lsi,
+            "parameter_ratings": {"ph": (0.85, "S2", "f")}}
+
+
+def test_reuses_crops_across_comparisons():
+    """Only crops missing for this soil and season are reported as missing"""
+    print("\n" + "="*70)
+    print("TEST: ComparisonCache")
+    print("="*70)
+
+    cache = ComparisonCache()
+    soil = hash((("ph", 6.0),))
+    cache.put(soil, "Banana", None, _result("Banana"))
+    cache.put(soil, "Tomato", "may_august", _result("Tomato", "may_august"))
+
+    # Different season: Banana (perennial) is reused, Tomato is not
+    cached, missing = cache.lookup(soil, [("Banana", None), ("Tomato", "january_april")])
+    assert [r["crop_name"] for r in cached] == ["Banana"]
+    assert missing == [("Tomato", "january_april")]
+
+    # Different soil: nothing is reused
+    cached, missing = cache.lookup(hash((("ph", 7.0),)), [("Banana", None)])
+    assert cached == [] and missing == [("Banana", None)]
+
+    assert cache.count_cached(soil, [("Banana", None), ("Tomato", "may_august")]) == 2
+    print(f"✓ hits={cache.hits}, misses={cache.misses}")
+    print("✅ PASSED")
+
+
+def test_lru_eviction_and_copies():
+    """Least recently used entries are evicted; callers get independent copies"""
+    cache = ComparisonCache(max_entries=2)
+    cache.put("soil", "Banana", None, _result("Banana"))
+    cache.put("soil", "Cocoa", None, _result("Cocoa"))
+    assert cache.get("soil", "Banana", None) is not None   # Banana is now most recent
+    cache.put("soil", "Sugarcane", None, _result("Sugarcane"))
+
+    assert len(cache) == 2
+    assert cache.get("soil", "Cocoa", None) is None
+    assert cache.get("soil", "Banana", None) is not None
+
+    copy_a = cache.get("soil", "Banana", None)
+    copy_a["lsi"] = 0.0
+    assert cache.get("soil", "Banana", None)["lsi"] == 50.0
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_reuses_crops_across_comparisons()
+    test_lru_eviction_and_copies()
+    print("\n" + "="*70)
+    print("🎉 ALL COMPARISON CACHE TESTS PASSED!")
+    print("="*70)
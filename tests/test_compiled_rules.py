@@ -0,0 +1,128 @@
+"""
+Test the compiled rule tables (bisect-based interval lookup)
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from knowledge_base.compiled_rules import CompiledTable
+from knowledge_base.rules_engine import RulesEngine
+
+
+def test_table_lookup_matches_ranges():
+    """Closed ranges, open ends and gaps resolve like the original scan"""
+    print("\n" + "="*70)
+    print("TEST: Compiled table lookup")
+    print("="*70)
+    
+    table = CompiledTable(
+        {
+            "S1": {"range": [5.5, 7.0], "rating": 1.0},
+            "S2": {"range": [5.0, 5.4], "rating": 0.85},
+            "S3": {"range": [7.1, None], "rating": 0.60},
+            "N": {"range": [None, 4.9], "rating": 0.25},
+        },
+        "f",
+    )
+    
+    assert table.rate(6.0) == (1.0, "S1", "f")
+    assert table.rate(5.5) == (1.0, "S1", "f")
+    assert table.rate(7.0) == (1.0, "S1", "f")
+    assert table.rate(5.0) == (0.85, "S2", "f")
+    assert table.rate(9.0) == (0.60, "S3", "f")
+    assert table.rate(3.0) == (0.25, "N", "f")
+    # Gap between 4.9 and 5.0 falls back to the table default
+    assert table.rate(4.95) == (1.0, "S1", "f")
+    print("✅ PASSED")
+
+
+def test_overlap_and_inverted_ranges():
+    """First listed range wins on overlap; inverted ranges are normalized"""
+    table = CompiledTable(
+        {
+            "S1_high": {"range": [1600, 1500], "rating": 1.0},
+            "S2": {"range": [1550, 2000], "rating": 0.85},
+        },
+        "c",
+    )
+    
+    assert table.rate(1550) == (1.0, "S1", "c")
+    assert table.rate(1600) == (1.0, "S1", "c")
+    assert table.rate(1601) == (0.85, "S2", "c")
+    print("✅ PASSED")
+
+
+def test_malformed_range_fails_compile():
+    """A range that is not a [low, high] pair is rejected, not skipped"""
+    for raw in ([None, 60.1, None], [None], "60", [None, "deep"]):
+        try:
+            CompiledTable(
+                {
+                    "S1": {"range": [60.0, None], "rating": 1.0},
+                    "N": {"range": raw, "rating": 0.25},
+                },
+                "s",
+            )
+        except ValueError as e:
+            assert "'N'" in str(e)
+        else:
+            raise AssertionError(f"Expected ValueError for range {raw!r}")
+    
+    # Carrots' shallow-soil band rates N instead of the S1 default
+    engine = RulesEngine()
+    assert engine.get_parameter_rating(
+        "Carrots", "physical_soil_requirements", "soil_depth_cm", 40, "january_april"
+    ) == (0.25, "N", "s")
+    print("✅ PASSED")
+
+
+def test_categorical_lookup():
+    """Value lists map to their classification"""
+    table = CompiledTable(
+        {
+            "S1": {"values": ["good"], "rating": 1.0},
+            "N": {"values": ["poor", "good"], "rating": 0.25},
+        },
+        "w",
+    )
+    
+    assert table.rate("good") == (1.0, "S1", "w")
+    assert table.rate("poor") == (0.25, "N", "w")
+    assert table.rate("unknown") == (1.0, "S1", "w")
+    print("✅ PASSED")
+
+
+def test_engine_uses_compiled_tables():
+    """RulesEngine ratings come from the shared compiled rules"""
+    engine = RulesEngine()
+    
+    table = engine.compiled_rules.get_table(
+        "Banana", "soil_fertility_requirements", "ph_h2o"
+    )
+    assert table is not None
+    assert engine.get_parameter_rating(
+        "Banana", "soil_fertility_requirements", "ph_h2o", 6.2
+    ) == table.rate(6.2)
+    
+    # Seasonal crops resolve climate tables per season
+    assert engine.compiled_rules.get_table(
+        "Cabbage", "climate_requirements", "mean_annual_temp_c"
+    ) is None
+    assert engine.compiled_rules.get_table(
+        "Cabbage", "climate_requirements", "mean_annual_temp_c", "january_april"
+    ) is not None
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_table_lookup_matches_ranges()
+    test_overlap_and_inverted_ranges()
+    test_malformed_range_fails_compile()
+    test_categorical_lookup()
+    test_engine_uses_compiled_tables()
+    print("\n" + "="*70)
+    print("🎉 ALL COMPILED RULES TESTS PASSED!")
+    print("="*70)
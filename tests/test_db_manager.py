@@ -0,0 +1,383 @@
+"""
+Test the pooled, WAL-mode DatabaseManager connections
+"""
+
+import gc
+import sqlite3
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.db_manager import DatabaseManager, decode_evaluation_data, evaluation_data_from_result
+
+
+def test_connection_reused_with_pragmas():
+    """One configured connection per thread, reused across calls"""
+    print("\n" + "="*70)
+    print("TEST: DatabaseManager connection pool")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(str(Path(tmp_dir) / "test.db"))
+        with db.get_connection() as first:
+            assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert first.execute("PRAGMA synchronous").fetchone()[0] == 1   # NORMAL
+            assert first.execute("PRAGMA mmap_size").fetchone()[0] > 0
+        with db.get_connection() as second:
+            assert second is first
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(db.get_connection().__enter__()))
+        thread.start()
+        thread.join()
+        assert other[0] is not first
+        db.close()
+    print("✅ PASSED")
+
+
+def test_reader_not_blocked_by_writer():
+    """Under WAL a reader sees the last commit while a write is open"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(str(Path(tmp_dir) / "test.db"))
+        db.save_soil_input({"location": "Gacap", "ph": 6.0})
+
+        seen = []
+
+        def reader():
+            seen.append(len(db.get_recent_soil_inputs(10)))
+
+        with db.get_connection() as conn:
+            conn.execute("INSERT INTO soil_data_inputs (location, ph) VALUES ('Bubong', 5.5)")
+            thread = threading.Thread(target=reader)
+            thread.start()
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+
+        assert seen == [1]
+        assert len(db.get_recent_soil_inputs(10)) == 2
+        db.close()
+    print("✅ PASSED")
+
+
+def test_nested_blocks_share_transaction():
+    """An error in a nested block rolls back the whole outer transaction"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(str(Path(tmp_dir) / "test.db"))
+        try:
+            with db.get_connection() as conn:
+                conn.execute("INSERT INTO soil_data_inputs (location) VALUES ('Outer')")
+                with db.get_connection() as inner:
+                    inner.execute("INSERT INTO soil_data_inputs (location) VALUES ('Inner')")
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+        assert db.get_recent_soil_inputs(10) == []
+        db.close()
+    print("✅ PASSED")
+
+
+def test_thread_exit_and_close_release_connections():
+    """Connections of finished threads are closed; close() empties the pool"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(str(Path(tmp_dir) / "test.db"))
+        threads = [threading.Thread(target=db.get_stats) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        gc.collect()
+        assert len(db._pool) == 1   # only the main thread's connection remains
+
+        with db.get_connection() as conn:
+            pass
+        db.close()
+        assert db._pool == {}
+        try:
+            conn.execute("SELECT 1")
+        except sqlite3.ProgrammingError:
+            pass
+        else:
+            raise AssertionError("Expected closed connection")
+        assert db.get_stats()["soil_inputs"] == 0   # reconnects transparently
+        db.close()
+    print("✅ PASSED")
+
+
+def test_backup_includes_wal_commits():
+    """Backups go through the sqlite backup API, not a file copy"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(str(Path(tmp_dir) / "test.db"))
+        db.save_soil_input({"location": "Gacap", "ph": 6.0})
+        backup_path = db.backup_database(str(Path(tmp_dir) / "backup.db"))
+        conn = sqlite3.connect(backup_path)
+        assert conn.execute("SELECT COUNT(*) FROM soil_data_inputs").fetchone()[0] == 1
+        conn.close()
+        db.close()
+    print("✅ PASSED")
+
+
+def test_batch_inserts_return_ids():
+    """Batch saves return the same ids one-by-one saves would"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(str(Path(tmp_dir) / "test.db"))
+        first = db.save_soil_input({"location": "Gacap", "ph": 6.0})
+        input_ids = db.save_soil_inputs_batch(
+            [{"location": f"Site {i}", "ph": 5.0 + i / 10} for i in range(20)]
+        )
+        assert input_ids == list(range(first + 1, first + 21))
+        assert db.get_soil_input(input_ids[7])["location"] == "Site 7"
+
+        evaluation_ids = db.save_evaluation_results_batch([
+            {"input_id": input_id, "crop_id": "banana", "lsi": 80.0, "lsc": "S1",
+             "full_classification": "S1", "full_result": {"lsi": 80.0}}
+            for input_id in input_ids
+        ])
+        assert len(evaluation_ids) == 20 and len(set(evaluation_ids)) == 20
+        with db.get_connection() as conn:
+            row = conn.execute(
+                "SELECT input_id, evaluation_data FROM evaluation_results WHERE evaluation_id = ?",
+                (evaluation_ids[-1],)
+            ).fetchone()
+        assert row["input_id"] == input_ids[-1]
+        assert decode_evaluation_data(row["evaluation_data"]) == {"lsi": 80.0}
+        assert db.save_evaluation_results_batch([]) == []
+        db.close()
+    print("✅ PASSED")
+
+
+def test_batch_is_all_or_nothing():
+    """A failing row rolls back the whole batch"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(str(Path(tmp_dir) / "test.db"))
+        try:
+            db.save_evaluation_results_batch([
+                {"crop_id": "banana", "lsi": 80.0, "lsc": "S1", "full_classification": "S1"},
+                {"crop_id": "banana", "lsi": None, "lsc": "S1", "full_classification": "S1"},
+            ])
+        except sqlite3.IntegrityError:
+            pass
+        else:
+            raise AssertionError("Expected IntegrityError for missing LSI")
+        assert db.get_evaluation_history() == []
+        db.close()
+    print("✅ PASSED")
+
+
+def test_keyset_pages_match_offset_order():
+    """Keyset pages walk every row once, newest first, ties broken by id"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(str(Path(tmp_dir) / "test.db"))
+        crops = ["banana", "maize", "tomato"]
+        db.save_evaluation_results_batch([
+            {"crop_id": crops[i % 3], "lsi": float(i), "lsc": "S2", "full_classification": "S2"}
+            for i in range(103)
+        ])
+        with db.get_connection() as conn:
+            # Many rows share a timestamp, as batch inserts do
+            conn.execute("""
+                UPDATE evaluation_results
+                SET created_at = datetime('2026-01-01', '+' || (evaluation_id / 4) || ' seconds')
+            """)
+
+        for crop_id in (None, "maize"):
+            expected = [row["evaluation_id"] for row in db.get_evaluation_page(0, 1000, crop_id)]
+            seen, cursor, pages = [], None, 0
+            while True:
+                rows, cursor = db.get_evaluation_page_after(cursor, 10, crop_id)
+                assert len(rows) <= 10
+                seen += [row["evaluation_id"] for row in rows]
+                pages += 1
+                if cursor is None:
+                    break
+            assert sorted(seen) == sorted(expected) and len(seen) == len(set(seen))
+            created = [(row["created_at"], row["evaluation_id"])
+                       for row in db.get_evaluation_page_after(None, 1000, crop_id)[0]]
+            assert created == sorted(created, reverse=True)
+            print(f"✓ crop={crop_id}: {len(seen)} rows in {pages} pages")
+
+        with db.get_connection() as conn:
+            plan = " ".join(row[3] for row in conn.execute("""
+                EXPLAIN QUERY PLAN
+                SELECT evaluation_id FROM evaluation_results
+                WHERE crop_id = ? AND (created_at, evaluation_id) < (?, ?)
+                ORDER BY created_at DESC, evaluation_id DESC LIMIT 26
+            """, ("maize", "2026-01-01 00:00:10", 40)))
+        assert "COVERING INDEX idx_evaluation_results_crop_created" in plan
+        db.close()
+    print("✅ PASSED")
+
+
+def _scanned_stats(db):
+    """Dashboard counters computed the slow way, by scanning evaluation_results"""
+    with db.get_connection() as conn:
+        row = conn.execute("""
+            SELECT COUNT(DISTINCT input_id) AS soil_samples,
+                   COUNT(DISTINCT crop_id) AS crops_evaluated,
+                   COUNT(*) AS evaluations,
+                   COALESCE(AVG(lsi), 0) AS avg_lsi,
+                   COALESCE(SUM(lsc IN ('S1', 'S2')), 0) AS suitable
+            FROM evaluation_results
+        """).fetchone()
+    return dict(row)
+
+
+def _assert_stats_consistent(db):
+    expected = _scanned_stats(db)
+    stats = db.get_dashboard_stats()
+    for key in ("soil_samples", "crops_evaluated", "evaluations"):
+        assert stats[key] == expected[key], (key, stats[key], expected[key])
+    assert abs(stats["avg_lsi"] - expected["avg_lsi"]) < 1e-6
+    assert stats["class_counts"]["S1"] + stats["class_counts"]["S2"] == expected["suitable"]
+
+
+def test_trigger_maintained_stats():
+    """Stats tables follow inserts, updates and deletes; old databases are backfilled"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "test.db")
+        db = DatabaseManager(db_path)
+        assert db.get_dashboard_stats()["evaluations"] == 0
+
+        input_ids = db.save_soil_inputs_batch([{"location": f"Site {i}"} for i in range(5)])
+        classes = ["S1", "S2", "S3", "N"]
+        db.save_evaluation_results_batch([
+            {"input_id": input_ids[i % 5] if i % 7 else None,
+             "crop_id": ["banana", "maize", "cocoa"][i % 3],
+             "lsi": 20.0 + i, "lsc": classes[i % 4], "full_classification": classes[i % 4]}
+            for i in range(60)
+        ])
+        _assert_stats_consistent(db)
+
+        with db.get_connection() as conn:
+            conn.execute("UPDATE evaluation_results SET lsc = 'S1', lsi = 90 WHERE crop_id = 'cocoa'")
+            conn.execute("UPDATE evaluation_results SET crop_id = 'tomato' WHERE evaluation_id % 5 = 0")
+            conn.execute("UPDATE evaluation_results SET input_id = NULL WHERE input_id = ?",
+                         (input_ids[0],))
+        _assert_stats_consistent(db)
+
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM evaluation_results WHERE crop_id = 'maize'")
+        _assert_stats_consistent(db)
+        assert "maize" not in [row["crop_id"] for row in db.get_dashboard_stats()["per_crop"]]
+
+        # Database created before the stats tables existed
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM evaluation_stats")
+            conn.execute("DELETE FROM evaluation_stats_totals")
+        db.close()
+        db = DatabaseManager(db_path)
+        _assert_stats_consistent(db)
+
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM evaluation_results")
+        stats = db.get_dashboard_stats()
+        assert stats["evaluations"] == 0 and stats["soil_samples"] == 0
+        assert stats["per_crop"] == [] and stats["suitability_rate"] == 0
+        db.close()
+    print("✅ PASSED")
+
+
+def _evaluated_results(count=30):
+    from knowledge_base.evaluation import SuitabilityEvaluator
+    evaluator = SuitabilityEvaluator()
+    results = []
+    for i in range(count):
+        soil = {
+            "ph": 4.5 + (i % 8) * 0.4,
+            "rainfall": 1200 + 100 * (i % 15),
+            "temperature": 22 + i % 7,
+            "texture": ["CL", "L", "C"][i % 3],
+            "drainage": ["good", "moderate", "poor"][i % 3],
+            "slope": float(i % 12),
+        }
+        results.append(evaluator.evaluate_suitability(soil, ["Banana", "Cocoa"][i % 2]))
+    return results
+
+
+def test_normalized_parameter_ratings():
+    """Ratings land in the child table and answer analytics in SQL"""
+    results = _evaluated_results()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "test.db")
+        db = DatabaseManager(db_path)
+        first = db.save_evaluation_result(evaluation_data_from_result(results[0]))
+        ids = [first] + db.save_evaluation_results_batch(
+            [evaluation_data_from_result(r) for r in results[1:]]
+        )
+
+        detail = db.get_evaluation_detail(ids[0])
+        assert detail["full_result"]["lsi"] == results[0]["lsi"]
+        ratings = {row["parameter"]: row for row in detail["parameter_ratings"]}
+        for parameter, (rating, lsc, subclass) in results[0]["parameter_ratings"].items():
+            assert ratings[parameter]["rating"] == rating
+            assert ratings[parameter]["class"] == lsc and ratings[parameter]["subclass"] == subclass
+        assert ratings["ph"]["value"] == results[0]["soil_data"]["ph"]
+        assert ratings["texture"]["value"] == "CL"
+        limiting = {row["subclass"] for row in ratings.values() if row["limiting"]}
+        assert limiting == set(results[0]["limiting_factors"])
+
+        # "How often is drainage limiting for Banana" without touching the blobs
+        banana = [r for r in results if r["crop_name"] == "Banana"]
+        expected = sum(
+            1 for r in banana
+            if r["parameter_ratings"]["drainage"][0]
+            == min(v[0] for v in r["parameter_ratings"].values())
+        )
+        counts = {row["parameter"]: row for row in db.get_limiting_factor_counts("banana")}
+        drainage = counts.get("drainage", {"count": 0, "share": 0.0})
+        assert drainage["count"] == expected
+        assert abs(drainage["share"] - expected / len(banana)) < 1e-9
+
+        summary = db.get_parameter_summary("texture", "banana")
+        assert summary["evaluations"] == len(banana)
+        assert sum(summary["class_counts"].values()) == len(banana)
+        print(f"✓ drainage limiting in {expected}/{len(banana)} Banana evaluations")
+
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM evaluation_results WHERE evaluation_id = ?", (ids[0],))
+        assert db.get_parameter_ratings(ids[0]) == []
+
+        # Legacy JSON blobs are read and backfilled into the child table
+        with db.get_connection() as conn:
+            conn.execute("DROP TABLE evaluation_parameter_ratings")
+        db.close()
+        legacy = DatabaseManager(db_path, evaluation_data_mode="json")
+        legacy_id = legacy.save_evaluation_result(evaluation_data_from_result(results[0]))
+        with legacy.get_connection() as conn:
+            conn.execute("DROP TABLE evaluation_parameter_ratings")
+        legacy.close()
+
+        db = DatabaseManager(db_path)
+        assert len(db.get_parameter_ratings(legacy_id)) == len(results[0]["parameter_ratings"])
+        assert len(db.get_parameter_ratings(ids[1])) == len(results[1]["parameter_ratings"])
+        assert db.get_evaluation_detail(legacy_id)["full_result"]["lsi"] == results[0]["lsi"]
+
+        with db.get_connection() as conn:
+            sizes = {row["evaluation_id"]: row for row in conn.execute("""
+                SELECT evaluation_id, typeof(evaluation_data) AS kind,
+                       length(evaluation_data) AS size
+                FROM evaluation_results WHERE evaluation_id IN (?, ?)
+            """, (legacy_id, ids[2]))}
+        assert sizes[legacy_id]["kind"] == "text" and sizes[ids[2]]["kind"] == "blob"
+        assert sizes[ids[2]]["size"] < sizes[legacy_id]["size"]
+        db.close()
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_connection_reused_with_pragmas()
+    test_reader_not_blocked_by_writer()
+    test_nested_blocks_share_transaction()
+    test_thread_exit_and_close_release_connections()
+    test_backup_includes_wal_commits()
+    test_batch_inserts_return_ids()
+    test_batch_is_all_or_nothing()
+    test_keyset_pages_match_offset_order()
+    test_trigger_maintained_stats()
+    test_normalized_parameter_ratings()
+    print("\n" + "="*70)
+    print("🎉 ALL DATABASE POOL TESTS PASSED!")
+    print("="*70)
@@ -2,13 +2,16 @@
 Test the complete evaluation workflow
 """
 
+import json
 import sys
+import tempfile
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from knowledge_base.evaluation import SuitabilityEvaluator
+from knowledge_base.registry import KnowledgeBase
 
 
 def test_evaluator_initialization():
@@ -139,6 +142,105 @@ def test_multiple_crops():
     print("✅ PASSED\n")
 
 
+def test_top_k_crops():
+    """Top-k ranking with pruning matches the full sorted evaluation"""
+    print("="*70)
+    print("TEST: Top-k Crop Ranking")
+    print("="*70)
+    
+    import random
+    evaluator = SuitabilityEvaluator()
+    rng = random.Random(3)
+    
+    for _ in range(50):
+        soil_data = {
+            'temperature': rng.uniform(12, 35),
+            'rainfall': rng.uniform(600, 3500),
+            'ph': round(rng.uniform(4.0, 8.5), 1),
+            'texture': rng.choice(['L', 'CL', 'SL', 'C']),
+            'soil_depth': rng.choice([30, 60, 120]),
+            'drainage': rng.choice(['good', 'moderate', 'poor']),
+            'slope': rng.uniform(0, 30),
+            'base_saturation': rng.uniform(10, 80),
+        }
+        season = rng.choice([None, 'may_august'])
+        crops = [
+            crop for crop in evaluator.get_available_crops()
+            if season or not evaluator.compiled_rules.seasonal.get(crop)
+        ]
+        full = []
+        for crop in crops:
+            crop_season = season if evaluator.compiled_rules.seasonal.get(crop) else None
+            full.append(evaluator.evaluate_suitability(soil_data, crop, crop_season))
+        full.sort(key=lambda x: x['lsi'], reverse=True)
+        
+        for k in (1, 3, 5):
+            top = evaluator.top_k_crops(soil_data, k, season)
+            assert [r['crop_name'] for r in top] == [r['crop_name'] for r in full[:k]]
+            assert [r['lsi'] for r in top] == [r['lsi'] for r in full[:k]]
+            assert all('recommendations' in r for r in top)
+    
+    print("✓ 50 random sites match full ranking for k = 1, 3, 5")
+    print("✅ PASSED\n")
+
+
+def test_evaluate_all_seasons():
+    """Shared-rating season table matches per-season evaluation"""
+    print("="*70)
+    print("TEST: All-Season Evaluation")
+    print("="*70)
+    
+    evaluator = SuitabilityEvaluator()
+    soil_data = {
+        'temperature': 24.0,
+        'rainfall': 1500,
+        'humidity': 65,
+        'ph': 6.2,
+        'texture': 'CL',
+        'drainage': 'good',
+        'slope': 3.0,
+    }
+    
+    for crop in ('Tomato', 'Maize', 'Cabbage'):
+        overview = evaluator.evaluate_all_seasons(soil_data, crop)
+        seasons = evaluator.compiled_rules.seasons[crop]
+        assert overview['seasonal']
+        assert [row['season'] for row in overview['table']] == seasons
+        for row in overview['table']:
+            single = evaluator.rules_engine.evaluate(crop, soil_data, row['season'])
+            assert overview['results'][row['season']] == single
+            assert set(row['climate_ratings']) == {'temperature', 'rainfall', 'humidity'}
+        best = max(overview['table'], key=lambda row: row['lsi'])
+        assert overview['best_season'] == best['season']
+        print(f"✓ {crop}: " + ", ".join(
+            f"{row['season']}={row['lsi']}" for row in overview['table']
+        ))
+    
+    perennial = evaluator.evaluate_all_seasons(soil_data, 'Banana')
+    assert not perennial['seasonal'] and perennial['best_season'] is None
+    assert len(perennial['table']) == 1
+    print("✅ PASSED\n")
+
+
+def test_evaluate_all_seasons_without_season_tables():
+    """A seasonal crop with no season tables gives an empty overview"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = Path(tmp_dir) / "crop_requirements"
+        data_dir.mkdir()
+        with open(project_root / "data" / "crop_requirements" / "tomato.json", encoding="utf-8") as f:
+            tomato = json.load(f)
+        tomato["seasons"] = {}
+        with open(data_dir / "tomato.json", "w", encoding="utf-8") as f:
+            json.dump(tomato, f)
+        
+        evaluator = SuitabilityEvaluator(KnowledgeBase.load(data_dir=data_dir, use_snapshot=False))
+        overview = evaluator.evaluate_all_seasons({'ph': 6.2, 'temperature': 24.0}, 'Tomato')
+        assert overview['seasonal']
+        assert overview['best_season'] is None
+        assert overview['table'] == [] and overview['results'] == {}
+    print("✅ PASSED\n")
+
+
 def test_brgy_gacap_conditions():
     """Test with actual Brgy. Gacap data from research"""
     print("="*70)
@@ -0,0 +1,143 @@
+"""
+Test the persistent evaluation result cache
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.db_manager import DatabaseManager
+from database.evaluation_cache import EvaluationCache, make_cache_key
+from knowledge_base.evaluation import SuitabilityEvaluator
+
+SOIL_DATA = {
+    "temperature": 25.0,
+    "rainfall": 2000.0,
+    "slope": 3,
+    "drainage": "good",
+    "texture": "CL",
+    "ph": 5.8,
+    "organic_carbon": 1.4,
+}
+
+
+def _make_cache(tmp_dir, **kwargs):
+    db = DatabaseManager(str(Path(tmp_dir) / "test.db"))
+    return EvaluationCache(db, SuitabilityEvaluator(), **kwargs)
+
+
+def test_cache_key_is_canonical():
+    """Key order does not matter; values, crop, season and KB version do"""
+    print("\n" + "="*70)
+    print("TEST: Cache key")
+    print("="*70)
+
+    reordered = dict(reversed(list(SOIL_DATA.items())))
+    key = make_cache_key(SOIL_DATA, "Banana", None, "v1")
+
+    assert key == make_cache_key(reordered, "Banana", None, "v1")
+    # The evaluator does not strip or retype values, so neither does the key
+    assert key != make_cache_key({**SOIL_DATA, "texture": "CL "}, "Banana", None, "v1")
+    assert key != make_cache_key({**SOIL_DATA, "slope": 3.0}, "Banana", None, "v1")
+    assert key != make_cache_key(SOIL_DATA, "Cocoa", None, "v1")
+    assert key != make_cache_key(SOIL_DATA, "Banana", "wet", "v1")
+    assert key != make_cache_key(SOIL_DATA, "Banana", None, "v2")
+    print("✅ PASSED")
+
+
+def test_cached_result_matches_evaluator():
+    """A second evaluation is served from the database with the same result"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = _make_cache(tmp_dir)
+        fresh = cache.evaluate(SOIL_DATA, "Banana")
+        cached = cache.evaluate(SOIL_DATA, "Banana")
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cached["lsi"] == fresh["lsi"]
+        assert cached["full_classification"] == fresh["full_classification"]
+        assert cached["parameter_ratings"] == fresh["parameter_ratings"]
+
+        # A new session (new cache object) still hits
+        reopened = _make_cache(tmp_dir)
+        assert reopened.get(SOIL_DATA, "Banana") is not None
+        print(f"✓ Banana LSI {cached['lsi']} served from cache")
+        print("✅ PASSED")
+
+
+def test_lru_eviction():
+    """The least recently used entry is evicted when the cache is full"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = _make_cache(tmp_dir, max_entries=2)
+        cache.evaluate(SOIL_DATA, "Banana")
+        cache.evaluate(SOIL_DATA, "Cocoa")
+        cache.get(SOIL_DATA, "Banana")
+        cache.evaluate(SOIL_DATA, "Sugarcane")
+
+        assert cache.get(SOIL_DATA, "Banana") is not None
+        assert cache.get(SOIL_DATA, "Cocoa") is None
+        assert cache.get(SOIL_DATA, "Sugarcane") is not None
+        print("✅ PASSED")
+
+
+def test_hits_are_batched():
+    """Hits reach the database on flush (or the next put), not on every get"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = _make_cache(tmp_dir)
+        cache.evaluate(SOIL_DATA, "Banana")
+        key = make_cache_key(SOIL_DATA, "Banana", None, cache.kb_version)
+
+        def stored_hits():
+            with cache.db.get_connection() as conn:
+                return conn.execute(
+                    "SELECT hits FROM evaluation_cache WHERE cache_key = ?", (key,)
+                ).fetchone()[0]
+
+        for _ in range(3):
+            assert cache.get(SOIL_DATA, "Banana") is not None
+        assert stored_hits() == 0
+        cache.flush()
+        assert stored_hits() == 3
+        print("✅ PASSED")
+
+
+def test_running_totals_match_table():
+    """Trigger-maintained count/size agree with the table after puts, updates and evictions"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = _make_cache(tmp_dir, max_entries=3)
+        db = cache.db
+        for i, crop in enumerate(["Banana", "Cocoa", "Sugarcane", "Oil Palm", "Banana"]):
+            cache.evaluate({**SOIL_DATA, "ph": 5.0 + i / 10}, crop)
+        fresh = cache.evaluator.evaluate_suitability(SOIL_DATA, "Cocoa")
+        cache.put(SOIL_DATA, "Cocoa", None, fresh)
+        cache.put(SOIL_DATA, "Cocoa", None, {**fresh, "notes": "x" * 500})
+
+        with db.get_connection() as conn:
+            totals = conn.execute(
+                "SELECT entries, size_bytes FROM evaluation_cache_totals"
+            ).fetchone()
+            actual = conn.execute(
+                "SELECT COUNT(*), SUM(size_bytes) FROM evaluation_cache"
+            ).fetchone()
+        assert tuple(totals) == tuple(actual)
+        assert totals[0] == 3
+
+        db.clear_evaluation_cache()
+        with db.get_connection() as conn:
+            assert tuple(conn.execute(
+                "SELECT entries, size_bytes FROM evaluation_cache_totals"
+            ).fetchone()) == (0, 0)
+        print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_cache_key_is_canonical()
+    test_cached_result_matches_evaluator()
+    test_lru_eviction()
+    test_hits_are_batched()
+    test_running_totals_match_table()
+    print("\n" + "="*70)
+    print("🎉 ALL EVALUATION CACHE TESTS PASSED!")
+    print("="*70)
@@ -0,0 +1,93 @@
+"""
+Test inverse suitability queries (value windows per parameter)
+"""
+
+import random
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from knowledge_base.evaluation import SuitabilityEvaluator
+from knowledge_base.inverse import CLASS_THRESHOLDS
+
+SOIL_DATA = {
+    "temperature": 25.0,
+    "rainfall": 2000.0,
+    "humidity": 75.0,
+    "slope": 3.0,
+    "drainage": "good",
+    "flooding": "Fo",
+    "texture": "CL",
+    "soil_depth": 120,
+    "coarse_fragments": 5.0,
+    "ph": 5.8,
+    "organic_carbon": 1.4,
+    "base_saturation": 45.0,
+    "cec": 18.0,
+    "ec": 0.5,
+    "esp": 2.0,
+}
+
+
+def test_windows_agree_with_rules_engine():
+    """A value is inside the window exactly when the full evaluation reaches the class"""
+    print("\n" + "="*70)
+    print("TEST: Inverse query vs RulesEngine.evaluate")
+    print("="*70)
+    
+    evaluator = SuitabilityEvaluator()
+    engine = evaluator.rules_engine
+    rng = random.Random(11)
+    
+    for crop_name, season in [("Banana", None), ("Cocoa", None), ("Maize", "may_august")]:
+        for target_class in ("S1", "S2", "S3"):
+            windows = evaluator.required_ranges(crop_name, SOIL_DATA, target_class, season)
+            for parameter, window in windows.items():
+                if window.categorical:
+                    candidates = window.listed + ["unknown"]
+                else:
+                    candidates = [round(rng.uniform(-5, 4000), 1) for _ in range(40)]
+                    candidates += [b for interval in window.intervals
+                                   for b in interval[:2] if abs(b) != float("inf")]
+                for value in candidates:
+                    soil_data = dict(SOIL_DATA, **{parameter: value})
+                    lsi = engine.evaluate(crop_name, soil_data, season)["lsi"]
+                    expected = lsi >= CLASS_THRESHOLDS[target_class]
+                    assert window.contains(value) == expected, (
+                        crop_name, target_class, parameter, value, lsi, window.describe()
+                    )
+        print(f"✓ {crop_name}: windows match full evaluation")
+    print("✅ PASSED")
+
+
+def test_current_value_flag():
+    """current_ok reflects whether the measured value already reaches the class"""
+    evaluator = SuitabilityEvaluator()
+    lsi = evaluator.rules_engine.evaluate("Banana", SOIL_DATA)["lsi"]
+    windows = evaluator.required_ranges("Banana", SOIL_DATA, "S3")
+    
+    for parameter, window in windows.items():
+        assert window.current_ok == (lsi >= 25), parameter
+        print(f"  {parameter}: {window.describe()}")
+    print("✅ PASSED")
+
+
+def test_invalid_target_class():
+    """Unknown target classes raise ValueError"""
+    try:
+        SuitabilityEvaluator().required_ranges("Banana", SOIL_DATA, "S5")
+    except ValueError as e:
+        print(f"✓ Raised: {e}")
+    else:
+        raise AssertionError("Expected ValueError for unknown class")
+
+
+if __name__ == "__main__":
+    test_windows_agree_with_rules_engine()
+    test_current_value_flag()
+    test_invalid_target_class()
+    print("\n" + "="*70)
+    print("🎉 ALL INVERSE QUERY TESTS PASSED!")
+    print("="*70)
@@ -0,0 +1,79 @@
+"""
+Test the shared knowledge-base registry
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from knowledge_base.evaluation import SuitabilityEvaluator
+from knowledge_base.registry import get_knowledge_base
+from knowledge_base.rules_engine import RulesEngine
+
+
+def test_evaluators_share_one_instance():
+    """Every evaluator uses the same loaded and compiled knowledge base"""
+    print("\n" + "="*70)
+    print("TEST: Shared knowledge base")
+    print("="*70)
+    
+    kb = get_knowledge_base()
+    first = SuitabilityEvaluator()
+    second = SuitabilityEvaluator()
+    engine = RulesEngine()
+    
+    assert first.knowledge_base is kb
+    assert second.crop_rules is kb.crop_rules
+    assert first.rules_engine.compiled_rules is kb.compiled_rules
+    assert engine.crop_rules is kb.crop_rules
+    print(f"✓ {kb}")
+    print("✅ PASSED")
+
+
+def test_knowledge_base_is_read_only():
+    """Requirement data cannot be mutated through an evaluator"""
+    kb = get_knowledge_base()
+    banana = kb.crop_rules.get_crop_requirements("Banana")
+    
+    assert isinstance(banana, dict)
+    for mutate in (
+        lambda: banana.__setitem__("crop_name", "Plantain"),
+        lambda: banana["climate_requirements"].pop("mean_annual_temp_c"),
+        lambda: kb.crop_rules.crop_requirements.clear(),
+    ):
+        try:
+            mutate()
+        except TypeError:
+            continue
+        raise AssertionError("Knowledge base data should be read-only")
+    
+    assert banana["crop_name"] == "Banana"
+    print("✅ PASSED")
+
+
+def test_concurrent_access_returns_same_instance():
+    """get_knowledge_base is safe to call from several threads"""
+    seen = []
+    threads = [
+        threading.Thread(target=lambda: seen.append(get_knowledge_base()))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len({id(kb) for kb in seen}) == 1
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_evaluators_share_one_instance()
+    test_knowledge_base_is_read_only()
+    test_concurrent_access_returns_same_instance()
+    print("\n" + "="*70)
+    print("🎉 ALL REGISTRY TESTS PASSED!")
+    print("="*70)
@@ -97,9 +97,48 @@ def test_banana_evaluation():
     print("✅ PASSED")
 
 
+def test_explain_trace():
+    """Test the opt-in explain trace"""
+    print("\n" + "="*70)
+    print("TEST: Explain Trace")
+    print("="*70)
+    
+    engine = RulesEngine()
+    soil_data = {
+        "temperature": 25.0,
+        "ph": 4.8,
+        "texture": "L",
+        "organic_matter": 3.0,
+    }
+    
+    fast = engine.evaluate("Banana", soil_data)
+    explained = engine.evaluate("Banana", soil_data, explain=True)
+    
+    assert "trace" not in fast
+    trace = explained["trace"]
+    print(trace.format())
+    
+    # Same numbers on both paths
+    assert explained["lsi"] == fast["lsi"] == trace.lsi
+    assert explained["parameter_ratings"] == fast["parameter_ratings"]
+    
+    ph = trace.get("ph")
+    assert ph.rating == fast["parameter_ratings"]["ph"][0]
+    assert ph.matched_range is not None
+    assert ph.matched_range[0] <= 4.8 <= ph.matched_range[1]
+    
+    texture = trace.get("texture")
+    assert "L" in texture.matched_values
+    
+    assert trace.unmapped == ["organic_matter"]
+    assert trace.to_dict()["crop_name"] == "Banana"
+    print("✅ PASSED")
+
+
 if __name__ == "__main__":
     test_basic_calculation()
     test_banana_evaluation()
+    test_explain_trace()
     print("\n" + "="*70)
     print("🎉 ALL RULES ENGINE TESTS PASSED!")
     print("="*70)
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""
+Test Morris screening and Sobol indices
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.db_manager import DatabaseManager
+from knowledge_base.sensitivity import (
+    DEFAULT_RANGES, SensitivityAnalyzer, history_ranges, load_history
+)
+
+BASE_SOIL = {"texture": "CL", "drainage": "good", "flooding": "Fo"}
+
+
+def test_history_ranges_from_database():
+    """Ranges come from stored soil_data_inputs, defaults fill the gaps"""
+    print("\n" + "="*70)
+    print("TEST: history_ranges")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(str(Path(tmp_dir) / "test.db"))
+        for i in range(20):
+            db.save_soil_input({
+                "ph": 5.0 + 0.1 * i,
+                "precipitation": 2000 + 10 * i,
+                "slope_percent": 3.0,                 # one distinct value only
+                "texture": "CL" if i % 3 else "L",
+            })
+        records = load_history(db)
+
+    ranges, base_soil = history_ranges(records)
+    low, high = ranges["ph"]
+    assert 5.0 <= low < high <= 6.9
+    assert 2000 <= ranges["rainfall"][0] < ranges["rainfall"][1] <= 2190
+    assert ranges["slope"] == DEFAULT_RANGES["slope"]
+    assert ranges["cec"] == DEFAULT_RANGES["cec"]
+    assert base_soil["texture"] == "CL" and base_soil["slope"] == 3.0
+    print(f"✓ pH range {low:.2f} – {high:.2f}")
+    print("✅ PASSED")
+
+
+def test_morris_and_sobol_agree_on_top_parameter():
+    """Both methods rank the same dominant parameter first"""
+    analyzer = SensitivityAnalyzer(base_soil=BASE_SOIL)
+    morris = analyzer.morris("Banana", trajectories=40, seed=1)
+    sobol = analyzer.sobol("Banana", n_samples=1024, seed=1)
+
+    assert morris.n_evaluations == 40 * (len(morris.parameters) + 1)
+    assert sobol.n_evaluations == 1024 * (len(sobol.parameters) + 2)
+    assert morris.ranking()[0][0] == sobol.ranking()[0][0]
+    for key in sobol.parameters:
+        assert -0.1 <= sobol.first_order[key] <= 1.1
+        assert sobol.total_order[key] >= 0
+    print(f"✓ Morris: {morris.ranking()[:3]}")
+    print(f"✓ Sobol:  {sobol.ranking()[:3]}")
+    print("✅ PASSED")
+
+
+def test_irrelevant_parameter_has_no_effect():
+    """A narrow range inside one rating class gives zero sensitivity"""
+    analyzer = SensitivityAnalyzer(base_soil=BASE_SOIL)
+    table = analyzer.compiled_rules.get_table(
+        "Banana", "soil_fertility_requirements", "ph_h2o", None
+    )
+    low, high = next((a, b) for a, b in zip(table.bounds, table.bounds[1:]) if a >= 4.0)
+    analyzer.ranges["ph"] = (low + 0.01, high - 0.01)
+    result = analyzer.sobol("Banana", n_samples=256, seed=2)
+    assert result.total_order["ph"] == 0.0
+    print("✅ PASSED")
+
+
+def test_invalid_range_rejected():
+    """Categorical parameters and empty ranges cannot be varied"""
+    for ranges in ({"texture": (0, 1)}, {"ph": (6.0, 6.0)}):
+        try:
+            SensitivityAnalyzer(ranges=ranges)
+        except ValueError as e:
+            print(f"✓ Raised: {e}")
+        else:
+            raise AssertionError(f"Expected ValueError for {ranges}")
+
+
+if __name__ == "__main__":
+    test_history_ranges_from_database()
+    test_morris_and_sobol_agree_on_top_parameter()
+    test_irrelevant_parameter_has_no_effect()
+    test_invalid_range_rejected()
+    print("\n" + "="*70)
+    print("🎉 ALL SENSITIVITY TESTS PASSED!")
+    print("="*70)
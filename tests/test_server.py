@@ -0,0 +1,182 @@
+"""
+Test the local asyncio evaluation server
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from knowledge_base.evaluation import SuitabilityEvaluator
+from knowledge_base.server import EvaluationServer
+
+SOIL = {
+    "temperature": 26.0,
+    "rainfall": 2200,
+    "ph": 6.0,
+    "texture": "CL",
+    "drainage": "good",
+    "slope": 4.0,
+}
+
+
+async def _request(port, method, path, payload=None):
+    """Send one HTTP request and return (status, decoded JSON body)"""
+    body = json.dumps(payload).encode() if payload is not None else b""
+    return await _raw_request(
+        port,
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+    )
+
+
+async def _raw_request(port, data):
+    """Send raw request bytes and return (status, decoded JSON body)"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(data)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, content = raw.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    return status, json.loads(content)
+
+
+def _with_server(scenario, **kwargs):
+    """Run an async scenario against a server on a free port"""
+    async def runner():
+        server = EvaluationServer(port=0, **kwargs)
+        await server.start()
+        try:
+            return await scenario(server)
+        finally:
+            server.close()
+    return asyncio.run(runner())
+
+
+def test_concurrent_evaluations_are_batched():
+    """Concurrent /evaluate calls are coalesced and match the engine"""
+    print("\n" + "="*70)
+    print("TEST: /evaluate micro-batching")
+    print("="*70)
+
+    engine = SuitabilityEvaluator().rules_engine
+    requests = [
+        ({**SOIL, "ph": 4.5 + 0.1 * i}, crop, "may_august")
+        for i in range(20)
+        for crop in ("Banana", "Tomato")
+    ]
+
+    async def scenario(server):
+        responses = await asyncio.gather(*[
+            _request(server.port, "POST", "/evaluate",
+                     {"soil_data": soil, "crop": crop, "season": season})
+            for soil, crop, season in requests
+        ])
+        status, stats = await _request(server.port, "GET", "/stats")
+        return responses, stats
+
+    responses, stats = _with_server(scenario, window_ms=20)
+
+    for (soil, crop, season), (status, body) in zip(requests, responses):
+        assert status == 200, body
+        expected = engine.evaluate(crop, soil, season if crop == "Tomato" else None)
+        assert body["lsi"] == expected["lsi"]
+        assert body["full_classification"] == expected["full_classification"]
+        assert body["season"] == expected["season"]
+
+    batching = stats["batching"]
+    assert batching["evaluations"] == len(requests)
+    assert batching["batches"] < len(requests)
+    assert stats["endpoints"]["/evaluate"]["requests"] == len(requests)
+    assert stats["endpoints"]["/evaluate"]["p99_ms"] >= stats["endpoints"]["/evaluate"]["p50_ms"]
+    print(f"✓ {len(requests)} requests in {batching['batches']} batches")
+    print("✅ PASSED")
+
+
+def test_rank_sweep_and_errors():
+    """/rank, /sweep, detail mode and error statuses"""
+    evaluator = SuitabilityEvaluator()
+
+    async def scenario(server):
+        return await asyncio.gather(
+            _request(server.port, "POST", "/rank", {"soil_data": SOIL, "k": 2}),
+            _request(server.port, "POST", "/sweep", {
+                "soil_data": SOIL, "crop": "Cocoa", "parameter": "ph",
+                "start": 4.0, "stop": 8.0, "num": 9,
+            }),
+            _request(server.port, "POST", "/evaluate",
+                     {"soil_data": SOIL, "crop": "Cocoa", "detail": True}),
+            _request(server.port, "POST", "/evaluate", {"soil_data": SOIL, "crop": "Tomato"}),
+            _request(server.port, "POST", "/evaluate", {"soil_data": SOIL, "crop": "Cacao"}),
+            _request(server.port, "GET", "/nowhere"),
+            _request(server.port, "GET", "/evaluate"),
+        )
+
+    rank, sweep, detail, no_season, bad_crop, missing, wrong_method = _with_server(scenario)
+
+    expected = evaluator.top_k_crops(SOIL, k=2)
+    assert rank[0] == 200
+    assert [r["crop_name"] for r in rank[1]["results"]] == [r["crop_name"] for r in expected]
+
+    assert sweep[0] == 200
+    direct = evaluator.sweep("Cocoa", SOIL, "ph", [4.0 + 0.5 * i for i in range(9)])
+    assert sweep[1]["lsi"] == direct.lsi.tolist()
+
+    assert detail[0] == 200 and "recommendations" in detail[1]
+    assert no_season[0] == 400 and bad_crop[0] == 400
+    assert missing[0] == 404 and wrong_method[0] == 405
+    print("✅ PASSED")
+
+
+def test_numeric_strings_rate_alike_on_every_path():
+    """String numbers get the same rating batched and in detail mode"""
+    engine = SuitabilityEvaluator().rules_engine
+    payload = {**SOIL, "ph": "4.6", "rainfall": " 900 ", "slope": "steep"}
+    numeric = {**SOIL, "ph": 4.6, "rainfall": 900.0, "slope": None}
+
+    async def scenario(server):
+        return await asyncio.gather(
+            _request(server.port, "POST", "/evaluate", {"soil_data": payload, "crop": "Banana"}),
+            _request(server.port, "POST", "/evaluate",
+                     {"soil_data": payload, "crop": "Banana", "detail": True}),
+        )
+
+    batched, detail = _with_server(scenario)
+    expected = engine.evaluate("Banana", numeric)
+    assert batched[0] == detail[0] == 200
+    assert batched[1]["lsi"] == detail[1]["lsi"] == expected["lsi"]
+    assert batched[1]["full_classification"] == detail[1]["full_classification"]
+    assert detail[1]["soil_data"]["ph"] == 4.6
+    print(f"✓ Banana LSI {expected['lsi']} on both paths")
+    print("✅ PASSED")
+
+
+def test_invalid_content_length():
+    """A non-numeric or negative Content-Length gets a 400, not a dropped connection"""
+    async def scenario(server):
+        return await asyncio.gather(*(
+            _raw_request(
+                server.port,
+                f"POST /evaluate HTTP/1.1\r\nContent-Length: {length}\r\n\r\n{{}}".encode()
+            )
+            for length in ("abc", "-5", "2.0")
+        ))
+
+    for status, payload in _with_server(scenario):
+        assert status == 400, status
+        assert payload == {"error": "Invalid Content-Length"}
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_concurrent_evaluations_are_batched()
+    test_rank_sweep_and_errors()
+    test_numeric_strings_rate_alike_on_every_path()
+    test_invalid_content_length()
+    print("\n" + "="*70)
+    print("🎉 ALL SERVER TESTS PASSED!")
+    print("="*70)
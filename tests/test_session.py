@@ -0,0 +1,149 @@
+"""
+Test incremental evaluation sessions
+"""
+
+import random
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from knowledge_base.evaluation import SuitabilityEvaluator
+from knowledge_base.rules_engine import RulesEngine
+
+SOIL_DATA = {
+    "temperature": 25.0,
+    "rainfall": 2000.0,
+    "humidity": 75.0,
+    "slope": 3.0,
+    "drainage": "good",
+    "flooding": "Fo",
+    "texture": "CL",
+    "soil_depth": 120,
+    "coarse_fragments": 5.0,
+    "ph": 5.8,
+    "organic_carbon": 1.4,
+    "base_saturation": 45.0,
+    "cec": 18.0,
+    "ec": 0.5,
+    "esp": 2.0,
+}
+
+CROPS = ["Banana", "Cocoa", "Maize", "Arabica Coffee"]
+
+
+def _assert_matches_full_evaluation(engine, session, soil_data):
+    for crop_name in session.crop_names:
+        season = session.result(crop_name)["season"]
+        expected = engine.evaluate(crop_name, soil_data, season)
+        actual = session.result(crop_name)
+        assert actual["lsi"] == expected["lsi"], (crop_name, actual["lsi"], expected["lsi"])
+        assert actual["full_classification"] == expected["full_classification"]
+        assert actual["parameter_ratings"] == expected["parameter_ratings"]
+
+
+def test_initial_results_match_engine():
+    """A fresh session agrees with RulesEngine.evaluate"""
+    print("\n" + "="*70)
+    print("TEST: Session initial results")
+    print("="*70)
+    
+    engine = RulesEngine()
+    session = SuitabilityEvaluator().create_session(CROPS, SOIL_DATA, season="january_april")
+    _assert_matches_full_evaluation(engine, session, SOIL_DATA)
+    print(f"✓ {session}")
+    print("✅ PASSED")
+
+
+def test_single_parameter_updates():
+    """Random single-field edits keep every crop in sync with a full re-evaluation"""
+    engine = RulesEngine()
+    session = SuitabilityEvaluator().create_session(CROPS, SOIL_DATA, season="january_april")
+    soil_data = dict(SOIL_DATA)
+    rng = random.Random(7)
+    
+    edits = {
+        "ph": lambda: round(rng.uniform(3.5, 9.0), 1),
+        "temperature": lambda: round(rng.uniform(10, 35), 1),
+        "slope": lambda: round(rng.uniform(0, 40), 1),
+        "drainage": lambda: rng.choice(["good", "moderate", "poor", "very poor"]),
+        "organic_carbon": lambda: rng.choice([None, 0.3, 1.2, 3.0]),
+    }
+    for _ in range(600):
+        soil_key = rng.choice(list(edits))
+        value = edits[soil_key]()
+        session.update(soil_key, value)
+        if value is None:
+            soil_data.pop(soil_key, None)
+        else:
+            soil_data[soil_key] = value
+        _assert_matches_full_evaluation(engine, session, soil_data)
+    print("✓ 600 edits match full re-evaluation")
+    print("✅ PASSED")
+
+
+def test_fuzzed_edits_match_to_the_cent():
+    """Every crop, every parameter: session LSI rounds exactly like a full evaluation"""
+    evaluator = SuitabilityEvaluator()
+    engine = RulesEngine()
+    crops = evaluator.get_available_crops()
+    session = evaluator.create_session(crops, SOIL_DATA, season="may_august")
+    soil_data = dict(SOIL_DATA)
+    rng = random.Random(11)
+    
+    numeric = {
+        "temperature": (10, 35), "rainfall": (400, 4000), "humidity": (30, 95),
+        "slope": (0, 40), "soil_depth": (10, 200), "coarse_fragments": (0, 60),
+        "ph": (3.5, 9.0), "organic_carbon": (0.1, 4.0), "base_saturation": (5, 100),
+        "cec": (2, 40), "ec": (0, 12), "esp": (0, 30),
+    }
+    categorical = {
+        "drainage": ["good", "moderate", "imperfect", "poor", "very poor"],
+        "flooding": ["Fo", "F1", "F2", "F3"],
+        "texture": ["S", "LS", "SL", "L", "SiL", "CL", "SC", "C"],
+    }
+    for _ in range(1500):
+        soil_key = rng.choice(list(numeric) + list(categorical))
+        if soil_key in numeric:
+            value = round(rng.uniform(*numeric[soil_key]), rng.choice([0, 1, 2]))
+        else:
+            value = rng.choice(categorical[soil_key])
+        session.update(soil_key, value)
+        soil_data[soil_key] = value
+        _assert_matches_full_evaluation(engine, session, soil_data)
+    print(f"✓ 1500 edits × {len(crops)} crops match full re-evaluation")
+    print("✅ PASSED")
+
+
+def test_season_change_rerates_seasonal_crops():
+    """Seasonal crops follow the session season; others ignore it"""
+    evaluator = SuitabilityEvaluator()
+    seasonal = [
+        crop for crop in evaluator.crop_rules.get_crop_names()
+        if evaluator.compiled_rules.seasonal.get(crop)
+    ]
+    if not seasonal:
+        print("⚠️ No seasonal crops, skipping")
+        return
+    
+    crop_name = seasonal[0]
+    seasons = evaluator.compiled_rules.seasons[crop_name]
+    session = evaluator.create_session([crop_name, "Banana"], SOIL_DATA, season=seasons[0])
+    engine = RulesEngine()
+    for season in seasons:
+        session.set_season(season)
+        assert session.result(crop_name)["season"] == season
+        assert session.result("Banana")["season"] is None
+        _assert_matches_full_evaluation(engine, session, SOIL_DATA)
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_initial_results_match_engine()
+    test_single_parameter_updates()
+    test_fuzzed_edits_match_to_the_cent()
+    test_season_change_rerates_seasonal_crops()
+    print("\n" + "="*70)
+    print("🎉 ALL SESSION TESTS PASSED!")
+    print("="*70)
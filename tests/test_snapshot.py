@@ -0,0 +1,112 @@
+"""
+Test the persistent knowledge-base snapshot and its content-hash version
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from knowledge_base import snapshot
+from knowledge_base.crop_rules import CropRules
+from knowledge_base.registry import KnowledgeBase
+
+SOURCE_DIR = project_root / "data" / "crop_requirements"
+
+
+def _copy_crops(target: Path, *names: str) -> Path:
+    data_dir = target / "crop_requirements"
+    data_dir.mkdir()
+    for name in names:
+        shutil.copy(SOURCE_DIR / name, data_dir / name)
+    return data_dir
+
+
+def test_snapshot_reuse_and_invalidation():
+    """Unchanged files load from the snapshot; a changed file is re-parsed alone"""
+    print("\n" + "="*70)
+    print("TEST: Knowledge base snapshot")
+    print("="*70)
+    
+    original_read = CropRules._read_crop_file
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = _copy_crops(Path(tmp), "banana.json", "cocoa.json")
+        snapshot = Path(tmp) / "crop_requirements.snapshot.pkl"
+        
+        with mock.patch.object(
+            CropRules, "_read_crop_file", autospec=True, side_effect=original_read
+        ) as reader:
+            first = KnowledgeBase.load(data_dir=data_dir)
+            assert snapshot.exists()
+            assert reader.call_count == 2
+            
+            second = KnowledgeBase.load(data_dir=data_dir)
+            assert reader.call_count == 2, "Snapshot should skip JSON parsing"
+            assert second.version == first.version
+            assert second.crop_names == ["Banana", "Cocoa"]
+            
+            # Edit one file: only that file is parsed again
+            cocoa_file = data_dir / "cocoa.json"
+            cocoa = json.loads(cocoa_file.read_text(encoding="utf-8"))
+            cocoa["notes"] = "edited"
+            cocoa_file.write_text(json.dumps(cocoa), encoding="utf-8")
+            
+            third = KnowledgeBase.load(data_dir=data_dir)
+            assert reader.call_count == 3
+            assert third.version != first.version
+            assert third.crop_rules.get_crop_requirements("Cocoa")["notes"] == "edited"
+        
+        print(f"✓ Versions: {first.version} -> {third.version}")
+    print("✅ PASSED")
+
+
+def test_code_change_discards_snapshot():
+    """A snapshot built by different compile code is rebuilt, not reused"""
+    original_read = CropRules._read_crop_file
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = _copy_crops(Path(tmp), "banana.json")
+        
+        with mock.patch.object(
+            CropRules, "_read_crop_file", autospec=True, side_effect=original_read
+        ) as reader:
+            first = KnowledgeBase.load(data_dir=data_dir)
+            assert reader.call_count == 1
+            
+            with mock.patch.object(snapshot, "code_fingerprint", return_value="edited"):
+                rebuilt = KnowledgeBase.load(data_dir=data_dir)
+            assert reader.call_count == 2
+            assert rebuilt.version == first.version
+            
+            # The rebuilt snapshot now carries the other fingerprint
+            KnowledgeBase.load(data_dir=data_dir)
+            assert reader.call_count == 3
+    print("✅ PASSED")
+
+
+def test_version_matches_without_snapshot():
+    """The version depends only on file contents, not on how it was loaded"""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = _copy_crops(Path(tmp), "banana.json")
+        
+        cached = KnowledgeBase.load(data_dir=data_dir)
+        uncached = KnowledgeBase.load(data_dir=data_dir, use_snapshot=False)
+        direct = KnowledgeBase(CropRules(data_dir=data_dir))
+        
+        assert cached.version == uncached.version == direct.version
+    print("✅ PASSED")
+
+
+if __name__ == "__main__":
+    test_snapshot_reuse_and_invalidation()
+    test_code_change_discards_snapshot()
+    test_version_matches_without_snapshot()
+    print("\n" + "="*70)
+    print("🎉 ALL SNAPSHOT TESTS PASSED!")
+    print("="*70)
@@ -0,0 +1,95 @@
+"""
+Test the Monte Carlo measurement-uncertainty mode
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from knowledge_base.evaluation import SuitabilityEvaluator
+from knowledge_base.uncertainty import MeasurementError
+
+SOIL = {
+    "temperature": 26.0,
+    "rainfall": 2200,
+    "ph": 5.5,
+    "texture": "CL",
+    "drainage": "good",
+    "slope": 8.0,
+    "organic_carbon": 1.2,
+    "cec": 16.0,
+    "soil_depth": 100,
+}
+
+
+def test_uncertainty_summary():
+    """Probabilities sum to 1, interval brackets the mean, drivers are ranked"""
+    print("\n" + "="*70)
+    print("TEST: evaluate_uncertainty")
+    print("="*70)
+
+    evaluator = SuitabilityEvaluator()
+    result = evaluator.evaluate_uncertainty(SOIL, "Cocoa", seed=3)
+    nominal = evaluator.rules_engine.evaluate("Cocoa", SOIL, None)
+
+    assert result.nominal_lsi == nominal["lsi"]
+    assert result.nominal_class == nominal["lsc"]
+    assert abs(sum(result.class_probabilities.values()) - 1.0) < 1e-9
+    low, high = result.lsi_interval
+    assert low <= result.mean_lsi <= high
+    shares = [share for _, share in result.variance_drivers]
+    assert shares == sorted(shares, reverse=True)
+    assert all(0.0 <= share <= 1.0 for share in shares)
+    print(f"✓ {result.class_probabilities}, interval {result.lsi_interval}")
+    print(f"✓ drivers: {result.variance_drivers[:3]}")
+    print("✅ PASSED")
+
+
+def test_zero_error_is_deterministic():
+    """Without error every draw equals the measured evaluation"""
+    evaluator = SuitabilityEvaluator()
+    result = evaluator.evaluate_uncertainty(SOIL, "Banana", errors={"ph": 0.0}, n_draws=50)
+    assert result.std_lsi == 0.0
+    assert result.class_stability == 1.0
+    assert result.variance_drivers == [("ph", 0.0)]
+    print("✅ PASSED")
+
+
+def test_boundary_sample_flips_class():
+    """A pH right on a rating boundary flips rating about half the time"""
+    evaluator = SuitabilityEvaluator()
+    table = evaluator.compiled_rules.get_table(
+        "Banana", "soil_fertility_requirements", "ph_h2o", None
+    )
+    boundary = next(b for b in table.bounds if 4.0 < b < 8.0)
+    soil = dict(SOIL, ph=boundary)
+    result = evaluator.evaluate_uncertainty(
+        soil, "Banana",
+        errors={"ph": MeasurementError(sd=0.05), "cec": {"relative": 0.05}},
+        n_draws=4000, seed=1,
+    )
+    assert 0.2 < result.rating_flip_rates["ph"] < 0.8
+    print(f"✓ pH {boundary}: rating flips in {result.rating_flip_rates['ph']:.0%} of draws")
+    print("✅ PASSED")
+
+
+def test_categorical_error_rejected():
+    """Only numeric parameters can carry measurement error"""
+    try:
+        SuitabilityEvaluator().evaluate_uncertainty(SOIL, "Cocoa", errors={"texture": 0.1})
+    except ValueError as e:
+        print(f"✓ Raised: {e}")
+    else:
+        raise AssertionError("Expected ValueError for categorical parameter")
+
+
+if __name__ == "__main__":
+    test_uncertainty_summary()
+    test_zero_error_is_deterministic()
+    test_boundary_sample_flips_class()
+    test_categorical_error_rejected()
+    print("\n" + "="*70)
+    print("🎉 ALL UNCERTAINTY TESTS PASSED!")
+    print("="*70)
@@ -0,0 +1,298 @@
+"""
+Test vectorized batch evaluation (N samples × M crops)
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from knowledge_base.evaluation import SuitabilityEvaluator
+from knowledge_base.rules_engine import PARAMETER_MAPPING
+from knowledge_base.vectorized import (
+    coerce_numeric_values, decode_limiting_factors, numeric_soil_keys, records_to_columns,
+    round_lsi,
+)
+
+
+SAMPLES = [
+    {
+        "temperature": 25.0, "rainfall": 2000.0, "ph": 6.2, "texture": "L",
+        "soil_depth": 120, "drainage": "good", "flooding": "Fo", "slope": 1.5,
+    },
+    {
+        "temperature": 27.5, "rainfall": 1200.0, "ph": 4.5, "texture": "SL",
+        "soil_depth": 45, "drainage": "imperfect", "flooding": "F1", "slope": 12.0,
+    },
+    {
+        "temperature": 22.0, "rainfall": 2600.0, "ph": 7.8, "texture": "CL",
+        "organic_carbon": 0.8, "slope": 4.0,
+    },
+]
+
+
+def _random_records(compiled_rules, count, seed=0):
+    """Random soil records drawn around the rule-table bounds and values"""
+    rng = random.Random(seed)
+    bounds, values = {}, {}
+    for (_, _, category, parameter), table in compiled_rules.tables.items():
+        for key, mapping in PARAMETER_MAPPING.items():
+            if mapping == (category, parameter):
+                bounds.setdefault(key, set()).update(table.bounds)
+                values.setdefault(key, set()).update(table.value_spec)
+    pools = {key: sorted(bounds[key]) for key in bounds if bounds[key]}
+    labels = {key: sorted(values[key]) for key in values if values[key] and key not in pools}
+    
+    records = []
+    for _ in range(count):
+        record = {}
+        for key in rng.sample(sorted(pools) + sorted(labels), rng.randint(3, 12)):
+            if key in pools:
+                bound = rng.choice(pools[key])
+                record[key] = round(bound + rng.choice([0, 0, 1, -1]) * rng.random() * 5, 1)
+            else:
+                record[key] = rng.choice(labels[key])
+        records.append(record)
+    return records
+
+
+def test_matrix_matches_rules_engine():
+    """Every cell of the matrix equals a scalar RulesEngine evaluation"""
+    print("\n" + "="*70)
+    print("TEST: evaluate_matrix vs RulesEngine.evaluate")
+    print("="*70)
+    
+    evaluator = SuitabilityEvaluator()
+    
+    for season in (None, "may_august"):
+        crops = [
+            crop for crop in evaluator.get_available_crops()
+            if evaluator.compiled_rules.seasonal[crop] == (season is not None)
+        ]
+        result = evaluator.evaluate_matrix(records_to_columns(SAMPLES), crops, season)
+        
+        assert result.lsi.shape == (len(SAMPLES), len(crops))
+        for i, soil_data in enumerate(SAMPLES):
+            for j, crop in enumerate(crops):
+                expected = evaluator.rules_engine.evaluate(crop, soil_data, season)
+                assert result.lsi[i, j] == expected["lsi"], (crop, i)
+                assert result.classes[i, j] == expected["lsc"], (crop, i)
+                assert result.limiting_factors(i, j) == expected["limiting_factors"]
+    print("✅ PASSED")
+
+
+def test_random_samples_match_rules_engine():
+    """Randomized records: matrix and sweep LSIs equal RulesEngine.evaluate"""
+    evaluator = SuitabilityEvaluator()
+    engine = evaluator.rules_engine
+    crops = [crop for crop in evaluator.get_available_crops()
+             if not evaluator.compiled_rules.seasonal[crop]]
+    records = _random_records(evaluator.compiled_rules, 3000, seed=1)
+    
+    # One key order per matrix call, as evaluate_matrix multiplies in column order
+    groups = {}
+    for record in records:
+        groups.setdefault(tuple(record), []).append(record)
+    for group in groups.values():
+        result = evaluator.evaluate_matrix(records_to_columns(group), crops)
+        for i, soil_data in enumerate(group):
+            for j, crop in enumerate(crops):
+                expected = engine.evaluate(crop, soil_data)
+                assert result.lsi[i, j] == expected["lsi"], (crop, soil_data)
+                assert result.classes[i, j] == expected["lsc"], (crop, soil_data)
+    
+    for soil_data in records[:200]:
+        crop = crops[len(soil_data) % len(crops)]
+        parameter = next(iter(soil_data))
+        grid = [round(soil_data[parameter] + step / 10, 1) for step in range(-20, 21)] \
+            if isinstance(soil_data[parameter], float) else [soil_data[parameter]]
+        result = evaluator.sweep(crop, soil_data, parameter, grid)
+        for k, value in enumerate(grid):
+            expected = engine.evaluate(crop, {**soil_data, parameter: value})
+            assert result.lsi[k] == expected["lsi"], (crop, parameter, value)
+    
+    # Half-way cases np.round gets wrong, one of them across the S2/S3 line
+    assert round_lsi(np.array([2.295, 49.995])).tolist() == [2.29, 49.99]
+    print(f"✓ {len(records)} random records × {len(crops)} crops")
+    print("✅ PASSED")
+
+
+def test_missing_cells_are_skipped():
+    """None/NaN cells behave like a parameter that was not provided"""
+    evaluator = SuitabilityEvaluator()
+    
+    columns = {"ph": [4.5, None], "rainfall": [2000.0, np.nan]}
+    result = evaluator.evaluate_matrix(columns, ["Banana"])
+    
+    expected = evaluator.rules_engine.evaluate("Banana", {"ph": 4.5, "rainfall": 2000.0})
+    assert result.lsi[0, 0] == expected["lsi"]
+    assert result.lsi[1, 0] == 0.0
+    assert result.classes[1, 0] == "N"
+    assert decode_limiting_factors(int(result.limiting_masks[1, 0])) == ""
+    print("✅ PASSED")
+
+
+def test_nan_parity_scalar_and_matrix():
+    """NaN is skipped like None on the scalar, explain, bounded, session and matrix paths"""
+    evaluator = SuitabilityEvaluator()
+    engine = evaluator.rules_engine
+    crops = [crop for crop in evaluator.get_available_crops()
+             if not evaluator.compiled_rules.seasonal[crop]]
+    
+    records = []
+    for sample in SAMPLES:
+        for key in ("slope", "ph", "texture"):
+            records.append({**sample, key: float("nan")})
+            records.append({**sample, key: np.nan, "rainfall": None})
+    result = evaluator.evaluate_matrix(records_to_columns(records), crops)
+    session = evaluator.create_session(crops)
+    
+    for i, soil_data in enumerate(records):
+        present = {key: value for key, value in soil_data.items()
+                   if value is not None and value == value}
+        # Same key order as the record, so the rating products multiply alike
+        stale = [key for key in session.soil_data if key not in soil_data]
+        session.update_many({**soil_data, **dict.fromkeys(stale)})
+        for j, crop in enumerate(crops):
+            expected = engine.evaluate(crop, present)
+            for actual in (
+                engine.evaluate(crop, soil_data),
+                engine.evaluate(crop, soil_data, explain=True),
+                engine._build_result(crop, None, engine.evaluate_bounded(crop, soil_data)),
+                session.result(crop),
+            ):
+                assert actual["lsi"] == expected["lsi"], (crop, i)
+                assert actual["full_classification"] == expected["full_classification"]
+            assert result.lsi[i, j] == expected["lsi"], (crop, i)
+            assert result.limiting_factors(i, j) == expected["limiting_factors"]
+    
+    # Numeric strings and mixed key order: both streaming paths agree with
+    # RulesEngine.evaluate on the coerced record, in the record's own order
+    numeric_keys = numeric_soil_keys(evaluator.compiled_rules)
+    rng = random.Random(3)
+    mixed = [{"ph": "4.0"}, {"ph": "4.0", "rainfall": "n/a"}]
+    for sample in _random_records(evaluator.compiled_rules, 1500, seed=2):
+        keys = list(sample)
+        rng.shuffle(keys)
+        mixed.append({
+            key: str(sample[key]) if rng.random() < 0.2 else sample[key] for key in keys
+        })
+    expected = [
+        engine.evaluate(crop, coerce_numeric_values(soil_data, numeric_keys))
+        for soil_data in mixed for crop in crops
+    ]
+    for batch_size in (0, 64):
+        streamed = list(evaluator.iter_evaluate(iter(mixed), crops, batch_size=batch_size))
+        assert [(r.lsi, r.full_classification) for r in streamed] == [
+            (e["lsi"], e["full_classification"]) for e in expected
+        ], batch_size
+    assert expected[crops.index("Cocoa")]["lsc"] == "S3"
+    
+    # The reported case: Banana with slope = NaN
+    nan_slope = {**SAMPLES[0], "slope": float("nan")}
+    scalar = evaluator.evaluate_suitability(nan_slope, "Banana")
+    matrix = evaluator.evaluate_matrix(records_to_columns([nan_slope]), ["Banana"])
+    assert scalar["lsi"] == matrix.lsi[0, 0]
+    print(f"✓ Banana slope=NaN: LSI {scalar['lsi']} on both paths")
+    print("✅ PASSED")
+
+
+def test_seasonal_crop_requires_season():
+    """Seasonal crops raise like evaluate_suitability when season is missing"""
+    evaluator = SuitabilityEvaluator()
+    
+    try:
+        evaluator.evaluate_matrix({"ph": [6.0]}, ["Cabbage"])
+    except ValueError as e:
+        print(f"✓ Raised: {e}")
+    else:
+        raise AssertionError("Expected ValueError for seasonal crop without season")
+
+
+def test_default_crop_list():
+    """Without a season the default crop list skips seasonal crops"""
+    evaluator = SuitabilityEvaluator()
+    compiled_rules = evaluator.compiled_rules
+    
+    result = evaluator.evaluate_matrix(records_to_columns(SAMPLES))
+    assert result.crops
+    assert not any(compiled_rules.seasonal[crop] for crop in result.crops)
+    
+    result = evaluator.evaluate_matrix(records_to_columns(SAMPLES), season="may_august")
+    assert list(result.crops) == evaluator.get_available_crops()
+    print("✅ PASSED")
+
+
+def test_sweep_matches_rules_engine():
+    """Each grid point of a sweep equals a full RulesEngine evaluation"""
+    print("\n" + "="*70)
+    print("TEST: sweep vs RulesEngine.evaluate")
+    print("="*70)
+    
+    evaluator = SuitabilityEvaluator()
+    engine = evaluator.rules_engine
+    base_soil = SAMPLES[0]
+    
+    cases = [
+        ("Cocoa", "ph", np.round(np.linspace(3.5, 8.5, 101), 2), None),
+        ("Banana", "rainfall", np.linspace(500, 4000, 71), None),
+        ("Maize", "temperature", np.linspace(10, 40, 61), "january_april"),
+        ("Banana", "cec", np.linspace(0, 40, 41), None),
+        ("Banana", "texture", ["S", "SL", "L", "CL", "C", "xx"], None),
+    ]
+    for crop_name, parameter, values, season in cases:
+        result = evaluator.sweep(crop_name, base_soil, parameter, values, season)
+        for i, value in enumerate(values):
+            soil_data = dict(base_soil)
+            soil_data[parameter] = value.item() if hasattr(value, "item") else value
+            expected = engine.evaluate(crop_name, soil_data, season)
+            assert result.lsi[i] == expected["lsi"], (crop_name, parameter, value)
+            assert result.classes[i] == expected["lsc"]
+            assert result.limiting_factors(i) == expected["limiting_factors"]
+        print(f"✓ {crop_name} {parameter}: {len(values)} points, "
+              f"breakpoints {result.breakpoints}")
+    print("✅ PASSED")
+
+
+def test_sweep_breakpoints_are_rating_changes():
+    """Breakpoints are exactly where the swept parameter's rating changes"""
+    evaluator = SuitabilityEvaluator()
+    result = evaluator.sweep("Cocoa", SAMPLES[0], "ph", np.linspace(3.0, 9.0, 601))
+    
+    assert result.breakpoints == sorted(result.breakpoints)
+    assert all(3.0 <= b <= 9.0 for b in result.breakpoints)
+    changes = np.nonzero(np.diff(result.ratings))[0]
+    for i in changes:
+        assert any(
+            result.values[i] <= b <= result.values[i + 1] for b in result.breakpoints
+        ), result.values[i]
+    print("✅ PASSED")
+
+
+def test_sweep_rejects_unknown_parameter():
+    """Sweeping an unmapped parameter raises ValueError"""
+    try:
+        SuitabilityEvaluator().sweep("Banana", SAMPLES[0], "moonlight", [1, 2])
+    except ValueError as e:
+        print(f"✓ Raised: {e}")
+    else:
+        raise AssertionError("Expected ValueError for unknown parameter")
+
+
+if __name__ == "__main__":
+    test_matrix_matches_rules_engine()
+    test_random_samples_match_rules_engine()
+    test_missing_cells_are_skipped()
+    test_nan_parity_scalar_and_matrix()
+    test_seasonal_crop_requires_season()
+    test_default_crop_list()
+    test_sweep_matches_rules_engine()
+    test_sweep_breakpoints_are_rating_changes()
+    test_sweep_rejects_unknown_parameter()
+    print("\n" + "="*70)
+    print("🎉 ALL VECTORIZED EVALUATION TESTS PASSED!")
+    print("="*70)